@@ -5,7 +5,7 @@ all available actions in the simulation.
 """
 
 import importlib
-from typing import Dict, List, Type
+from typing import Dict, List, Optional, Tuple, Type
 
 from agent_core.agents.actions.action_interface import ActionInterface
 
@@ -17,6 +17,12 @@ class ActionRegistry:
 
     def __init__(self) -> None:
         self._actions: Dict[str, Type[ActionInterface]] = {}
+        # Sorted ids, their positions and one-hot vectors. register() marks
+        # them stale and they are rebuilt on the next lookup.
+        self._index_valid = False
+        self._sorted_ids: Tuple[str, ...] = ()
+        self._index: Dict[str, int] = {}
+        self._one_hots: Dict[Optional[str], Tuple[float, ...]] = {}
         print("ActionRegistry initialized.")
 
     def load_actions_from_paths(self, module_paths: List[str]) -> None:
@@ -68,6 +74,7 @@ class ActionRegistry:
             raise ValueError(f"Action with ID '{action_id}' is already registered.")
 
         self._actions[action_id] = action_class
+        self._index_valid = False
         print(f"Action '{action_name}' registered with ID '{action_id}'.")
         return action_class
 
@@ -82,10 +89,38 @@ class ActionRegistry:
         """Returns a list of all registered action classes."""
         return list(self._actions.values())
 
+    def _refresh_index(self) -> None:
+        if not self._index_valid:
+            self._sorted_ids = tuple(sorted(self._actions))
+            self._index = {aid: i for i, aid in enumerate(self._sorted_ids)}
+            self._one_hots = {}
+            self._index_valid = True
+
     @property
     def action_ids(self) -> List[str]:
         """Returns a sorted list of all registered action IDs."""
-        return sorted(self._actions.keys())
+        self._refresh_index()
+        return list(self._sorted_ids)
+
+    def action_index(self, action_id: Optional[str]) -> Optional[int]:
+        """Returns the position of an action ID in action_ids, or None."""
+        self._refresh_index()
+        return self._index.get(action_id) if action_id is not None else None
+
+    def one_hot(self, action_id: Optional[str]) -> Tuple[float, ...]:
+        """
+        Returns the one-hot encoding of an action ID over action_ids. Unknown
+        IDs encode as all zeros. The tuple is cached and shared between calls.
+        """
+        self._refresh_index()
+        encoding = self._one_hots.get(action_id)
+        if encoding is None:
+            index = self._index.get(action_id) if action_id is not None else None
+            encoding = tuple(
+                1.0 if i == index else 0.0 for i in range(len(self._sorted_ids))
+            )
+            self._one_hots[action_id] = encoding
+        return encoding
 
 
 # Create a global singleton instance of the registry.
@@ -1,7 +1,7 @@
 # src/agent_core/agents/decision_selector_interface.py
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, List, Optional, Sequence
 
 if TYPE_CHECKING:
     from agent_core.core.ecs.abstractions import SimulationState
@@ -38,3 +38,24 @@ class DecisionSelectorInterface(ABC):
             The chosen ActionPlanComponent, or None if no action is selected.
         """
         raise NotImplementedError
+
+    def prepare_turns(
+        self,
+        simulation_state: "SimulationState",
+        entity_ids: Sequence[str],
+        current_tick: int,
+    ) -> None:
+        """
+        Called once per tick, before any of the given entities take their turn.
+
+        Selectors can override this to precompute, for the whole population
+        in one pass, work that select would otherwise repeat per entity. Any
+        such result must be re-validated in select, since earlier turns in
+        the same tick can change the world. The default does nothing.
+
+        Args:
+            simulation_state: The current state of the simulation.
+            entity_ids: The entities that will act this tick, in turn order.
+            current_tick: The current simulation tick.
+        """
+        return None
@@ -9,6 +9,9 @@ class CognitiveComponent(ABC):
     A Component is a pure data container. It should not contain any logic.
     """
 
+    # Empty slots so that subclasses declaring __slots__ drop the per-instance dict
+    __slots__ = ()
+
     @abstractmethod
     def to_dict(self) -> Dict[str, Any]:
         """
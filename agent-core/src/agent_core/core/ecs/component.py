@@ -66,6 +66,8 @@ class Component(CognitiveComponent):
     Base class for all components with validation interface.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def to_dict(self) -> Dict[str, Any]:
         """Converts the component's data to a dictionary for serialization/logging."""
@@ -4,7 +4,7 @@ import asyncio
 import inspect
 import traceback
 from collections import defaultdict
-from typing import Any, Callable, Coroutine, Dict, List, Set, Union, cast
+from typing import Any, Callable, Coroutine, Dict, List, Set, Tuple, Union, cast
 
 # Update the EventHandler type to accept both sync and async functions.
 EventHandler = Union[
@@ -18,7 +18,11 @@ class EventBus:
 
     def __init__(self, config: Any) -> None:
         """Initializes the event bus."""
-        self._subscribers: Dict[str, List[EventHandler]] = defaultdict(list)
+        # Each handler is stored with whether it is a coroutine function, so the
+        # check is paid once at subscribe time rather than on every publish.
+        self._subscribers: Dict[str, List[Tuple[EventHandler, bool]]] = defaultdict(
+            list
+        )
         # A set to keep track of all "fire-and-forget" async tasks.
         self._pending_tasks: Set[asyncio.Task] = set()
 
@@ -46,19 +50,24 @@ class EventBus:
 
     def subscribe(self, event_type: str, handler: EventHandler) -> None:
         """Subscribes a handler function to an event type."""
-        self._subscribers[event_type].append(handler)
+        self._subscribers[event_type].append(
+            (handler, inspect.iscoroutinefunction(handler))
+        )
 
     def publish(self, event_type: str, event_data: Dict[str, Any]) -> None:
         """Publishes an event to all subscribed handlers."""
         if self.debug_logging:
             print(f"DEBUG: Publishing event '{event_type}'")
 
-        for handler in self._subscribers[event_type]:
+        for handler, is_async in self._subscribers.get(event_type, ()):
             try:
-                if inspect.iscoroutinefunction(handler):
+                if is_async:
                     # --- MODIFICATION START ---
                     # Create the task and add it to our tracking set.
-                    task = asyncio.create_task(handler(event_data))
+                    async_handler = cast(
+                        Callable[[Dict[str, Any]], Coroutine[Any, Any, None]], handler
+                    )
+                    task = asyncio.create_task(async_handler(event_data))
                     self._pending_tasks.add(task)
                     task.add_done_callback(self._handle_task_exception)
                     # --- MODIFICATION END ---
@@ -34,3 +34,27 @@ class PerceptionProviderInterface(ABC):
             current_tick: The current simulation tick.
         """
         raise NotImplementedError
+
+    def update_perception_batch(
+        self,
+        entities: Dict[str, Dict[Type["Component"], "Component"]],
+        simulation_state: "SimulationState",
+        current_tick: int,
+    ) -> None:
+        """
+        Updates the perception of many entities at once.
+
+        The default implementation calls update_perception for each entity.
+        Providers whose sensing can be expressed over whole arrays should
+        override it to process every perceiver in one pass.
+
+        Args:
+            entities: A mapping of entity IDs to the components of each
+                      perceiving agent.
+            simulation_state: The current state of the entire simulation.
+            current_tick: The current simulation tick.
+        """
+        for entity_id, components in entities.items():
+            self.update_perception(
+                entity_id, components, simulation_state, current_tick
+            )
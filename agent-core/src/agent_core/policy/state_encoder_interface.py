@@ -1,6 +1,6 @@
 # src/agent_core/policy/state_encoder_interface.py
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, Dict, Optional, Type
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Type
 
 import numpy as np
 
@@ -41,6 +41,33 @@ class StateEncoderInterface(ABC):
         """
         raise NotImplementedError
 
+    def encode_states(
+        self,
+        simulation_state: "SimulationState",
+        entity_ids: Sequence[str],
+        config: Dict[str, Any],
+    ) -> np.ndarray:
+        """
+        Encodes the state of several entities at once.
+
+        The default implementation stacks the results of encode_state.
+        Encoders that can gather their features column-wise should override it
+        to fill the whole batch in a few vectorized operations.
+
+        Args:
+            simulation_state: The main state object of the simulation.
+            entity_ids: The IDs of the entities to encode, in output row order.
+            config: The simulation configuration dictionary.
+        Returns:
+            A 2D numpy array with one row of state features per entity.
+        """
+        return np.stack(
+            [
+                self.encode_state(simulation_state, entity_id, config)
+                for entity_id in entity_ids
+            ]
+        )
+
     @abstractmethod
     def encode_internal_state(
         self, components: Dict[Type["Component"], "Component"], config: Any
@@ -41,6 +41,15 @@ class MultiDomainIdentity(MultiDomainIdentityInterface):
         embedding_dim is defaulted to `1536` as that's the standard dim set by OpenAI.
     """
 
+    # How much each domain's identity depends on social validation
+    SOCIAL_VALIDATION_WEIGHTS: Dict[IdentityDomain, float] = {
+        IdentityDomain.SOCIAL: 0.9,
+        IdentityDomain.COMPETENCE: 0.6,
+        IdentityDomain.MORAL: 0.4,
+        IdentityDomain.RELATIONAL: 0.8,
+        IdentityDomain.AGENCY: 0.3,
+    }
+
     def __init__(self, embedding_dim: int = 1536):
         self.embedding_dim = embedding_dim
         self.domains: Dict[IdentityDomain, DomainIdentity] = {}
@@ -153,14 +162,7 @@ class MultiDomainIdentity(MultiDomainIdentityInterface):
         if not social_feedback:
             return 0.3
 
-        domain_weights = {
-            IdentityDomain.SOCIAL: 0.9,
-            IdentityDomain.COMPETENCE: 0.6,
-            IdentityDomain.MORAL: 0.4,
-            IdentityDomain.RELATIONAL: 0.8,
-            IdentityDomain.AGENCY: 0.3,
-        }
-        base_validation = domain_weights.get(domain, 0.5)
+        base_validation = self.SOCIAL_VALIDATION_WEIGHTS.get(domain, 0.5)
 
         positive_interactions = social_feedback.get("positive_social_responses", 0.0)
         negative_interactions = social_feedback.get("negative_social_responses", 0.0)
@@ -112,6 +112,9 @@ class SimulationManager:
         if self.main_rng:
             self.main_rng.shuffle(active_entities)
 
+        self.decision_selector.prepare_turns(
+            self.simulation_state, active_entities, step
+        )
         for i, entity_id in enumerate(active_entities):
             print(f"--- Processing agent {i + 1}/{len(active_entities)}: {entity_id}")
             self._process_entity_turn(entity_id, step)
@@ -131,10 +134,13 @@ class SimulationManager:
             f"\nStarting simulation {self.simulation_id} from step {start_step} to {num_steps}..."
         )
 
-        for step in range(start_step, num_steps):
-            should_continue = await self._execute_simulation_step(step)
-            if not should_continue:
-                break
+        try:
+            for step in range(start_step, num_steps):
+                should_continue = await self._execute_simulation_step(step)
+                if not should_continue:
+                    break
+        finally:
+            self.system_manager.close_all()
 
         print("\nSimulation loop finished.")
         self.save_state(num_steps)
@@ -167,12 +173,11 @@ class SimulationManager:
 
     def _process_entity_turn(self, entity_id: str, current_tick: int) -> None:
         """Handles decision-making and action-dispatching for a single entity."""
-        time_comp = self.simulation_state.get_component(entity_id, TimeBudgetComponent)
-        if (
-            not time_comp
-            or not hasattr(time_comp, "is_active")
-            or not time_comp.is_active
-        ):
+        time_comp = cast(
+            Optional[TimeBudgetComponent],
+            self.simulation_state.get_component(entity_id, TimeBudgetComponent),
+        )
+        if not time_comp or not time_comp.is_active:
             return
 
         possible_actions = self.action_generator.generate(
@@ -3,7 +3,7 @@
 Consolidates all simulation data, acting as the central state container.
 """
 
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Type
 
 import numpy as np
 from agent_core.core.ecs.abstractions import AbstractSimulationState
@@ -31,6 +31,12 @@ class SimulationState(AbstractSimulationState):
         self.config = config
         self.device = device
         self.entities: Dict[str, Dict[Type[Component], Component]] = {}
+        # Column-oriented view of the same data: one table per component type,
+        # so queries only visit entities that actually own the component.
+        self._component_tables: Dict[Type[Component], Dict[str, Component]] = {}
+        # Each component type gets a bit; each entity keeps the OR of its bits.
+        self._component_bits: Dict[Type[Component], int] = {}
+        self._entity_masks: Dict[str, int] = {}
         self.simulation_id: str = ""
         self.environment: Optional["EnvironmentInterface"] = None
         self._event_bus: Optional["EventBus"] = None
@@ -121,13 +127,46 @@ class SimulationState(AbstractSimulationState):
         if entity_id in self.entities:
             raise ValueError(f"Entity with ID {entity_id} already exists.")
         self.entities[entity_id] = {}
+        self._entity_masks[entity_id] = 0
 
     def add_component(self, entity_id: str, component: Component) -> None:
         if entity_id not in self.entities:
             raise ValueError(
                 f"Cannot add component. Entity with ID {entity_id} does not exist."
             )
-        self.entities[entity_id][type(component)] = component
+        component_type = type(component)
+        self.entities[entity_id][component_type] = component
+        self._component_tables.setdefault(component_type, {})[entity_id] = component
+        self._entity_masks[entity_id] |= self._bit_for(component_type)
+
+    def add_entities_bulk(
+        self, entries: Iterable[Tuple[str, Iterable[Component]]]
+    ) -> None:
+        """
+        Adds many entities, each with its initial components, in one pass.
+
+        Equivalent to add_entity followed by add_component for every
+        component, but each entity's component dict and mask are built
+        locally and stored once.
+        """
+        entities = self.entities
+        tables = self._component_tables
+        masks = self._entity_masks
+        for entity_id, components in entries:
+            if entity_id in entities:
+                raise ValueError(f"Entity with ID {entity_id} already exists.")
+            component_map: Dict[Type[Component], Component] = {}
+            mask = 0
+            for component in components:
+                component_type = type(component)
+                component_map[component_type] = component
+                table = tables.get(component_type)
+                if table is None:
+                    table = tables[component_type] = {}
+                table[entity_id] = component
+                mask |= self._bit_for(component_type)
+            entities[entity_id] = component_map
+            masks[entity_id] = mask
 
     def get_component(
         self, entity_id: str, component_type: Type[Component]
@@ -135,14 +174,46 @@ class SimulationState(AbstractSimulationState):
         return self.entities.get(entity_id, {}).get(component_type)
 
     def remove_entity(self, entity_id: str) -> None:
-        if entity_id in self.entities:
-            del self.entities[entity_id]
+        components = self.entities.pop(entity_id, None)
+        if components is None:
+            return
+        self._entity_masks.pop(entity_id, None)
+        for component_type in components:
+            table = self._component_tables.get(component_type)
+            if table is not None:
+                table.pop(entity_id, None)
+
+    def _bit_for(self, component_type: Type[Component]) -> int:
+        bit = self._component_bits.get(component_type)
+        if bit is None:
+            bit = 1 << len(self._component_bits)
+            self._component_bits[component_type] = bit
+        return bit
+
+    def get_component_table(
+        self, component_type: Type[Component]
+    ) -> Dict[str, Component]:
+        """Returns the entity_id -> component table for a single component type."""
+        return self._component_tables.get(component_type, {})
 
     def get_entities_with_components(
         self, component_types: List[Type[Component]]
     ) -> Dict[str, Dict[Type[Component], Component]]:
-        matching_entities = {}
-        for entity_id, components in self.entities.items():
-            if all(comp_type in components for comp_type in component_types):
-                matching_entities[entity_id] = components
-        return matching_entities
+        if not component_types:
+            return dict(self.entities)
+
+        required = 0
+        for comp_type in component_types:
+            bit = self._component_bits.get(comp_type)
+            if bit is None:
+                return {}
+            required |= bit
+
+        smallest = min((self._component_tables[t] for t in component_types), key=len)
+        masks = self._entity_masks
+        entities = self.entities
+        return {
+            entity_id: entities[entity_id]
+            for entity_id in smallest
+            if masks[entity_id] & required == required
+        }
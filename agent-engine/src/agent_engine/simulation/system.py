@@ -31,6 +31,12 @@ class System(CognitiveSystem, SystemProtocol):
         """
         raise NotImplementedError
 
+    def close(self) -> None:
+        """
+        Releases resources held by the system once the run has ended, such
+        as background writers. Does nothing by default.
+        """
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__} System"
 
@@ -75,6 +81,11 @@ class SystemManager:
         # The runner handles concurrent execution and error logging.
         await self.runner.run(self._systems, current_tick=current_tick)
 
+    def close_all(self) -> None:
+        """Closes every registered system, in registration order."""
+        for system_instance in self._systems:
+            system_instance.close()
+
     def get_system(self, system_type: Type[System]) -> Optional[System]:
         """
         Retrieves a system instance of the given type.
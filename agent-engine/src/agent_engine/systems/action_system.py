@@ -100,11 +100,14 @@ class ActionSystem(System):
                 },
             )
 
-        print(
-            f"""   Entity {entity_id}
+        # Formatting and writing a line for every action dominates this
+        # handler, so it is only done when the event bus is tracing events
+        if self.event_bus and self.event_bus.debug_logging:
+            print(
+                f"""   Entity {entity_id}
               executed {action_plan.action_type.name}.
               Final Reward: {final_reward:.3f}"""
-        )
+            )
 
     def _update_entity_components(
         self, entity_id: str, outcome: ActionOutcome, plan: ActionPlanComponent
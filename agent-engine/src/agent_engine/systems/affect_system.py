@@ -181,14 +181,13 @@ class AffectSystem(System):
         time_norm = vitality_metrics.get("time_norm", 0.5)
         res_norm = vitality_metrics.get("resources_norm", 0.5)
 
-        action_ids = action_registry.action_ids
-        action_type_oh = np.zeros(len(action_ids), dtype=np.float32)
-        if hasattr(action_plan.action_type, "action_id"):
-            try:
-                idx = action_ids.index(action_plan.action_type.action_id)
-                action_type_oh[idx] = 1.0
-            except ValueError:
-                pass  # action_id not in registry
+        # Unregistered or id-less action types encode as all zeros
+        action_type_oh = np.array(
+            action_registry.one_hot(
+                getattr(action_plan.action_type, "action_id", None)
+            ),
+            dtype=np.float32,
+        )
 
         return AffectiveExperience(
             valence=emotion.valence,
@@ -1,6 +1,6 @@
 # FILE: agent-engine/src/agent_engine/systems/perception_system.py
 
-from typing import Any, List, Type, cast
+from typing import Any, List, Type
 
 from agent_core.core.ecs.component import Component, PerceptionComponent
 from agent_core.environment.perception_provider_interface import (
@@ -51,12 +51,11 @@ class PerceptionSystem(System):
             self.REQUIRED_COMPONENTS
         )
 
-        for entity_id, components in entities_that_perceive.items():
-            perception_comp = cast(
-                PerceptionComponent, components.get(PerceptionComponent)
-            )
-            if perception_comp:
-                # Delegate the actual "seeing" logic to the provider
-                self.perception_provider.update_perception(
-                    entity_id, components, self.simulation_state, current_tick
-                )
+        if not entities_that_perceive:
+            return
+
+        # Delegate the actual "seeing" logic to the provider, which may batch
+        # the whole population into a single pass.
+        self.perception_provider.update_perception_batch(
+            entities_that_perceive, self.simulation_state, current_tick
+        )
@@ -29,6 +29,14 @@ from agent_engine.systems.causal_graph_system import CausalGraphSystem
 from agent_engine.systems.components import QLearningComponent
 
 
+def _cpu_supports_bf16() -> bool:
+    """Whether this CPU runs bfloat16 kernels natively rather than emulated."""
+    return bool(
+        torch.backends.mkldnn.is_available()
+        and torch.ops.mkldnn._is_mkldnn_bf16_supported()
+    )
+
+
 class QLearningSystem(System):
     """
     Manages the Q-learning process for all agents, now enhanced with causal inference.
@@ -59,19 +67,33 @@ class QLearningSystem(System):
             self.event_bus.subscribe("action_executed", self.on_action_executed)
 
         self.previous_states: Dict[str, np.ndarray] = {}
+        # Optionally run the network's forward passes in bfloat16 on CPUs with
+        # native support. Weights and optimizer state stay in float32, so small
+        # updates are not rounded away.
+        self.bf16_autocast = (
+            bool(config.learning.q_learning.get("bf16_autocast", False))
+            and _cpu_supports_bf16()
+        )
 
     async def update(self, current_tick: int) -> None:
         """Caches the current state features for each active learning agent."""
         target_entities = self.simulation_state.get_entities_with_components(
             self.REQUIRED_COMPONENTS
         )
+        active_ids = []
         for entity_id, components in target_entities.items():
             time_comp = cast(TimeBudgetComponent, components.get(TimeBudgetComponent))
             if time_comp and time_comp.is_active:
-                current_state_features = self.state_encoder.encode_state(
-                    self.simulation_state, entity_id, self.config
-                )
-                self.previous_states[entity_id] = current_state_features
+                active_ids.append(entity_id)
+        if not active_ids:
+            return
+
+        # Encode the whole population in one batch; each agent keeps its own row.
+        state_batch = self.state_encoder.encode_states(
+            self.simulation_state, active_ids, self.config
+        )
+        for entity_id, current_state_features in zip(active_ids, state_batch):
+            self.previous_states[entity_id] = current_state_features
 
     def on_action_executed(self, event_data: Dict[str, Any]) -> None:
         """Event handler that triggers the Q-learning update step."""
@@ -145,26 +167,30 @@ class QLearningSystem(System):
     ) -> None:
         """Pure Q-learning logic using the Bellman equation."""
         device = self.simulation_state.device
-        old_state_t = (
-            torch.tensor(old_state, dtype=torch.float32).unsqueeze(0).to(device)
-        )
-        new_state_t = (
-            torch.tensor(new_state, dtype=torch.float32).unsqueeze(0).to(device)
-        )
-        action_t = (
-            torch.tensor(action_features, dtype=torch.float32).unsqueeze(0).to(device)
-        )
-        internal_t = (
-            torch.tensor(internal_features, dtype=torch.float32).unsqueeze(0).to(device)
-        )
-        reward_t = torch.tensor(reward, dtype=torch.float32).to(device)
+        # The encoders already produce float32 arrays (the old state is a row of
+        # the batch encoded in update), so as_tensor shares their memory on CPU
+        # instead of copying them for every learning step.
+        old_state_t = torch.as_tensor(
+            old_state, dtype=torch.float32, device=device
+        ).unsqueeze(0)
+        new_state_t = torch.as_tensor(
+            new_state, dtype=torch.float32, device=device
+        ).unsqueeze(0)
+        action_t = torch.as_tensor(
+            action_features, dtype=torch.float32, device=device
+        ).unsqueeze(0)
+        internal_t = torch.as_tensor(
+            internal_features, dtype=torch.float32, device=device
+        ).unsqueeze(0)
+        reward_t = torch.tensor(reward, dtype=torch.float32, device=device)
 
         q_comp.optimizer.zero_grad()
-        current_q = q_comp.utility_network(old_state_t, internal_t, action_t)
+        with self._autocast(device):
+            current_q = q_comp.utility_network(old_state_t, internal_t, action_t)
 
         max_next_q = 0.0
         if possible_next_actions:
-            with torch.no_grad():
+            with torch.no_grad(), self._autocast(device):
                 next_action_features_list = [
                     plan.action_type.get_feature_vector(
                         entity_id, self.simulation_state, plan.params
@@ -173,9 +199,12 @@ class QLearningSystem(System):
                     if isinstance(plan.action_type, ActionInterface)
                 ]
                 if next_action_features_list:
-                    next_action_tensors = torch.tensor(
-                        np.array(next_action_features_list), dtype=torch.float32
-                    ).to(device)
+                    # Stacked straight to float32, so the tensor wraps the
+                    # array instead of converting a float64 copy
+                    next_action_tensors = torch.as_tensor(
+                        np.array(next_action_features_list, dtype=np.float32),
+                        device=device,
+                    )
                     num_next = next_action_tensors.shape[0]
                     next_q_values = q_comp.utility_network(
                         new_state_t.expand(num_next, -1),
@@ -188,7 +217,7 @@ class QLearningSystem(System):
         gamma = self.config.learning.q_learning.gamma
         target_q = reward_t + gamma * max_next_q
 
-        loss = q_comp.loss_fn(current_q.squeeze(), target_q.detach())
+        loss = q_comp.loss_fn(current_q.squeeze().float(), target_q.detach())
         loss.backward()
         q_comp.optimizer.step()
 
@@ -202,6 +231,11 @@ class QLearningSystem(System):
                 },
             )
 
+    def _autocast(self, device: Any) -> torch.autocast:
+        """Returns the bfloat16 autocast context for CPU learning steps."""
+        enabled = self.bf16_autocast and torch.device(device).type == "cpu"
+        return torch.autocast("cpu", dtype=torch.bfloat16, enabled=enabled)
+
     def _generate_possible_action_plans(
         self, entity_id: str, current_tick: int
     ) -> List[ActionPlanComponent]:
@@ -1,14 +1,18 @@
 # agent-engine/src/agent_engine/utils/class_importer.py
+import functools
 import importlib
 from typing import Type, cast
 
 from agent_core.core.ecs.component import Component
 
 
+@functools.lru_cache(maxsize=None)
 def import_class(class_path: str) -> Type[Component]:
     """
     Helper to dynamically import a component class from its full path string.
 
+    Resolved classes are cached, since snapshot restores look up the same
+    handful of paths once per component. Failed lookups are not cached.
     """
     try:
         module_path, class_name = class_path.rsplit(".", 1)
@@ -3,7 +3,6 @@
 import asyncio
 import os
 import threading
-import time
 from abc import ABC, abstractmethod
 from typing import Any, Coroutine, Optional
 
@@ -47,18 +46,21 @@ class ThreadedAsyncRunner(AsyncRunner):
         self._start_event_loop()
 
     def _start_event_loop(self) -> None:
+        loop_ready = threading.Event()
+
         def run_loop():
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
             self._loop = loop
+            loop.call_soon(loop_ready.set)
             loop.run_forever()
 
         self._loop = None
         self._thread = threading.Thread(target=run_loop, daemon=True)
         self._thread.start()
 
-        while self._loop is None:
-            time.sleep(0.01)
+        # Block until the loop is actually running instead of polling with sleeps
+        loop_ready.wait()
 
     def run_async(self, coro: Coroutine) -> Any:
         if (
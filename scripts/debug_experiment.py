@@ -1,9 +1,14 @@
+import argparse
+import os
 import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, List, cast
 
 from agent_sim.infrastructure.tasks.simulation_tasks import run_experiment_task
 from dotenv import load_dotenv
-from omegaconf import OmegaConf
+from omegaconf import DictConfig, OmegaConf
 
 # This script must be run from the project's root directory.
 # Add the project root to the path to ensure all imports work correctly.
@@ -11,53 +16,96 @@ project_root = Path(__file__).resolve().parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-print("--- Running Experiment Task Directly for Debugging ---")
-
-# 1. Load the .env file to get environment variables like MLFLOW_TRACKING_URI
-env_path = project_root / ".env"
-if env_path.exists():
-    print(f"✅ Loading environment variables from: {env_path}")
-    load_dotenv(dotenv_path=env_path)
-else:
-    print(f"❌ CRITICAL: .env file not found at {env_path}. The task will fail.")
-    sys.exit(1)
-
-# 2. Load the experiment definition file
-experiment_file = (
-    project_root / "simulations/schelling_sim/experiments/schelling_study.yml"
-)
-print(f"✅ Loading experiment definition from: {experiment_file}")
-exp_def = OmegaConf.load(experiment_file)
-
-# 3. Load the base config and merge overrides for one variation
-base_config_path = project_root / exp_def.base_config_path
-base_config = OmegaConf.load(base_config_path)
-variation = exp_def.variations[0]  # We only need to test one variation
-final_config = OmegaConf.merge(base_config, variation.get("overrides", {}))
-config_dict = OmegaConf.to_container(final_config, resolve=True)
-
-# 4. Construct the arguments for the task
-task_kwargs = {
-    "scenario_paths": list(exp_def.scenarios),
-    "runs_per_scenario": exp_def.runs_per_scenario,
-    "base_config": config_dict,
-    "simulation_package": exp_def.simulation_package,
-    "experiment_name": f"{exp_def.experiment_name} - {variation.name}",
-}
-
-print("\n🚀 Calling the experiment task directly...")
-
-try:
-    # 5. Run the task in the current process instead of sending to a worker
-    # We use .apply() which is a synchronous, direct call.
-    result = run_experiment_task.apply(kwargs=task_kwargs)
-    print("\n✅ Task completed successfully!")
-    print(f"📄 Result: {result.get()}")
-    print("\nCheck your MLflow UI and database now.")
-
-except Exception:
-    print("\n❌ An error occurred while running the task directly:")
-    # This will give us the detailed traceback we need.
-    import traceback
-
-    traceback.print_exc()
+
+def build_task_kwargs(exp_def: DictConfig, variation: DictConfig) -> Dict[str, Any]:
+    """Merges one variation into the base config and builds the task arguments."""
+    base_config_path = project_root / exp_def.base_config_path
+    base_config = OmegaConf.load(base_config_path)
+    variation_overrides = variation.get("overrides", {})
+    final_config = OmegaConf.merge(base_config, variation_overrides)
+    # The task arguments are JSON-serialized by Celery and stored in the database,
+    # so the config has to be converted to plain containers exactly once, here.
+    config_dict = OmegaConf.to_container(final_config, resolve=True)
+    overrides_dict = OmegaConf.to_container(
+        OmegaConf.create(variation_overrides), resolve=True
+    )
+
+    return {
+        "scenario_paths": list(exp_def.scenarios),
+        "runs_per_scenario": exp_def.runs_per_scenario,
+        "base_config": config_dict,
+        "simulation_package": exp_def.simulation_package,
+        "experiment_name": f"{exp_def.experiment_name} - {variation.name}",
+        "variation_name": variation.name,
+        "variation_overrides": overrides_dict,
+    }
+
+
+def _run_one(task_kwargs: Dict[str, Any]) -> Any:
+    """Runs the experiment task in the current process instead of on a worker."""
+    # .apply() is a synchronous, direct call
+    return run_experiment_task.apply(kwargs=task_kwargs).get()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the experiment task directly for debugging."
+    )
+    parser.add_argument(
+        "--serial",
+        action="store_true",
+        help="Run the variations one after another in this process, which keeps "
+        "tracebacks readable.",
+    )
+    args = parser.parse_args()
+
+    print("--- Running Experiment Task Directly for Debugging ---")
+
+    # 1. Load the .env file to get environment variables like MLFLOW_TRACKING_URI
+    env_path = project_root / ".env"
+    if env_path.exists():
+        print(f"✅ Loading environment variables from: {env_path}")
+        load_dotenv(dotenv_path=env_path)
+    else:
+        print(f"❌ CRITICAL: .env file not found at {env_path}. The task will fail.")
+        sys.exit(1)
+
+    # 2. Load the experiment definition file
+    experiment_file = (
+        project_root / "simulations/schelling_sim/experiments/schelling_study.yml"
+    )
+    print(f"✅ Loading experiment definition from: {experiment_file}")
+    # An experiment definition is always a mapping, never a top-level list
+    exp_def = cast(DictConfig, OmegaConf.load(experiment_file))
+
+    # 3. Construct the task arguments for every variation
+    kwargs_list: List[Dict[str, Any]] = [
+        build_task_kwargs(exp_def, variation) for variation in exp_def.variations
+    ]
+
+    print(
+        f"\n🚀 Calling the experiment task directly for {len(kwargs_list)} variations..."
+    )
+
+    try:
+        # 4. Run the variations, in parallel worker processes unless --serial is set
+        if args.serial or len(kwargs_list) < 2:
+            results = [_run_one(task_kwargs) for task_kwargs in kwargs_list]
+        else:
+            max_workers = min(len(kwargs_list), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_run_one, kwargs_list))
+
+        print("\n✅ Task completed successfully!")
+        for task_kwargs, result in zip(kwargs_list, results):
+            print(f"📄 Result for '{task_kwargs['variation_name']}': {result}")
+        print("\nCheck your MLflow UI and database now.")
+
+    except Exception:
+        print("\n❌ An error occurred while running the task directly:")
+        # This will give us the detailed traceback we need.
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
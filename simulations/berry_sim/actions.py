@@ -1,6 +1,6 @@
 # FILE: simulations/berry_sim/actions.py
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 from agent_core.agents.actions.action_interface import ActionInterface
 from agent_core.agents.actions.action_registry import action_registry
 from agent_core.agents.actions.base_action import ActionOutcome
@@ -13,6 +13,9 @@ from .environment import BerryWorldEnvironment
 class MoveAction(ActionInterface):
     """Allows an agent to move to an adjacent grid cell."""
 
+    # Shared by every call, so callers must treat it as read-only
+    FEATURES: List[float] = [1.0, 0.0, 0.0, 0.0]
+
     @property
     def action_id(self) -> str:
         return "move"
@@ -31,13 +34,17 @@ class MoveAction(ActionInterface):
         env = sim_state.environment
         if not pos_comp or not isinstance(env, BerryWorldEnvironment):
             return []
+        return self.params_at(env, pos_comp.position)
 
-        valid_moves = []
-        for dx, dy, direction in [(0, 1, "N"), (0, -1, "S"), (1, 0, "E"), (-1, 0, "W")]:
-            new_pos = (pos_comp.position[0] + dx, pos_comp.position[1] + dy)
-            if env.is_valid_position(new_pos) and not env.is_occupied(new_pos):
-                valid_moves.append({"target_pos": new_pos, "direction": direction})
-        return valid_moves
+    def params_at(
+        self, env: BerryWorldEnvironment, position: Tuple[int, int]
+    ) -> List[Dict[str, Any]]:
+        """Lists the moves open to an agent already known to be at position."""
+        return [
+            {"target_pos": target, "direction": direction}
+            for target, direction in env.move_targets(position)
+            if not env.is_occupied(target)
+        ]
 
     def execute(
         self,
@@ -54,13 +61,22 @@ class MoveAction(ActionInterface):
     ) -> List[float]:
         # Padded the vector to have a length of 4 to match EatBerryAction.
         # The schema is now [is_move, is_eat_red, is_eat_blue, is_eat_yellow]
-        return [1.0, 0.0, 0.0, 0.0]
+        return self.FEATURES
 
 
 @action_registry.register
 class EatBerryAction(ActionInterface):
     """Allows an agent to eat a berry at its current location."""
 
+    # One-hot feature vectors per berry type, shared by every call, so
+    # callers must treat them as read-only
+    FEATURES_BY_TYPE: Dict[str, List[float]] = {
+        "red": [0.0, 1.0, 0.0, 0.0],
+        "blue": [0.0, 0.0, 1.0, 0.0],
+        "yellow": [0.0, 0.0, 0.0, 1.0],
+    }
+    UNKNOWN_FEATURES: List[float] = [0.0, 0.0, 0.0, 0.0]
+
     @property
     def action_id(self) -> str:
         return "eat_berry"
@@ -79,8 +95,13 @@ class EatBerryAction(ActionInterface):
         env = sim_state.environment
         if not pos_comp or not isinstance(env, BerryWorldEnvironment):
             return []
+        return self.params_at(env, pos_comp.position)
 
-        berry_type = env.berry_locations.get(pos_comp.position)
+    def params_at(
+        self, env: BerryWorldEnvironment, position: Tuple[int, int]
+    ) -> List[Dict[str, Any]]:
+        """Lists the berry an agent already known to be at position can eat."""
+        berry_type = env.berry_locations.get(position)
         if berry_type:
             return [{"berry_type": berry_type}]
         return []
@@ -100,11 +121,7 @@ class EatBerryAction(ActionInterface):
     def get_feature_vector(
         self, entity_id: str, sim_state: SimulationState, params: Dict[str, Any]
     ) -> List[float]:
-        berry_type = params.get("berry_type", "")
         # The schema is [is_move, is_eat_red, is_eat_blue, is_eat_yellow]
-        return [
-            0.0,
-            1.0 if berry_type == "red" else 0.0,
-            1.0 if berry_type == "blue" else 0.0,
-            1.0 if berry_type == "yellow" else 0.0,
-        ]
+        return self.FEATURES_BY_TYPE.get(
+            params.get("berry_type", ""), self.UNKNOWN_FEATURES
+        )
@@ -11,16 +11,60 @@ significant.
 Sample Usage:
     # Run from within the Docker container to ensure DB access
     docker compose exec app poetry run python scripts/analyze_ab_test.py
+
+    # Aggregate client-side over a streamed cursor instead of in SQL
+    docker compose exec app poetry run python scripts/analyze_ab_test.py --stream
 """
 
+import argparse
+import math
 import os
 from typing import Dict, Tuple
 
 import pandas as pd
 from dotenv import load_dotenv
-from scipy.stats import ttest_ind
+from scipy.stats import t as t_dist
 from sqlalchemy import create_engine, text
 
+# Selects the final average health and agent type of every run in the two most
+# recent experiments matching the name, to capture both halves of the A/B test.
+FINAL_HEALTH_QUERY = """
+    WITH LatestExperimentIDs AS (
+        -- Step 1: Find the IDs of the two most recent experiments for the A/B test.
+        SELECT id
+        FROM experiments
+        WHERE name = :exp_name
+        ORDER BY created_at DESC
+        LIMIT 2
+    ),
+    FinalMetrics AS (
+        -- Step 2: Get the metric value from the very last tick for each simulation run
+        -- belonging to those experiments.
+        SELECT DISTINCT ON (simulation_id)
+            simulation_id,
+            (data ->> 'average_agent_health')::float AS final_avg_health
+        FROM metrics
+        WHERE simulation_id IN (
+            SELECT id FROM simulation_runs WHERE experiment_id IN (SELECT id FROM LatestExperimentIDs)
+        )
+        ORDER BY simulation_id, tick DESC
+    )
+    -- Step 3: Join the results to get the agent type and final health.
+    SELECT
+        CASE
+            WHEN sr.config -> 'simulation' ->> 'enable_causal_system' = 'true'
+            THEN 'Causal Agent'
+            ELSE 'Baseline Agent'
+        END AS agent_type,
+        fm.final_avg_health
+    FROM
+        simulation_runs sr
+    JOIN
+        FinalMetrics fm ON sr.id = fm.simulation_id
+    WHERE
+        sr.experiment_id IN (SELECT id FROM LatestExperimentIDs)
+"""
+
 
 def get_db_connection():
     """
@@ -42,100 +86,137 @@ def get_db_connection():
     return create_engine(db_url)
 
 
-def fetch_experiment_data(engine, experiment_name: str) -> pd.DataFrame:
+def fetch_group_statistics(
+    engine, experiment_name: str
+) -> Dict[str, Tuple[int, float, float]]:
     """
-    Fetches the final average health for each run in a given experiment.
+    Aggregates the final average health per agent type inside the database.
 
     Args:
         engine: The SQLAlchemy engine for the database connection.
         experiment_name: The name of the experiment to analyze.
 
     Returns:
-        A pandas DataFrame containing the agent type and final health for each run.
+        A dictionary mapping each agent type to its (count, mean, sample variance).
     """
-    # This query selects data from the two most recent experiments
-    # matching the name to correctly capture both halves of the A/B test.
     query = text(
-        """
-        WITH LatestExperimentIDs AS (
-            -- Step 1: Find the IDs of the two most recent experiments for the A/B test.
-            SELECT id
-            FROM experiments
-            WHERE name = :exp_name
-            ORDER BY created_at DESC
-            LIMIT 2
-        ),
-        FinalMetrics AS (
-            -- Step 2: Get the metric value from the very last tick for each simulation run
-            -- belonging to those experiments.
-            SELECT DISTINCT ON (simulation_id)
-                simulation_id,
-                (data ->> 'average_agent_health')::float AS final_avg_health
-            FROM metrics
-            WHERE simulation_id IN (
-                SELECT id FROM simulation_runs WHERE experiment_id IN (SELECT id FROM LatestExperimentIDs)
-            )
-            ORDER BY simulation_id, tick DESC
-        )
-        -- Step 3: Join the results to get the agent type and final health.
+        f"""
         SELECT
-            CASE
-                WHEN sr.config -> 'simulation' ->> 'enable_causal_system' = 'true'
-                THEN 'Causal Agent'
-                ELSE 'Baseline Agent'
-            END AS agent_type,
-            fm.final_avg_health
-        FROM
-            simulation_runs sr
-        JOIN
-            FinalMetrics fm ON sr.id = fm.simulation_id
-        WHERE
-            sr.experiment_id IN (SELECT id FROM LatestExperimentIDs);
+            agent_type,
+            COUNT(final_avg_health) AS n,
+            AVG(final_avg_health) AS mean,
+            VAR_SAMP(final_avg_health) AS variance
+        FROM ({FINAL_HEALTH_QUERY}) AS per_run
+        GROUP BY agent_type
+        HAVING COUNT(final_avg_health) > 0
+        ORDER BY agent_type DESC;
         """
     )
     with engine.connect() as connection:
-        df = pd.read_sql(query, connection, params={"exp_name": experiment_name})
-    return df
+        rows = connection.execute(query, {"exp_name": experiment_name}).all()
+    return {
+        agent_type: (
+            int(n),
+            float(mean),
+            float(variance) if variance is not None else math.nan,
+        )
+        for agent_type, n, mean, variance in rows
+    }
+
+
+def _merge_moments(
+    left: Tuple[int, float, float], right: Tuple[int, float, float]
+) -> Tuple[int, float, float]:
+    """Combines two (count, mean, M2) summaries (Chan et al.'s parallel Welford)."""
+    n_left, mean_left, m2_left = left
+    n_right, mean_right, m2_right = right
+    n = n_left + n_right
+    delta = mean_right - mean_left
+    mean = mean_left + delta * n_right / n
+    m2 = m2_left + m2_right + delta**2 * n_left * n_right / n
+    return n, mean, m2
+
+
+def stream_group_statistics(
+    engine, experiment_name: str, chunksize: int = 10_000
+) -> Dict[str, Tuple[int, float, float]]:
+    """
+    Computes the same per-group statistics as fetch_group_statistics, but
+    client-side, by streaming the per-run rows through a server-side cursor
+    and folding each chunk into running moments. Memory stays bounded by the
+    chunk size regardless of how many runs the experiment has.
+
+    Args:
+        engine: The SQLAlchemy engine for the database connection.
+        experiment_name: The name of the experiment to analyze.
+        chunksize: The number of rows to fetch per round-trip.
+
+    Returns:
+        A dictionary mapping each agent type to its (count, mean, sample variance).
+    """
+    moments: Dict[str, Tuple[int, float, float]] = {}
+    with engine.connect().execution_options(stream_results=True) as connection:
+        chunks = pd.read_sql(
+            text(FINAL_HEALTH_QUERY),
+            connection,
+            params={"exp_name": experiment_name},
+            chunksize=chunksize,
+        )
+        for chunk in chunks:
+            grouped = chunk.groupby("agent_type", sort=False)["final_avg_health"]
+            counts = grouped.count()
+            means = grouped.mean()
+            m2s = grouped.var(ddof=0) * counts
+            for agent_type, n in counts.items():
+                if n == 0:
+                    continue
+                summary = (int(n), float(means[agent_type]), float(m2s[agent_type]))
+                previous = moments.get(agent_type)
+                moments[agent_type] = (
+                    summary if previous is None else _merge_moments(previous, summary)
+                )
+
+    # Same group order as the SQL aggregation (agent_type DESC)
+    return {
+        agent_type: (n, mean, m2 / (n - 1) if n > 1 else math.nan)
+        for agent_type, (n, mean, m2) in sorted(moments.items(), reverse=True)
+    }
 
 
-def perform_t_test(
-    df: pd.DataFrame, group_col: str, value_col: str
+def welch_t_test(
+    group_stats: Dict[str, Tuple[int, float, float]],
 ) -> Tuple[Dict[str, float], float, float]:
     """
-    Performs an independent samples t-test between two groups in a DataFrame.
+    Performs Welch's t-test from per-group summary statistics.
 
     Args:
-        df: The DataFrame containing the data.
-        group_col: The name of the column that defines the two groups.
-        value_col: The name of the column with the values to compare.
+        group_stats: A dictionary mapping each of the two groups to its
+            (count, mean, sample variance).
 
     Returns:
         A tuple containing:
         - A dictionary of group means.
         - The calculated t-statistic.
-        - The calculated p-value.
+        - The calculated two-sided p-value.
     """
-    groups = df[group_col].unique()
-    if len(groups) != 2:
-        # Provide more debugging info in the error message
-        error_msg = (
-            f"Expected 2 groups for t-test, but found {len(groups)}. "
-            f"Groups found: {list(groups)}. "
+    if len(group_stats) != 2:
+        raise ValueError(
+            f"Expected 2 groups for t-test, but found {len(group_stats)}. "
+            f"Groups found: {list(group_stats)}. "
             "This may happen if one variation of the A/B test failed to produce metrics."
         )
-        raise ValueError(error_msg)
 
-    group1_data = df[df[group_col] == groups[0]][value_col]
-    group2_data = df[df[group_col] == groups[1]][value_col]
+    (group1, (n1, mean1, var1)), (group2, (n2, mean2, var2)) = group_stats.items()
+    group_means = {group1: mean1, group2: mean2}
 
-    # Calculate means for reporting
-    group_means = {
-        groups[0]: group1_data.mean(),
-        groups[1]: group2_data.mean(),
-    }
+    se1, se2 = var1 / n1, var2 / n2
+    std_err = math.sqrt(se1 + se2)
+    if std_err == 0 or math.isnan(std_err):
+        return group_means, math.nan, math.nan
 
-    # Perform the t-test
-    t_stat, p_value = ttest_ind(group1_data, group2_data, equal_var=False)
+    t_stat = (mean1 - mean2) / std_err
+    dof = (se1 + se2) ** 2 / (se1**2 / (n1 - 1) + se2**2 / (n2 - 1))
+    p_value = float(2 * t_dist.sf(abs(t_stat), dof))
 
     return group_means, t_stat, p_value
 
@@ -185,18 +266,27 @@ def main():
     """
     Main function to orchestrate the analysis.
     """
+    parser = argparse.ArgumentParser(
+        description="Statistical analysis of the Berry Sim A/B test results."
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Aggregate client-side over a streamed cursor instead of in SQL.",
+    )
+    args = parser.parse_args()
+
     try:
         engine = get_db_connection()
-        data = fetch_experiment_data(engine, "Berry Sim - Causal Agent A/B Test")
+        fetch_stats = stream_group_statistics if args.stream else fetch_group_statistics
+        group_stats = fetch_stats(engine, "Berry Sim - Causal Agent A/B Test")
 
-        if data.empty or len(data["agent_type"].unique()) < 2:
-            print("Could not find data for both agent types. Found data:")
-            print(data)
+        if len(group_stats) < 2:
+            print("Could not find data for both agent types. Found (n, mean, var):")
+            print(group_stats)
             return
 
-        means, t_stat, p_value = perform_t_test(
-            data, group_col="agent_type", value_col="final_avg_health"
-        )
+        means, t_stat, p_value = welch_t_test(group_stats)
         print_analysis_summary(means, t_stat, p_value)
 
     except Exception as e:
@@ -1,19 +1,34 @@
 # simulations/berry_sim/components.py
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from agent_core.core.ecs.component import Component
 
 
 class PositionComponent(Component):
     """Stores an entity's x, y coordinates in the grid world."""
 
+    # The coordinates live in a single tuple so that `position`, which is read
+    # far more often than it changes, is a plain attribute load.
+    __slots__ = ("position",)
+
     def __init__(self, x: int = 0, y: int = 0) -> None:
-        self.x = x
-        self.y = y
+        self.position: Tuple[int, int] = (x, y)
+
+    @property
+    def x(self) -> int:
+        return self.position[0]
+
+    @x.setter
+    def x(self, value: int) -> None:
+        self.position = (value, self.position[1])
 
     @property
-    def position(self) -> Tuple[int, int]:
-        return (self.x, self.y)
+    def y(self) -> int:
+        return self.position[1]
+
+    @y.setter
+    def y(self, value: int) -> None:
+        self.position = (self.position[0], value)
 
     def to_dict(self) -> Dict[str, Any]:
         return {"x": self.x, "y": self.y}
@@ -28,6 +43,8 @@ class PositionComponent(Component):
 class HealthComponent(Component):
     """Stores the health of an agent."""
 
+    __slots__ = ("current_health", "initial_health")
+
     def __init__(self, current_health: float, initial_health: float) -> None:
         self.current_health = current_health
         self.initial_health = initial_health
@@ -47,6 +64,8 @@ class HealthComponent(Component):
 class BerryComponent(Component):
     """Represents a berry resource in the environment."""
 
+    __slots__ = ("berry_type",)
+
     def __init__(self, berry_type: str) -> None:
         self.berry_type = berry_type  # "red", "blue", or "yellow"
 
@@ -62,6 +81,15 @@ class BerryComponent(Component):
 class WaterComponent(Component):
     """A marker component for a water tile."""
 
+    __slots__ = ()
+    _instance: Optional["WaterComponent"] = None
+
+    def __new__(cls) -> "WaterComponent":
+        # Stateless marker: every tile shares a single instance
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
     def to_dict(self) -> Dict[str, Any]:
         return {}
 
@@ -72,6 +100,15 @@ class WaterComponent(Component):
 class RockComponent(Component):
     """A marker component for a rock tile."""
 
+    __slots__ = ()
+    _instance: Optional["RockComponent"] = None
+
+    def __new__(cls) -> "RockComponent":
+        # Stateless marker: every tile shares a single instance
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
     def to_dict(self) -> Dict[str, Any]:
         return {}
 
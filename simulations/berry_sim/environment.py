@@ -1,24 +1,527 @@
 # simulations/berry_sim/environment.py
 
 import random
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
+import numpy as np
 from agent_core.environment.interface import EnvironmentInterface
 
+_MASK_64 = (1 << 64) - 1
+
+
+def _mix64(seed: int) -> int:
+    """SplitMix64 finalizer: a cheap, well-distributed 64-bit integer hash."""
+    z = (seed + 0x9E3779B97F4A7C15) & _MASK_64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return z ^ (z >> 31)
+
+
+class VersionedDict(Dict[Tuple[int, int], str]):
+    """
+    A dict that counts its mutations, so that indexes derived from it can be
+    rebuilt lazily instead of on every read.
+
+    Single-key mutations are also journaled in order of their last change,
+    which lets an index patch itself instead of rebuilding from scratch.
+    Bulk mutations, or a journal past MAX_JOURNAL keys, reset the journal
+    to None to mean "rebuild everything".
+    """
+
+    __slots__ = ("version", "_bulk_epoch", "_changed")
+
+    MAX_JOURNAL = 32
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.version = 0
+        # Bulk mutations can change many keys for one version bump, which
+        # breaks the version/size arithmetic of only_removed_since, so they
+        # also bump this to invalidate every outstanding stamp
+        self._bulk_epoch = 0
+        self._changed: Optional[Dict[Tuple[int, int], None]] = {}
+
+    def _touch(self, key: Tuple[int, int]) -> None:
+        self.version += 1
+        changed = self._changed
+        if changed is None:
+            return
+        changed.pop(key, None)
+        changed[key] = None
+        if len(changed) > self.MAX_JOURNAL:
+            self._changed = None
+
+    def _touch_all(self) -> None:
+        self.version += 1
+        self._bulk_epoch += 1
+        self._changed = None
+
+    def stamp(self) -> Tuple[int, int, int]:
+        """Returns a marker of the current contents for only_removed_since."""
+        return self.version, len(self), self._bulk_epoch
+
+    def only_removed_since(self, stamp: Tuple[int, int, int]) -> bool:
+        """
+        Returns True if every mutation since the stamp removed a key, so
+        anything derived from the stamped contents only lost entries. Any
+        bulk mutation since the stamp makes this False.
+        """
+        version, size, bulk_epoch = stamp
+        return bulk_epoch == self._bulk_epoch and self.version - version == size - len(
+            self
+        )
+
+    def drain_changes(self) -> Optional[List[Tuple[int, int]]]:
+        """
+        Returns the keys changed since the last drain, oldest first, or None
+        if the changes were not tracked key by key, and starts a new journal.
+        """
+        changed = self._changed
+        self._changed = {}
+        return None if changed is None else list(changed)
+
+    def __setitem__(self, key: Tuple[int, int], value: str) -> None:
+        super().__setitem__(key, value)
+        self._touch(key)
+
+    def __delitem__(self, key: Tuple[int, int]) -> None:
+        super().__delitem__(key)
+        self._touch(key)
+
+    def pop(self, key: Tuple[int, int], *default: Any) -> Any:  # type: ignore[override]
+        self._touch(key)
+        return super().pop(key, *default)
+
+    def popitem(self) -> Tuple[Tuple[int, int], str]:
+        self._touch_all()
+        return super().popitem()
+
+    def setdefault(self, key: Tuple[int, int], default: str) -> str:  # type: ignore[override]
+        self._touch(key)
+        return super().setdefault(key, default)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self._touch_all()
+
+    def __ior__(self, other: Any) -> "VersionedDict":  # type: ignore[override, misc]
+        super().__ior__(other)
+        self._touch_all()
+        return self
+
+    def clear(self) -> None:
+        super().clear()
+        self._touch_all()
+
+
+class VersionedSet(Set[Tuple[int, int]]):
+    """A set of grid cells that counts its mutations, like VersionedDict."""
+
+    __slots__ = ("version",)
+
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self.version = 0
+
+    def add(self, element: Tuple[int, int]) -> None:
+        super().add(element)
+        self.version += 1
+
+    def discard(self, element: Tuple[int, int]) -> None:
+        super().discard(element)
+        self.version += 1
+
+    def remove(self, element: Tuple[int, int]) -> None:
+        super().remove(element)
+        self.version += 1
+
+    def pop(self) -> Tuple[int, int]:
+        self.version += 1
+        return super().pop()
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+    def update(self, *others: Iterable[Tuple[int, int]]) -> None:
+        super().update(*others)
+        self.version += 1
+
+    def difference_update(self, *others: Iterable[Any]) -> None:
+        super().difference_update(*others)
+        self.version += 1
+
+    def intersection_update(self, *others: Iterable[Any]) -> None:
+        super().intersection_update(*others)
+        self.version += 1
+
+    def symmetric_difference_update(self, other: Iterable[Tuple[int, int]]) -> None:
+        super().symmetric_difference_update(other)
+        self.version += 1
+
+    def __ior__(self, other: Any) -> "VersionedSet":  # type: ignore[override, misc]
+        super().__ior__(other)
+        self.version += 1
+        return self
+
+    def __iand__(self, other: Any) -> "VersionedSet":  # type: ignore[override, misc]
+        super().__iand__(other)
+        self.version += 1
+        return self
+
+    def __isub__(self, other: Any) -> "VersionedSet":  # type: ignore[override, misc]
+        super().__isub__(other)
+        self.version += 1
+        return self
+
+    def __ixor__(self, other: Any) -> "VersionedSet":  # type: ignore[override, misc]
+        super().__ixor__(other)
+        self.version += 1
+        return self
+
 
 class BerryWorldEnvironment(EnvironmentInterface):
     """
     Manages the grid, berry spawning, and toxicity rules for the experiment.
     """
 
+    _NEIGHBOR_OFFSETS: Tuple[Tuple[int, int], ...] = (
+        (-1, -1),
+        (-1, 0),
+        (-1, 1),
+        (0, -1),
+        (0, 1),
+        (1, -1),
+        (1, 0),
+        (1, 1),
+    )
+
+    # Upper bound on the distance-matrix entries per nearest_berry_batch chunk
+    BATCH_CELLS = 1 << 20
+
+    # Cardinal moves available to agents, as (dx, dy, direction)
+    MOVE_DIRECTIONS: Tuple[Tuple[int, int, str], ...] = (
+        (0, 1, "N"),
+        (0, -1, "S"),
+        (1, 0, "E"),
+        (-1, 0, "W"),
+    )
+
+    # Bit flags used by occupancy_grid()
+    AGENT_FLAG = 1
+    WATER_FLAG = 2
+    ROCK_FLAG = 4
+    BERRY_FLAG = 8
+    BLOCKING_FLAGS = AGENT_FLAG | WATER_FLAG | ROCK_FLAG
+
     def __init__(self, width: int, height: int) -> None:
         self.width = width
         self.height = height
-        self.water_locations: Set[Tuple[int, int]] = set()
-        self.rock_locations: Set[Tuple[int, int]] = set()
-        self.berry_locations: Dict[Tuple[int, int], str] = {}
+        self.water_locations = VersionedSet()
+        self.rock_locations = VersionedSet()
+        self.berry_locations = VersionedDict()
         self.agent_positions: Dict[str, Tuple[int, int]] = {}
         self._grid_entities: Dict[Tuple[int, int], str] = {}
+        self._neighbors = self._build_neighbor_table()
+        self._move_targets = self._build_move_target_table()
+        # Manhattan distance fields and the cells within a given distance of a
+        # feature set, keyed by the set's id. Each entry records the set and
+        # its stamp (version, or a snapshot for plain sets) to detect changes.
+        self._distance_fields: Dict[
+            int, Tuple[Tuple[int, int], Set[Tuple[int, int]], Any, np.ndarray]
+        ] = {}
+        self._near_cells: Dict[
+            Tuple[int, int],
+            Tuple[
+                Tuple[int, int], Set[Tuple[int, int]], Any, FrozenSet[Tuple[int, int]]
+            ],
+        ] = {}
+        # Sequence snapshots of feature sets for random draws, keyed like
+        # _distance_fields and refreshed when the set's stamp changes
+        self._feature_cells: Dict[
+            int, Tuple[Set[Tuple[int, int]], Any, Tuple[Tuple[int, int], ...]]
+        ] = {}
+        # Candidate empty cells for spawning. Entity moves keep it in sync;
+        # direct edits to the feature/berry containers are caught lazily when
+        # a stale cell is drawn.
+        self._free_cells: List[Tuple[int, int]] = []
+        self._free_index: Dict[Tuple[int, int], int] = {}
+        self._rebuild_free_cells()
+        # Berries as x-sorted columns, rebuilt when berry_locations has changed
+        self._berry_xs: np.ndarray = np.empty(0, dtype=np.int32)
+        self._berry_ys: np.ndarray = np.empty(0, dtype=np.int32)
+        self._berry_types: List[str] = []
+        self._indexed_berries: Optional[VersionedDict] = None
+        self._indexed_berry_version = -1
+        # Berry entity IDs interned by cell index (y * width + x), so each
+        # ID string is formatted at most once per cell for the whole run
+        self._berry_ids: List[Optional[str]] = [None] * (width * height)
+
+    @property
+    def water_locations(self) -> VersionedSet:
+        return self._water_locations
+
+    @water_locations.setter
+    def water_locations(self, cells: Iterable[Tuple[int, int]]) -> None:
+        self._water_locations = (
+            cells if isinstance(cells, VersionedSet) else VersionedSet(cells)
+        )
+
+    @property
+    def rock_locations(self) -> VersionedSet:
+        return self._rock_locations
+
+    @rock_locations.setter
+    def rock_locations(self, cells: Iterable[Tuple[int, int]]) -> None:
+        self._rock_locations = (
+            cells if isinstance(cells, VersionedSet) else VersionedSet(cells)
+        )
+
+    @property
+    def near_water_cells(self) -> FrozenSet[Tuple[int, int]]:
+        """The grid cells within two steps of any water source."""
+        return self.cells_near(self.water_locations, 2)
+
+    @property
+    def near_rock_cells(self) -> FrozenSet[Tuple[int, int]]:
+        """The grid cells within two steps of any rock formation."""
+        return self.cells_near(self.rock_locations, 2)
+
+    @property
+    def berry_locations(self) -> VersionedDict:
+        return self._berry_locations
+
+    @berry_locations.setter
+    def berry_locations(self, berries: Dict[Tuple[int, int], str]) -> None:
+        self._berry_locations = (
+            berries if isinstance(berries, VersionedDict) else VersionedDict(berries)
+        )
+
+    def berry_columns(self) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        Returns the berries as parallel columns sorted by x coordinate.
+
+        The columns are brought up to date lazily whenever berry_locations
+        has changed since the last call, so callers must treat them as
+        read-only. A handful of eaten or spawned berries are patched into
+        the columns in place; anything larger triggers a full rebuild.
+
+        Returns:
+            A tuple of (xs, ys, types), where xs and ys are int32 arrays.
+        """
+        berries = self._berry_locations
+        if self._indexed_berries is not berries:
+            berries.drain_changes()
+            self._rebuild_berry_columns(berries)
+        elif self._indexed_berry_version != berries.version:
+            changed = berries.drain_changes()
+            if changed is None:
+                self._rebuild_berry_columns(berries)
+            else:
+                for pos in changed:
+                    self._patch_berry_column(pos, berries.get(pos))
+        self._indexed_berries = berries
+        self._indexed_berry_version = berries.version
+        return self._berry_xs, self._berry_ys, self._berry_types
+
+    def _rebuild_berry_columns(self, berries: VersionedDict) -> None:
+        count = len(berries)
+        coords = np.fromiter(
+            (c for pos in berries for c in pos), dtype=np.int32, count=2 * count
+        ).reshape(count, 2)
+        order = np.argsort(coords[:, 0], kind="stable")
+        types = list(berries.values())
+        self._berry_xs = np.ascontiguousarray(coords[order, 0])
+        self._berry_ys = np.ascontiguousarray(coords[order, 1])
+        self._berry_types = [types[i] for i in order]
+
+    def _patch_berry_column(
+        self, position: Tuple[int, int], berry_type: Optional[str]
+    ) -> None:
+        """
+        Brings a single cell's entry in the columns in line with
+        berry_locations. New berries go after those sharing their x, which
+        keeps the same order a stable rebuild would produce. Columns are
+        replaced rather than edited, so previously returned ones stay valid.
+        """
+        x, y = position
+        xs, ys, types = self._berry_xs, self._berry_ys, self._berry_types
+        lo = int(np.searchsorted(xs, x, side="left"))
+        hi = int(np.searchsorted(xs, x, side="right"))
+        match = np.flatnonzero(ys[lo:hi] == y)
+        if match.size:
+            index = lo + int(match[0])
+            if berry_type is None:
+                self._berry_xs = np.delete(xs, index)
+                self._berry_ys = np.delete(ys, index)
+                self._berry_types = types[:index] + types[index + 1 :]
+            elif types[index] != berry_type:
+                self._berry_types = types.copy()
+                self._berry_types[index] = berry_type
+        elif berry_type is not None:
+            self._berry_xs = np.insert(xs, hi, x)
+            self._berry_ys = np.insert(ys, hi, y)
+            self._berry_types = types[:hi] + [berry_type] + types[hi:]
+
+    def berry_id(self, position: Tuple[int, int]) -> str:
+        """Returns the entity ID of the berry at a cell, e.g. 'berry_3_7'."""
+        x, y = position
+        if not self.is_valid_position(position):
+            return f"berry_{x}_{y}"
+        cell = y * self.width + x
+        berry_id = self._berry_ids[cell]
+        if berry_id is None:
+            berry_id = self._berry_ids[cell] = f"berry_{x}_{y}"
+        return berry_id
+
+    def berries_in_range(
+        self, position: Tuple[int, int], radius: float
+    ) -> List[Tuple[Tuple[int, int], str, float]]:
+        """
+        Finds every berry within a Manhattan radius of a position.
+
+        The x-sorted columns narrow the search to the vertical strip
+        [x - radius, x + radius] with a binary search, and the exact distance
+        filter is then applied to that strip in one vectorized pass.
+
+        Returns:
+            A list of (position, berry_type, distance) tuples.
+        """
+        lo, strip_xs, strip_ys, dists = self._berry_strip(position, radius)
+        hits = np.flatnonzero(dists <= radius)
+        types = self._berry_types
+        return [
+            (
+                (int(strip_xs[i]), int(strip_ys[i])),
+                types[lo + i],
+                float(dists[i]),
+            )
+            for i in hits.tolist()
+        ]
+
+    def nearest_berry(
+        self, position: Tuple[int, int], radius: float
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Returns the position of the closest berry within a Manhattan radius,
+        or None if there is none. Ties go to the berry with the smallest x.
+        """
+        _, strip_xs, strip_ys, dists = self._berry_strip(position, radius)
+        if not dists.size:
+            return None
+        best = int(np.argmin(dists))
+        if dists[best] > radius:
+            return None
+        return int(strip_xs[best]), int(strip_ys[best])
+
+    def nearest_berry_batch(
+        self, positions: Sequence[Tuple[int, int]], radius: float
+    ) -> List[Optional[Tuple[int, int]]]:
+        """
+        Same as nearest_berry for many positions at once.
+
+        The position-by-berry Manhattan distance matrix is computed with one
+        broadcast over the berry columns, in row chunks of at most
+        BATCH_CELLS entries to bound memory.
+        """
+        xs, ys, _ = self.berry_columns()
+        count = len(positions)
+        if not count or not xs.size:
+            return [None] * count
+
+        coords = np.asarray(positions, dtype=np.int32).reshape(count, 2)
+        nearest: List[Optional[Tuple[int, int]]] = []
+        step = max(1, self.BATCH_CELLS // xs.size)
+        for start in range(0, count, step):
+            chunk = coords[start : start + step]
+            dists = np.abs(chunk[:, :1] - xs) + np.abs(chunk[:, 1:] - ys)
+            best = np.argmin(dists, axis=1)
+            in_range = dists[np.arange(len(chunk)), best] <= radius
+            for index, hit in zip(best.tolist(), in_range.tolist()):
+                nearest.append((int(xs[index]), int(ys[index])) if hit else None)
+        return nearest
+
+    def _berry_strip(
+        self, position: Tuple[int, int], radius: float
+    ) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Selects the berries whose x lies within radius of the position.
+
+        Returns:
+            The offset of the strip in the berry columns, its xs and ys, and
+            the Manhattan distance of each berry in it to the position.
+        """
+        xs, ys, _ = self.berry_columns()
+        x, y = position
+        reach = int(radius)
+        lo = int(np.searchsorted(xs, x - reach, side="left"))
+        hi = int(np.searchsorted(xs, x + reach, side="right"))
+        strip_xs = xs[lo:hi]
+        strip_ys = ys[lo:hi]
+        return lo, strip_xs, strip_ys, np.abs(strip_xs - x) + np.abs(strip_ys - y)
+
+    def _compute_neighbors(
+        self, position: Tuple[int, int]
+    ) -> Tuple[Tuple[int, int], ...]:
+        x, y = position
+        return tuple(
+            (x + dx, y + dy)
+            for dx, dy in self._NEIGHBOR_OFFSETS
+            if 0 <= x + dx < self.width and 0 <= y + dy < self.height
+        )
+
+    def _build_neighbor_table(
+        self,
+    ) -> Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]]:
+        """Precomputes the in-bounds 8-neighbourhood of every cell on the grid."""
+        return {
+            (x, y): self._compute_neighbors((x, y))
+            for x in range(self.width)
+            for y in range(self.height)
+        }
+
+    def _compute_move_targets(
+        self, position: Tuple[int, int]
+    ) -> Tuple[Tuple[Tuple[int, int], str], ...]:
+        x, y = position
+        return tuple(
+            ((x + dx, y + dy), direction)
+            for dx, dy, direction in self.MOVE_DIRECTIONS
+            if 0 <= x + dx < self.width and 0 <= y + dy < self.height
+        )
+
+    def _build_move_target_table(
+        self,
+    ) -> Dict[Tuple[int, int], Tuple[Tuple[Tuple[int, int], str], ...]]:
+        """Precomputes the in-bounds cardinal moves out of every cell."""
+        return {
+            (x, y): self._compute_move_targets((x, y))
+            for x in range(self.width)
+            for y in range(self.height)
+        }
+
+    def move_targets(
+        self, position: Tuple[int, int]
+    ) -> Tuple[Tuple[Tuple[int, int], str], ...]:
+        """
+        Returns the (target, direction) pairs of the on-grid cardinal moves
+        from position, in MOVE_DIRECTIONS order. Only the grid bounds are
+        applied; callers still need to check the targets for occupancy.
+        """
+        targets = self._move_targets.get(position)
+        if targets is None:
+            targets = self._compute_move_targets(position)
+        return targets
 
     def is_occupied(self, position: Tuple[int, int]) -> bool:
         """Check if a cell is occupied by a blocking object (agent, rock, water)."""
@@ -28,17 +531,81 @@ class BerryWorldEnvironment(EnvironmentInterface):
             or position in self.rock_locations
         )
 
+    def _is_free(self, position: Tuple[int, int]) -> bool:
+        return not self.is_occupied(position) and position not in self.berry_locations
+
+    def occupancy_grid(self) -> np.ndarray:
+        """
+        Packs agents, water, rocks and berries into a uint8[width, height] grid of
+        bit flags, for bulk queries. Single-cell checks should keep using
+        is_occupied, which is faster than indexing a NumPy array from Python.
+        """
+        grid: np.ndarray = np.zeros((self.width, self.height), dtype=np.uint8)
+        layers = (
+            (self.AGENT_FLAG, self._grid_entities),
+            (self.WATER_FLAG, self.water_locations),
+            (self.ROCK_FLAG, self.rock_locations),
+            (self.BERRY_FLAG, self.berry_locations),
+        )
+        for flag, cells in layers:
+            in_bounds = [pos for pos in cells if self.is_valid_position(pos)]
+            if in_bounds:
+                xs, ys = np.array(in_bounds, dtype=np.intp).T
+                grid[xs, ys] |= flag
+        return grid
+
+    def _rebuild_free_cells(self) -> None:
+        xs, ys = np.nonzero(self.occupancy_grid() == 0)
+        self._free_cells = list(zip(xs.tolist(), ys.tolist()))
+        self._free_index = {pos: i for i, pos in enumerate(self._free_cells)}
+
+    def _claim_cell(self, position: Tuple[int, int]) -> None:
+        """Removes a cell from the free list in O(1) by swapping in the last one."""
+        index = self._free_index.pop(position, None)
+        if index is None:
+            return
+        last = self._free_cells.pop()
+        if last != position:
+            self._free_cells[index] = last
+            self._free_index[last] = index
+
+    def _release_cell(self, position: Tuple[int, int]) -> None:
+        if (
+            position in self._free_index
+            or not self.is_valid_position(position)
+            or not self._is_free(position)
+        ):
+            return
+        self._free_index[position] = len(self._free_cells)
+        self._free_cells.append(position)
+
     def get_random_empty_cell(self) -> Optional[Tuple[int, int]]:
         """Finds a random unoccupied cell."""
-        for _ in range(self.width * self.height):  # Avoid infinite loops
-            pos = (
-                random.randint(0, self.width - 1),
-                random.randint(0, self.height - 1),
-            )
-            if not self.is_occupied(pos) and pos not in self.berry_locations:
-                return pos
+        for rebuilt in (False, True):
+            while self._free_cells:
+                pos = random.choice(self._free_cells)
+                if self._is_free(pos):
+                    return pos
+                self._claim_cell(pos)  # Filled by a direct edit since it was listed
+            if not rebuilt:
+                self._rebuild_free_cells()
         return None
 
+    def get_random_empty_cell_near(
+        self, features: Set[Tuple[int, int]], distance: int
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Finds a random unoccupied cell within a Manhattan distance of any feature.
+
+        Candidates come from the cached cells_near set rather than from
+        rejection sampling the whole grid, so a draw near sparse features
+        succeeds whenever such a cell exists.
+        """
+        free = [
+            pos for pos in self.cells_near(features, distance) if self._is_free(pos)
+        ]
+        return random.choice(free) if free else None
+
     def get_berry_toxicity(
         self, berry_type: str, position: Tuple[int, int], tick: int
     ) -> float:
@@ -53,20 +620,101 @@ class BerryWorldEnvironment(EnvironmentInterface):
             )
         elif berry_type == "yellow":
             # Toxicity is random, but seeded by position and tick for reproducibility
-            seed = hash((position, tick // 100))  # Stable toxicity for a period
-            rng = random.Random(seed)
-            return -20.0 if rng.random() < 0.5 else 10.0
+            # Stable toxicity for a period
+            seed = (
+                position[0] * 0x9E3779B97F4A7C15
+                + position[1] * 0xBF58476D1CE4E5B9
+                + (tick // 100) * 0x94D049BB133111EB
+            )
+            return -20.0 if _mix64(seed) >> 63 else 10.0
         return 0.0
 
     def is_near_feature(
         self, pos: Tuple[int, int], features: Set[Tuple[int, int]], distance: int
     ) -> bool:
         """Checks if a position is within a certain Manhattan distance of any feature."""
-        for feature_pos in features:
-            dist = abs(pos[0] - feature_pos[0]) + abs(pos[1] - feature_pos[1])
-            if dist <= distance:
-                return True
-        return False
+        if not features:
+            return False
+        if not self.is_valid_position(pos):
+            return any(
+                abs(pos[0] - fx) + abs(pos[1] - fy) <= distance for fx, fy in features
+            )
+        return pos in self.cells_near(features, distance)
+
+    def cells_near(
+        self, features: Set[Tuple[int, int]], distance: int
+    ) -> FrozenSet[Tuple[int, int]]:
+        """
+        Returns every grid cell within a Manhattan distance of any feature.
+
+        The set is built once from the feature set's distance field and reused
+        until the features or the grid size change.
+        """
+        shape = (self.width, self.height)
+        stamp = self._feature_stamp(features)
+        key = (id(features), distance)
+        cached = self._near_cells.get(key)
+        if (
+            cached is not None
+            and cached[0] == shape
+            and cached[1] is features
+            and cached[2] == stamp
+        ):
+            return cached[3]
+
+        near_x, near_y = np.nonzero(self._distance_field(features) <= distance)
+        cells = frozenset(zip(near_x.tolist(), near_y.tolist()))
+        self._near_cells[key] = (shape, features, stamp, cells)
+        return cells
+
+    def feature_cells(
+        self, features: Set[Tuple[int, int]]
+    ) -> Tuple[Tuple[int, int], ...]:
+        """
+        Returns the cells of a feature set as a tuple, for indexed random draws.
+
+        The tuple follows the set's iteration order and is reused until the
+        set changes, so drawing from it matches random.choice(list(features)).
+        """
+        stamp = self._feature_stamp(features)
+        cached = self._feature_cells.get(id(features))
+        if cached is not None and cached[0] is features and cached[1] == stamp:
+            return cached[2]
+        cells = tuple(features)
+        self._feature_cells[id(features)] = (features, stamp, cells)
+        return cells
+
+    @staticmethod
+    def _feature_stamp(features: Set[Tuple[int, int]]) -> Any:
+        """A cheap change marker for a versioned set, or a snapshot otherwise."""
+        if isinstance(features, VersionedSet):
+            return features.version
+        return frozenset(features)
+
+    def _distance_field(self, features: Set[Tuple[int, int]]) -> np.ndarray:
+        """
+        Returns the Manhattan distance from every cell to the nearest feature,
+        rebuilding it only when the feature set or grid size has changed.
+        """
+        shape = (self.width, self.height)
+        stamp = self._feature_stamp(features)
+        cached = self._distance_fields.get(id(features))
+        if (
+            cached is not None
+            and cached[0] == shape
+            and cached[1] is features
+            and cached[2] == stamp
+        ):
+            return cached[3]
+
+        xs = np.arange(self.width)[:, None]
+        ys = np.arange(self.height)[None, :]
+        field: np.ndarray = np.full(shape, np.iinfo(np.int32).max, dtype=np.int32)
+        for fx, fy in features:
+            np.minimum(field, np.abs(xs - fx) + np.abs(ys - fy), out=field)
+
+        self._distance_fields[id(features)] = (shape, features, stamp, field)
+        return field
 
     def get_environmental_context(self, position: Tuple[int, int]) -> Dict[str, bool]:
         """Provides the context used by the CausalGraphSystem's StateNodeEncoder."""
@@ -79,20 +727,24 @@ class BerryWorldEnvironment(EnvironmentInterface):
     def add_entity(self, entity_id: str, position: Tuple[int, int]):
         self._grid_entities[position] = entity_id
         self.agent_positions[entity_id] = position
+        self._claim_cell(position)
 
     def update_entity_position(
         self, entity_id: str, old_pos: Optional[Any], new_pos: Any
     ):
         if old_pos and old_pos in self._grid_entities:
             del self._grid_entities[old_pos]
+            self._release_cell(old_pos)
         self._grid_entities[new_pos] = entity_id
         self.agent_positions[entity_id] = new_pos
+        self._claim_cell(new_pos)
 
     def remove_entity(self, entity_id: str):
         if entity_id in self.agent_positions:
             pos = self.agent_positions.pop(entity_id)
             if pos in self._grid_entities:
                 del self._grid_entities[pos]
+                self._release_cell(pos)
 
     def get_entities_at_position(self, position: Any) -> Set[str]:
         entity_id = self._grid_entities.get(position)
@@ -102,16 +754,10 @@ class BerryWorldEnvironment(EnvironmentInterface):
         return [(x, y) for x in range(self.width) for y in range(self.height)]
 
     def get_neighbors(self, position: Any) -> List[Any]:
-        x, y = position
-        neighbors = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.width and 0 <= ny < self.height:
-                    neighbors.append((nx, ny))
-        return neighbors
+        neighbors = self._neighbors.get(position)
+        if neighbors is None:
+            neighbors = self._compute_neighbors(position)
+        return list(neighbors)
 
     def distance(self, pos1: Any, pos2: Any) -> float:
         return float(abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1]))
@@ -123,7 +769,31 @@ class BerryWorldEnvironment(EnvironmentInterface):
         return 0 <= position[0] < self.width and 0 <= position[1] < self.height
 
     def get_entities_in_radius(self, center: Any, radius: int) -> List[Tuple[str, Any]]:
-        return []  # Not needed for this simulation
+        """
+        Returns (entity_id, position) for every agent within a Manhattan radius.
+
+        Agents are indexed by cell in _grid_entities, which every move keeps
+        current, so a query probes the cells of the radius diamond rather than
+        scanning all agents. When the diamond has more cells than there are
+        agents, the agents are scanned instead.
+        """
+        cx, cy = center
+        grid = self._grid_entities
+        if 2 * radius * (radius + 1) + 1 > len(grid):
+            return [
+                (entity_id, pos)
+                for pos, entity_id in grid.items()
+                if abs(pos[0] - cx) + abs(pos[1] - cy) <= radius
+            ]
+        found = []
+        for dx in range(-radius, radius + 1):
+            x = cx + dx
+            span = radius - abs(dx)
+            for y in range(cy - span, cy + span + 1):
+                entity_id = grid.get((x, y))
+                if entity_id is not None:
+                    found.append((entity_id, (x, y)))
+        return found
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -136,5 +806,9 @@ class BerryWorldEnvironment(EnvironmentInterface):
     def restore_from_dict(self, data: Dict[str, Any]) -> None:
         self.width = data["width"]
         self.height = data["height"]
-        self.water_locations = {tuple(pos) for pos in data["water_locations"]}
-        self.rock_locations = {tuple(pos) for pos in data["rock_locations"]}
+        self._neighbors = self._build_neighbor_table()
+        self._move_targets = self._build_move_target_table()
+        self._berry_ids = [None] * (self.width * self.height)
+        self.water_locations = VersionedSet((x, y) for x, y in data["water_locations"])
+        self.rock_locations = VersionedSet((x, y) for x, y in data["rock_locations"])
+        self._rebuild_free_cells()
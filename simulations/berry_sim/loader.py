@@ -2,9 +2,13 @@
 
 import json
 import random
-from typing import cast
+from typing import List, Tuple, cast
 
-from agent_core.core.ecs.component import PerceptionComponent, TimeBudgetComponent
+from agent_core.core.ecs.component import (
+    Component,
+    PerceptionComponent,
+    TimeBudgetComponent,
+)
 from agent_core.simulation.scenario_loader_interface import ScenarioLoaderInterface
 
 from .components import (
@@ -32,32 +36,39 @@ class BerryScenarioLoader(ScenarioLoaderInterface):
         if not env:
             raise ValueError("Environment not initialized in SimulationState.")
 
-        # Place water sources
+        # Entities are collected here and committed to the state in one call
+        entries: List[Tuple[str, List[Component]]] = []
+
         num_water_sources = scenario_data.get("num_water_sources", 10)
-        placed_water = 0
-        while placed_water < num_water_sources:
-            pos = (random.randint(0, env.width - 1), random.randint(0, env.height - 1))
-            if pos in env.water_locations:
-                continue
+        num_rock_formations = scenario_data.get("num_rock_formations", 20)
+        num_agents = scenario_data.get("num_agents", 100)
+
+        # Draw every initial position at once as distinct cell indices, then
+        # carve the sample into water, rock and agent slices. The loader fills
+        # a fresh environment, so any cell of the grid is available.
+        num_cells = env.width * env.height
+        cells = random.sample(
+            range(num_cells),
+            min(num_water_sources + num_rock_formations + num_agents, num_cells),
+        )
+        positions = [(cell % env.width, cell // env.width) for cell in cells]
+        water_positions = positions[:num_water_sources]
+        rock_positions = positions[
+            num_water_sources : num_water_sources + num_rock_formations
+        ]
+        agent_positions = positions[num_water_sources + num_rock_formations :]
 
+        # Place water sources
+        for pos in water_positions:
             env.water_locations.add(pos)
-            entity_id = f"water_{pos[0]}_{pos[1]}"
-            self.simulation_state.add_entity(entity_id)
-            self.simulation_state.add_component(entity_id, WaterComponent())
-            placed_water += 1
+            entries.append((f"water_{pos[0]}_{pos[1]}", [WaterComponent()]))
 
         # Place rock formations
-        for _ in range(scenario_data.get("num_rock_formations", 20)):
-            pos = env.get_random_empty_cell()
-            # CORRECTED: Check if a valid position was found before using it.
-            if pos:
-                env.rock_locations.add(pos)
-                entity_id = f"rock_{pos[0]}_{pos[1]}"
-                self.simulation_state.add_entity(entity_id)
-                self.simulation_state.add_component(entity_id, RockComponent())
+        for pos in rock_positions:
+            env.rock_locations.add(pos)
+            entries.append((f"rock_{pos[0]}_{pos[1]}", [RockComponent()]))
 
         # Create agents
-        num_agents = scenario_data.get("num_agents", 100)
         config = self.simulation_state.config
         initial_health = config.agent.vitals.initial_health
         vision_range = config.agent.get(
@@ -66,23 +77,23 @@ class BerryScenarioLoader(ScenarioLoaderInterface):
 
         for i in range(num_agents):
             agent_id = f"agent_{i}"
-            self.simulation_state.add_entity(agent_id)
-
-            pos = env.get_random_empty_cell()
-            if pos:
-                self.simulation_state.add_component(
-                    agent_id, PositionComponent(x=pos[0], y=pos[1])
-                )
-                self.simulation_state.add_component(
-                    agent_id, HealthComponent(initial_health, initial_health)
+            if i < len(agent_positions):
+                agent_pos = agent_positions[i]
+                entries.append(
+                    (
+                        agent_id,
+                        [
+                            PositionComponent(x=agent_pos[0], y=agent_pos[1]),
+                            HealthComponent(initial_health, initial_health),
+                            TimeBudgetComponent(initial_time_budget=2000),
+                            # NEW: Add the PerceptionComponent to each agent
+                            PerceptionComponent(vision_range=vision_range),
+                        ],
+                    )
                 )
-                self.simulation_state.add_component(
-                    agent_id, TimeBudgetComponent(initial_time_budget=2000)
-                )
-                # NEW: Add the PerceptionComponent to each agent
-                self.simulation_state.add_component(
-                    agent_id, PerceptionComponent(vision_range=vision_range)
-                )
-                env.add_entity(agent_id, pos)
+                env.add_entity(agent_id, agent_pos)
             else:
+                entries.append((agent_id, []))
                 print(f"Warning: Could not find empty cell for agent {agent_id}")
+
+        self.simulation_state.add_entities_bulk(entries)
@@ -1,8 +1,8 @@
 # FILE: simulations/berry_sim/metrics/causal_metrics_calculator.py
 
-from collections import defaultdict
 from typing import Any, Dict
 
+import numpy as np
 from agent_core.agents.actions.base_action import ActionOutcome
 from agent_core.core.ecs.component import TimeBudgetComponent
 from agent_engine.logging.metrics_calculator_interface import MetricsCalculatorInterface
@@ -16,8 +16,11 @@ class CausalMetricsCalculator(MetricsCalculatorInterface):
     """Calculates and stores the CUS and CCI for the Berry Toxicity experiment."""
 
     def __init__(self):
-        self.novel_context_decisions = defaultdict(lambda: {"correct": 0, "total": 0})
-        self.yellow_berry_eats = defaultdict(lambda: {"correct": 0, "total": 0})
+        # Running totals across all agents, so computing the scores is O(1)
+        self.novel_correct = 0
+        self.novel_total = 0
+        self.yellow_correct = 0
+        self.yellow_total = 0
         self.causal_understanding_score = 0.0
         self.correlation_confusion_index = 1.0
         self.average_agent_health = 100.0
@@ -29,67 +32,64 @@ class CausalMetricsCalculator(MetricsCalculatorInterface):
         if not action_plan or not isinstance(action_plan.action_type, EatBerryAction):
             return
 
-        tick = event_data["current_tick"]
-        agent_id = event_data["entity_id"]
+        # Cheap scalar checks first: most events never need a component lookup
         outcome: ActionOutcome = event_data["action_outcome"]
+        if not outcome.success:
+            return
         berry_type = action_plan.params.get("berry_type")
-        env = sim_state.environment
-        pos_comp = sim_state.get_component(agent_id, PositionComponent)
-        if not isinstance(env, BerryWorldEnvironment) or not pos_comp:
+
+        # CCI LOGIC
+        if berry_type == "yellow":
+            self.yellow_total += 1
+            if outcome.reward > 0:
+                self.yellow_correct += 1
             return
 
         # CUS LOGIC
-        if 1000 <= tick < 1100 and berry_type == "blue" and outcome.success:
-            self.novel_context_decisions[agent_id]["total"] += 1
-            is_near_water = env.is_near_feature(
-                pos_comp.position, env.water_locations, 2
-            )
-            if outcome.reward > 0 and not is_near_water:
-                self.novel_context_decisions[agent_id]["correct"] += 1
-            elif outcome.reward < 0 and is_near_water:
-                pass
+        if berry_type != "blue" or not 1000 <= event_data["current_tick"] < 1100:
+            return
+        env = sim_state.environment
+        pos_comp = sim_state.get_component(event_data["entity_id"], PositionComponent)
+        if not isinstance(env, BerryWorldEnvironment) or not pos_comp:
+            return
 
-        # CCI LOGIC
-        if berry_type == "yellow" and outcome.success:
-            self.yellow_berry_eats[agent_id]["total"] += 1
-            if outcome.reward > 0:
-                self.yellow_berry_eats[agent_id]["correct"] += 1
+        self.novel_total += 1
+        is_near_water = pos_comp.position in env.near_water_cells
+        if outcome.reward > 0 and not is_near_water:
+            self.novel_correct += 1
 
     def calculate_metrics(self, simulation_state: Any) -> Dict[str, Any]:
         """Calculate and return the final metrics based on stored state."""
-        total_correct_novel = sum(
-            d["correct"] for d in self.novel_context_decisions.values()
-        )
-        total_decisions_novel = sum(
-            d["total"] for d in self.novel_context_decisions.values()
-        )
         self.causal_understanding_score = (
-            total_correct_novel / total_decisions_novel
-            if total_decisions_novel > 0
-            else 0.0
+            self.novel_correct / self.novel_total if self.novel_total > 0 else 0.0
         )
 
-        total_yellow_eats = sum(d["total"] for d in self.yellow_berry_eats.values())
-        total_yellow_correct = sum(
-            d["correct"] for d in self.yellow_berry_eats.values()
-        )
-        if total_yellow_eats > 10:
-            correct_ratio = total_yellow_correct / total_yellow_eats
+        if self.yellow_total > 10:
+            correct_ratio = self.yellow_correct / self.yellow_total
             self.correlation_confusion_index = 1.0 - abs(correct_ratio - 0.5) * 2
         else:
             self.correlation_confusion_index = 1.0
 
-        all_agents = simulation_state.get_entities_with_components(
-            [HealthComponent, TimeBudgetComponent]
+        # Aggregate straight from the per-type component tables: gather health
+        # and activity into columns, then reduce them with NumPy.
+        health_table = simulation_state.get_component_table(HealthComponent)
+        time_table = simulation_state.get_component_table(TimeBudgetComponent)
+        count = len(health_table)
+        healths = np.fromiter(
+            (health_comp.current_health for health_comp in health_table.values()),
+            dtype=np.float64,
+            count=count,
+        )
+        active_mask = np.fromiter(
+            (
+                entity_id in time_table and time_table[entity_id].is_active
+                for entity_id in health_table
+            ),
+            dtype=bool,
+            count=count,
         )
-        total_health = 0
-        active_count = 0
-        for components in all_agents.values():
-            health_comp = components.get(HealthComponent)
-            time_comp = components.get(TimeBudgetComponent)
-            if health_comp and time_comp and time_comp.is_active:
-                total_health += health_comp.current_health
-                active_count += 1
+        active_count = int(active_mask.sum())
+        total_health = float(healths[active_mask].sum())
 
         self.average_agent_health = (
             total_health / active_count if active_count > 0 else 0
@@ -2,7 +2,20 @@
 
 import math
 import random
-from typing import Any, Dict, List, Optional, Tuple, Type
+import sys
+import weakref
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    cast,
+)
 
 import numpy as np
 import torch
@@ -37,7 +50,7 @@ from .components import (
     RockComponent,
     WaterComponent,
 )
-from .environment import BerryWorldEnvironment
+from .environment import BerryWorldEnvironment, VersionedDict
 
 
 class BerryPerceptionProvider(PerceptionProviderInterface):
@@ -63,49 +76,280 @@ class BerryPerceptionProvider(PerceptionProviderInterface):
         if not pos_comp or not perc_comp or not isinstance(env, BerryWorldEnvironment):
             return
 
-        perc_comp.visible_entities.clear()
+        self._refresh_visible(
+            env,
+            perc_comp.visible_entities,
+            env.berries_in_range(pos_comp.position, perc_comp.vision_range),
+        )
+
+    def update_perception_batch(
+        self,
+        entities: Dict[str, Dict[Type[Component], Component]],
+        sim_state: Any,
+        current_tick: int,
+    ) -> None:
+        """
+        Finds the visible berries of every agent in one vectorized pass.
+
+        The agent-by-berry distance matrix is computed with NumPy broadcasting
+        against the environment's berry columns, in the same BATCH_CELLS row
+        chunks as nearest_berry_batch, and each agent's row of hits is then
+        written into its PerceptionComponent.
+        """
+        env = sim_state.environment
+        if not isinstance(env, BerryWorldEnvironment):
+            return
+
+        perceivers: List[Tuple[PositionComponent, PerceptionComponent]] = []
+        for components in entities.values():
+            pos_comp = components.get(PositionComponent)
+            perc_comp = components.get(PerceptionComponent)
+            if isinstance(pos_comp, PositionComponent) and isinstance(
+                perc_comp, PerceptionComponent
+            ):
+                perceivers.append((pos_comp, perc_comp))
+        if not perceivers:
+            return
 
-        for berry_pos, berry_type in env.berry_locations.items():
-            dist = env.distance(pos_comp.position, berry_pos)
-            if dist <= perc_comp.vision_range:
-                berry_id = f"berry_{berry_pos[0]}_{berry_pos[1]}"
-                perc_comp.visible_entities[berry_id] = {
+        count = len(perceivers)
+        agent_xs = np.fromiter(
+            (pos.position[0] for pos, _ in perceivers), dtype=np.int32, count=count
+        )
+        agent_ys = np.fromiter(
+            (pos.position[1] for pos, _ in perceivers), dtype=np.int32, count=count
+        )
+        vision = np.fromiter(
+            (perc.vision_range for _, perc in perceivers), dtype=np.float64, count=count
+        )
+
+        berry_xs, berry_ys, berry_types = env.berry_columns()
+        xs_list = berry_xs.tolist()
+        ys_list = berry_ys.tolist()
+        step = max(1, env.BATCH_CELLS // max(1, berry_xs.size))
+        for start in range(0, count, step):
+            stop = min(start + step, count)
+            dists = np.abs(agent_xs[start:stop, None] - berry_xs) + np.abs(
+                agent_ys[start:stop, None] - berry_ys
+            )
+            rows, cols = np.nonzero(dists <= vision[start:stop, None])
+            # Hits come out row-major, so each agent's hits form one contiguous run
+            bounds = cast(
+                List[int],
+                np.searchsorted(rows, np.arange(stop - start + 1)).tolist(),
+            )
+            hit_dists = dists[rows, cols].tolist()
+            cols_list = cols.tolist()
+
+            for i, (_, perc_comp) in enumerate(perceivers[start:stop]):
+                lo, hi = bounds[i], bounds[i + 1]
+                self._refresh_visible(
+                    env,
+                    perc_comp.visible_entities,
+                    [
+                        ((xs_list[c], ys_list[c]), berry_types[c], float(d))
+                        for c, d in zip(cols_list[lo:hi], hit_dists[lo:hi])
+                    ],
+                )
+
+    @staticmethod
+    def _refresh_visible(
+        env: BerryWorldEnvironment,
+        visible: Dict[str, Dict[str, Any]],
+        hits: Iterable[Tuple[Tuple[int, int], str, float]],
+    ) -> None:
+        """
+        Agents move at most one cell per tick, so most berries stay in view.
+        Their entries are refreshed in place rather than rebuilt every tick,
+        and only berries that left the vision range are dropped.
+        """
+        stale = set(visible)
+        for berry_pos, berry_type, dist in hits:
+            berry_id = env.berry_id(berry_pos)
+            entry = visible.get(berry_id)
+            if entry is None or entry.get("type") != "berry":
+                visible[berry_id] = {
                     "type": "berry",
                     "berry_type": berry_type,
                     "position": berry_pos,
                     "distance": dist,
                 }
+            else:
+                entry["berry_type"] = berry_type
+                entry["distance"] = dist
+                stale.discard(berry_id)
+        for berry_id in stale:
+            del visible[berry_id]
+
+
+class ActionBundle(List[ActionPlanComponent]):
+    """
+    The flat list of an agent's possible actions, with the move and eat plans
+    also kept apart so that selectors don't have to re-partition them.
+    """
+
+    __slots__ = ("move", "eat")
+
+    def __init__(
+        self, move: List[ActionPlanComponent], eat: List[ActionPlanComponent]
+    ) -> None:
+        super().__init__(move)
+        self.extend(eat)
+        self.move = move
+        self.eat = eat
 
 
 class BerryActionGenerator(ActionGeneratorInterface):
     """Generates move and eat actions for agents."""
 
-    def generate(self, sim_state, entity_id, tick) -> List[ActionPlanComponent]:
-        actions = []
-        move_action = MoveAction()
-        eat_action = EatBerryAction()
-
-        move_params = move_action.generate_possible_params(entity_id, sim_state, tick)
-        actions.extend(
-            [
-                ActionPlanComponent(action_type=move_action, params=p)
-                for p in move_params
-            ]
+    def __init__(self) -> None:
+        # Actions are stateless, so one instance of each serves every agent
+        self.move_action = MoveAction()
+        self.eat_action = EatBerryAction()
+        # Spare plan objects, and the plans last handed out to each agent
+        self._pool: List[ActionPlanComponent] = []
+        self._issued: Dict[str, ActionBundle] = {}
+        # The tick whose first call dropped the bundles of inactive agents
+        self._pruned_tick: Optional[int] = None
+
+    def generate(self, sim_state, entity_id, tick) -> ActionBundle:
+        if tick != self._pruned_tick:
+            self._pruned_tick = tick
+            self._prune_inactive(sim_state)
+        self._retire(sim_state, entity_id)
+
+        move_action = self.move_action
+        eat_action = self.eat_action
+
+        # Both actions depend only on where the agent stands, so the position
+        # and environment are resolved once and shared between them
+        pos_comp = sim_state.get_component(entity_id, PositionComponent)
+        env = sim_state.environment
+        if pos_comp and isinstance(env, BerryWorldEnvironment):
+            position = pos_comp.position
+            move_params = move_action.params_at(env, position)
+            eat_params = eat_action.params_at(env, position)
+        else:
+            move_params = eat_params = []
+
+        bundle = ActionBundle(
+            move=[self._make_plan(move_action, p) for p in move_params],
+            eat=[self._make_plan(eat_action, p) for p in eat_params],
         )
+        self._issued[entity_id] = bundle
+        return bundle
+
+    def _retire(self, sim_state: Any, entity_id: str) -> None:
+        # The plans from this agent's previous turn are no longer referenced,
+        # except the one it chose, which is stored on the entity and may still
+        # be travelling through the action events.
+        previous = self._issued.pop(entity_id, None)
+        if previous:
+            chosen = sim_state.get_component(entity_id, ActionPlanComponent)
+            self.release(plan for plan in previous if plan is not chosen)
+
+    def _prune_inactive(self, sim_state: Any) -> None:
+        """
+        Retires the bundles of agents that will not take another turn, such
+        as agents that died, so they are not held for the rest of the run.
+        """
+        time_table = sim_state.get_component_table(TimeBudgetComponent)
+        inactive = [
+            entity_id
+            for entity_id in self._issued
+            if not getattr(time_table.get(entity_id), "is_active", False)
+        ]
+        for entity_id in inactive:
+            self._retire(sim_state, entity_id)
 
-        eat_params = eat_action.generate_possible_params(entity_id, sim_state, tick)
-        actions.extend(
-            [ActionPlanComponent(action_type=eat_action, params=p) for p in eat_params]
-        )
+    def release(self, plans: Iterable[ActionPlanComponent]) -> None:
+        """Returns plans that nothing references any more to the pool."""
+        self._pool.extend(plans)
 
-        return actions
+    def _make_plan(
+        self, action_type: ActionInterface, params: Dict[str, Any]
+    ) -> ActionPlanComponent:
+        if not self._pool:
+            return ActionPlanComponent(action_type=action_type, params=params)
+        plan = self._pool.pop()
+        plan.action_type = action_type
+        plan.intent = None
+        plan.params = params
+        return plan
 
 
 class BerryDecisionSelector(DecisionSelectorInterface):
     """A simple heuristic policy for the baseline agent."""
 
+    VISION_RANGE = 7
+
     def __init__(self, simulation_state: Any, config: Any):
-        pass
+        # Nearest berry per agent, found for the whole population at the start
+        # of the tick, and the berry dict and stamp it was computed against.
+        self._targets: Dict[str, Tuple[Any, Optional[Tuple[int, int]]]] = {}
+        self._targets_berries: Optional[VersionedDict] = None
+        self._targets_stamp: Tuple[int, int, int] = (0, 0, 0)
+        # Uniform draws made in bulk and consumed with a cursor. The generator
+        # is seeded from `random` on first use, after the engine has seeded it.
+        self._rng: Optional[np.random.Generator] = None
+        self._draws: List[float] = []
+        self._cursor = 0
+
+    def _refill_draws(self, count: int) -> None:
+        if self._rng is None:
+            self._rng = np.random.default_rng(random.getrandbits(64))
+        self._draws = self._rng.random(count).tolist()
+        self._cursor = 0
+
+    def _uniform(self) -> float:
+        """Returns the next pre-drawn sample from [0, 1)."""
+        if self._cursor >= len(self._draws):
+            self._refill_draws(256)
+        value = self._draws[self._cursor]
+        self._cursor += 1
+        return value
+
+    def prepare_turns(
+        self, sim_state: Any, entity_ids: Sequence[str], current_tick: int
+    ) -> None:
+        # A turn takes at most two draws: the eat gate and a random move
+        self._refill_draws(max(2 * len(entity_ids), 1))
+        self._targets = {}
+        self._targets_berries = None
+        env = sim_state.environment
+        if not isinstance(env, BerryWorldEnvironment):
+            return
+
+        ids: List[str] = []
+        positions: List[Tuple[int, int]] = []
+        for entity_id in entity_ids:
+            pos_comp = sim_state.get_component(entity_id, PositionComponent)
+            if isinstance(pos_comp, PositionComponent):
+                ids.append(entity_id)
+                positions.append(pos_comp.position)
+        nearest = env.nearest_berry_batch(positions, self.VISION_RANGE)
+        self._targets = dict(zip(ids, zip(positions, nearest)))
+        self._targets_berries = env.berry_locations
+        self._targets_stamp = env.berry_locations.stamp()
+
+    def _nearest_berry(
+        self, env: BerryWorldEnvironment, entity_id: str, position: Any
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Reuses the nearest berry found in prepare_turns while it is still
+        correct: the agent has not moved and berries have only been eaten
+        since, without the target among them. Otherwise looks it up afresh.
+        """
+        prepared = self._targets.pop(entity_id, None)
+        berries = env.berry_locations
+        if (
+            prepared is not None
+            and prepared[0] == position
+            and berries is self._targets_berries
+            and berries.only_removed_since(self._targets_stamp)
+            and (prepared[1] is None or prepared[1] in berries)
+        ):
+            return prepared[1]
+        return env.nearest_berry(position, self.VISION_RANGE)
 
     def select(
         self, sim_state, entity_id, possible_actions: List[ActionPlanComponent]
@@ -113,44 +357,54 @@ class BerryDecisionSelector(DecisionSelectorInterface):
         if not possible_actions:
             return None
 
-        eat_actions = [
-            a for a in possible_actions if isinstance(a.action_type, EatBerryAction)
-        ]
-        move_actions = [
-            a for a in possible_actions if isinstance(a.action_type, MoveAction)
-        ]
-
-        if eat_actions and random.random() < 0.9:
-            return eat_actions[0]
+        # Most turns next to a berry end in eating, so the moves are only
+        # collected once the eat branch has been ruled out.
+        bundle = (
+            possible_actions if isinstance(possible_actions, ActionBundle) else None
+        )
+        if bundle is not None:
+            eat_plan = bundle.eat[0] if bundle.eat else None
+        else:
+            eat_plan = next(
+                (
+                    plan
+                    for plan in possible_actions
+                    if isinstance(plan.action_type, EatBerryAction)
+                ),
+                None,
+            )
+        if eat_plan is not None and self._uniform() < 0.9:
+            return eat_plan
+
+        if bundle is not None:
+            move_actions = bundle.move
+        else:
+            move_actions = [
+                plan
+                for plan in possible_actions
+                if isinstance(plan.action_type, MoveAction)
+            ]
 
         pos_comp = sim_state.get_component(entity_id, PositionComponent)
         env = sim_state.environment
         if pos_comp and isinstance(env, BerryWorldEnvironment) and move_actions:
-            vision_range = 7
-            closest_berry_pos = None
-            min_dist = float("inf")
-
-            for berry_pos in env.berry_locations.keys():
-                dist = env.distance(pos_comp.position, berry_pos)
-                if dist < min_dist and dist <= vision_range:
-                    min_dist = dist
-                    closest_berry_pos = berry_pos
+            closest_berry_pos = self._nearest_berry(env, entity_id, pos_comp.position)
 
             if closest_berry_pos:
-                best_move = None
-                min_dist_to_target = float("inf")
+                # At most four unit moves, so a plain loop beats stacking them
+                # into an array; ties keep the first move, as min() did.
+                target_x, target_y = closest_berry_pos
+                best_move = move_actions[0]
+                best_dist = None
                 for move in move_actions:
-                    dist_to_target = env.distance(
-                        move.params["target_pos"], closest_berry_pos
-                    )
-                    if dist_to_target < min_dist_to_target:
-                        min_dist_to_target = dist_to_target
-                        best_move = move
-                if best_move:
-                    return best_move
+                    move_x, move_y = move.params["target_pos"]
+                    dist = abs(move_x - target_x) + abs(move_y - target_y)
+                    if best_dist is None or dist < best_dist:
+                        best_move, best_dist = move, dist
+                return best_move
 
         if move_actions:
-            return random.choice(move_actions)
+            return move_actions[int(self._uniform() * len(move_actions))]
 
         return None
 
@@ -162,6 +416,47 @@ class QLearningDecisionSelector(DecisionSelectorInterface):
         self.simulation_state = simulation_state
         self.config = config
         self.state_encoder = BerryStateEncoder(simulation_state)
+        q_config = config.learning.q_learning
+        self.epsilon = q_config.get("initial_epsilon", 0.1)
+        # Float32 staging buffers reused across ticks, keyed by input name.
+        # Each torch tensor shares memory with its NumPy array.
+        self._buffers: Dict[str, Tuple[np.ndarray, torch.Tensor]] = {}
+
+        # Optional int8 inference. The trained fp32 network is left untouched;
+        # a dynamically quantized snapshot of it is used for action selection
+        # and rebuilt every `quantized_refresh_ticks` to follow learning.
+        self.quantize_inference = bool(q_config.get("quantize_inference", False))
+        self.quantized_refresh_ticks = int(q_config.get("quantized_refresh_ticks", 100))
+        self._quantized: weakref.WeakKeyDictionary[
+            torch.nn.Module, Tuple[int, torch.nn.Module]
+        ] = weakref.WeakKeyDictionary()
+
+    def _inference_network(self, q_comp: Any, current_tick: int) -> Any:
+        """Returns the network used to score actions for this agent."""
+        network = q_comp.utility_network
+        if not self.quantize_inference:
+            return network
+
+        cached = self._quantized.get(network)
+        if cached is None or current_tick - cached[0] >= self.quantized_refresh_ticks:
+            quantized = torch.ao.quantization.quantize_dynamic(
+                network, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            cached = (current_tick, quantized)
+            self._quantized[network] = cached
+        return cached[1]
+
+    def _stage(self, name: str, values: Any) -> torch.Tensor:
+        """Copies a 2D batch of features into the reusable buffer for name."""
+        rows, width = len(values), len(values[0])
+        entry = self._buffers.get(name)
+        if entry is None or entry[0].shape[0] < rows or entry[0].shape[1] != width:
+            array: np.ndarray = np.empty((rows, width), dtype=np.float32)
+            entry = (array, torch.from_numpy(array))
+            self._buffers[name] = entry
+        array, tensor = entry
+        array[:rows] = values
+        return tensor[:rows]
 
     def select(
         self,
@@ -172,56 +467,56 @@ class QLearningDecisionSelector(DecisionSelectorInterface):
         if not possible_actions:
             return None
 
-        q_comp = sim_state.get_component(entity_id, QLearningComponent)
+        # Resolve the agent's components once and hand them to the encoder
+        entity_components = sim_state.entities.get(entity_id)
+        q_comp = (
+            entity_components.get(QLearningComponent) if entity_components else None
+        )
         if not q_comp:
             return random.choice(possible_actions)
 
-        epsilon = self.config.learning.q_learning.get("initial_epsilon", 0.1)
-        if random.random() < epsilon:
+        if random.random() < self.epsilon:
             return random.choice(possible_actions)
 
         with torch.no_grad():
-            best_action = None
-            max_q_value = -float("inf")
-
-            state_features = self.state_encoder.encode_state(
-                sim_state, entity_id, self.config
+            state_tensor = self._stage(
+                "state",
+                [self.state_encoder.encode_components(entity_components, self.config)],
             )
-            state_tensor = torch.tensor(state_features, dtype=torch.float32).unsqueeze(
-                0
+            internal_tensor = self._stage(
+                "internal",
+                [
+                    self.state_encoder.encode_internal_state(
+                        entity_components, self.config
+                    )
+                ],
             )
 
-            entity_components = sim_state.entities.get(entity_id)
-            if not entity_components:
-                return random.choice(possible_actions)
-
-            internal_state = self.state_encoder.encode_internal_state(
-                entity_components, self.config
+            candidates = []
+            action_features = []
+            for plan in possible_actions:
+                if isinstance(plan.action_type, ActionInterface):
+                    candidates.append(plan)
+                    action_features.append(
+                        plan.action_type.get_feature_vector(
+                            entity_id, sim_state, plan.params
+                        )
+                    )
+            if not candidates:
+                return None
+
+            # Score every candidate action in a single forward pass
+            action_tensors = self._stage("action", action_features)
+            num_actions = action_tensors.shape[0]
+            network = self._inference_network(q_comp, sim_state.current_tick)
+            q_values = network(
+                state_tensor.expand(num_actions, -1),
+                internal_tensor.expand(num_actions, -1),
+                action_tensors,
             )
-            internal_tensor = torch.tensor(
-                internal_state, dtype=torch.float32
-            ).unsqueeze(0)
-
-            for action_plan in possible_actions:
-                if not isinstance(action_plan.action_type, ActionInterface):
-                    continue
-
-                action_features = action_plan.action_type.get_feature_vector(
-                    entity_id, sim_state, action_plan.params
-                )
-                action_tensor = torch.tensor(
-                    action_features, dtype=torch.float32
-                ).unsqueeze(0)
-
-                q_value = q_comp.utility_network(
-                    state_tensor, internal_tensor, action_tensor
-                ).item()
-
-                if q_value > max_q_value:
-                    max_q_value = q_value
-                    best_action = action_plan
+            best_index = int(torch.argmax(q_values.view(-1)).item())
 
-            return best_action
+            return candidates[best_index]
 
 
 class BerryVitalityMetricsProvider(VitalityMetricsProviderInterface):
@@ -241,8 +536,25 @@ class BerryVitalityMetricsProvider(VitalityMetricsProviderInterface):
 class BerryStateNodeEncoder(StateNodeEncoderInterface):
     """Encodes world context for the CausalGraphSystem."""
 
+    UNKNOWN_NODE: Tuple[str, ...] = ("STATE", "unknown", "unknown")
+    HEALTH_STATUSES = ("healthy", "hurt", "critical")
+
     def __init__(self, simulation_state: Any):
         self.simulation_state = simulation_state
+        # There are only 3 x 2 x 2 distinct nodes. They are built up front
+        # from interned strings, so every call returns a shared tuple and
+        # graph lookups can compare the parts by identity.
+        self._nodes: Dict[Tuple[str, bool, bool], Tuple[str, ...]] = {
+            (status, water, rocks): (
+                "STATE",
+                sys.intern(f"health_{status}"),
+                sys.intern(f"near_water_{water}"),
+                sys.intern(f"near_rocks_{rocks}"),
+            )
+            for status in self.HEALTH_STATUSES
+            for water in (False, True)
+            for rocks in (False, True)
+        }
 
     def encode_state_for_causal_graph(
         self,
@@ -254,9 +566,16 @@ class BerryStateNodeEncoder(StateNodeEncoderInterface):
         pos_comp = components.get(PositionComponent)
         env = self.simulation_state.environment
         if not pos_comp or not isinstance(env, BerryWorldEnvironment):
-            return ("STATE", "unknown", "unknown")
+            return self.UNKNOWN_NODE
 
-        context = env.get_environmental_context(pos_comp.position)
+        position = pos_comp.position
+        if env.is_valid_position(position):
+            near_water = position in env.near_water_cells
+            near_rocks = position in env.near_rock_cells
+        else:
+            context = env.get_environmental_context(position)
+            near_water = context["near_water"]
+            near_rocks = context["near_rocks"]
 
         health_comp = components.get(HealthComponent)
         health_status = "healthy"
@@ -267,12 +586,7 @@ class BerryStateNodeEncoder(StateNodeEncoderInterface):
             elif health_ratio < 0.7:
                 health_status = "hurt"
 
-        return (
-            "STATE",
-            f"health_{health_status}",
-            f"near_water_{context['near_water']}",
-            f"near_rocks_{context['near_rocks']}",
-        )
+        return self._nodes[(health_status, bool(near_water), bool(near_rocks))]
 
 
 class BerryStateEncoder(StateEncoderInterface):
@@ -280,8 +594,26 @@ class BerryStateEncoder(StateEncoderInterface):
     Encodes the simulation state into a feature vector for the Q-Learning model.
     """
 
+    BERRY_TYPES = ("red", "blue", "yellow")
+    # (distance, angle) features of a berry type the agent cannot see
+    UNSEEN_BERRY = (1.0, 0.0)
+    UNSEEN_BERRIES = UNSEEN_BERRY * len(BERRY_TYPES)
+
     def __init__(self, simulation_state: Any):
         self.simulation_state = simulation_state
+        # Reciprocal grid size, resolved once per config object
+        self._scaled_config: Any = None
+        self._inv_width = 1.0 / 50
+        self._inv_height = 1.0 / 50
+
+    def _grid_scale(self, config: Any) -> Tuple[float, float]:
+        """Returns (1 / width, 1 / height) of the grid described by config."""
+        if config is not self._scaled_config:
+            env_params = config.environment.get("params", {})
+            self._inv_width = 1.0 / env_params.get("width", 50)
+            self._inv_height = 1.0 / env_params.get("height", 50)
+            self._scaled_config = config
+        return self._inv_width, self._inv_height
 
     def encode_state(
         self,
@@ -293,28 +625,133 @@ class BerryStateEncoder(StateEncoderInterface):
         """
         Creates a feature vector including agent health and sensory data.
         """
-        pos_comp = sim_state.get_component(entity_id, PositionComponent)
-        health_comp = sim_state.get_component(entity_id, HealthComponent)
-        perc_comp = sim_state.get_component(entity_id, PerceptionComponent)
+        return self._encode(
+            sim_state.get_component(entity_id, PositionComponent),
+            sim_state.get_component(entity_id, HealthComponent),
+            sim_state.get_component(entity_id, PerceptionComponent),
+            config,
+        )
 
-        env_params = config.environment.get("params", {})
-        width = env_params.get("width", 50)
-        height = env_params.get("height", 50)
+    def encode_components(
+        self, components: Dict[Type[Component], Component], config: Any
+    ) -> np.ndarray:
+        """
+        Same as encode_state, for callers that already hold the agent's
+        component dict and want to skip the per-component state lookups.
+        """
+        return self._encode(
+            cast(Optional[PositionComponent], components.get(PositionComponent)),
+            cast(Optional[HealthComponent], components.get(HealthComponent)),
+            cast(Optional[PerceptionComponent], components.get(PerceptionComponent)),
+            config,
+        )
 
-        agent_x = pos_comp.x / width if pos_comp else 0.5
-        agent_y = pos_comp.y / height if pos_comp else 0.5
+    def _encode(
+        self,
+        pos_comp: Optional[PositionComponent],
+        health_comp: Optional[HealthComponent],
+        perc_comp: Optional[PerceptionComponent],
+        config: Any,
+    ) -> np.ndarray:
+        inv_width, inv_height = self._grid_scale(config)
         health = (
             health_comp.current_health / health_comp.initial_health
             if health_comp
             else 0.5
         )
-        agent_state_vector = [agent_x, agent_y, health]
+        if not pos_comp:
+            return np.array((0.5, 0.5, health, *self.UNSEEN_BERRIES), dtype=np.float32)
+
+        agent_x = pos_comp.x
+        agent_y = pos_comp.y
+        features = [agent_x * inv_width, agent_y * inv_height, health]
+        if not perc_comp:
+            features.extend(self.UNSEEN_BERRIES)
+            return np.array(features, dtype=np.float32)
+
+        vision_range = perc_comp.vision_range
+        nearest_berries = self._nearest_berries(perc_comp)
+        for berry_type in self.BERRY_TYPES:
+            berry_data = nearest_berries[berry_type]
+            if berry_data:
+                berry_x, berry_y = berry_data["position"]
+                features.append(berry_data["distance"] / vision_range)
+                features.append(
+                    math.atan2(berry_y - agent_y, berry_x - agent_x) / math.pi
+                )
+            else:
+                features.extend(self.UNSEEN_BERRY)
+        return np.array(features, dtype=np.float32)
 
-        nearest_berries: Dict[str, Optional[Dict[str, Any]]] = {
-            "red": None,
-            "blue": None,
-            "yellow": None,
-        }
+    def encode_states(
+        self,
+        sim_state: Any,
+        entity_ids: Sequence[str],
+        config: Any,
+    ) -> np.ndarray:
+        """
+        Creates the feature vectors of several agents in one pass.
+
+        Component data is gathered into columns first, so the normalisation
+        and the berry angles are computed for the whole batch at once. Row i
+        matches what encode_state returns for entity_ids[i].
+        """
+        inv_width, inv_height = self._grid_scale(config)
+
+        count = len(entity_ids)
+        xs = np.zeros(count)
+        ys = np.zeros(count)
+        has_pos: np.ndarray = np.zeros(count, dtype=bool)
+        health = np.full(count, 0.5)
+        vision = np.ones(count)
+        # Per berry type: distance, dx and dy of the nearest visible berry
+        berry_dist = np.zeros((count, len(self.BERRY_TYPES)))
+        berry_dx = np.zeros((count, len(self.BERRY_TYPES)))
+        berry_dy = np.zeros((count, len(self.BERRY_TYPES)))
+        has_berry: np.ndarray = np.zeros((count, len(self.BERRY_TYPES)), dtype=bool)
+
+        for row, entity_id in enumerate(entity_ids):
+            pos_comp = sim_state.get_component(entity_id, PositionComponent)
+            health_comp = sim_state.get_component(entity_id, HealthComponent)
+            perc_comp = sim_state.get_component(entity_id, PerceptionComponent)
+            if health_comp:
+                health[row] = health_comp.current_health / health_comp.initial_health
+            if not pos_comp:
+                continue
+            has_pos[row] = True
+            xs[row] = pos_comp.x
+            ys[row] = pos_comp.y
+            if not perc_comp:
+                continue
+            vision[row] = perc_comp.vision_range
+            nearest_berries = self._nearest_berries(perc_comp)
+            for col, berry_type in enumerate(self.BERRY_TYPES):
+                berry_data = nearest_berries[berry_type]
+                if berry_data:
+                    has_berry[row, col] = True
+                    berry_dist[row, col] = berry_data["distance"]
+                    berry_dx[row, col] = berry_data["position"][0] - pos_comp.x
+                    berry_dy[row, col] = berry_data["position"][1] - pos_comp.y
+
+        states: np.ndarray = np.empty(
+            (count, 3 + 2 * len(self.BERRY_TYPES)), dtype=np.float32
+        )
+        states[:, 0] = np.where(has_pos, xs * inv_width, 0.5)
+        states[:, 1] = np.where(has_pos, ys * inv_height, 0.5)
+        states[:, 2] = health
+        states[:, 3::2] = np.where(has_berry, berry_dist / vision[:, None], 1.0)
+        states[:, 4::2] = np.where(
+            has_berry, np.arctan2(berry_dy, berry_dx) / math.pi, 0.0
+        )
+        return states
+
+    def _nearest_berries(
+        self, perc_comp: Optional[PerceptionComponent]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Picks the closest visible berry of each type, or None if unseen."""
+        nearest_berries: Dict[str, Optional[Dict[str, Any]]] = dict.fromkeys(
+            self.BERRY_TYPES
+        )
         if perc_comp and perc_comp.visible_entities:
             for entity_data in perc_comp.visible_entities.values():
                 if entity_data.get("type") == "berry":
@@ -328,20 +765,7 @@ class BerryStateEncoder(StateEncoderInterface):
                         or entity_data["distance"] < current_nearest["distance"]
                     ):
                         nearest_berries[b_type] = entity_data
-
-        perception_vector = []
-        for berry_type in ["red", "blue", "yellow"]:
-            berry_data = nearest_berries[berry_type]
-            if berry_data and pos_comp and perc_comp:
-                dist = berry_data["distance"] / perc_comp.vision_range
-                dx = berry_data["position"][0] - pos_comp.x
-                dy = berry_data["position"][1] - pos_comp.y
-                angle = math.atan2(dy, dx) / math.pi
-                perception_vector.extend([dist, angle])
-            else:
-                perception_vector.extend([1.0, 0.0])
-
-        return np.array(agent_state_vector + perception_vector, dtype=np.float32)
+        return nearest_berries
 
     def encode_internal_state(
         self, components: Dict[Type[Component], Component], config: Any
@@ -357,29 +781,40 @@ class BerryRewardCalculator(RewardCalculatorInterface):
 
 
 class BerryComponentFactory(ComponentFactoryInterface):
-    def create_component(self, component_type: str, data: Dict[str, Any]) -> Component:
-        class_name = component_type.split(".")[-1]
-
-        component_map = {
-            "PositionComponent": PositionComponent,
-            "HealthComponent": HealthComponent,
-            "BerryComponent": BerryComponent,
-            "WaterComponent": WaterComponent,
-            "RockComponent": RockComponent,
-            "TimeBudgetComponent": TimeBudgetComponent,
-            "QLearningComponent": QLearningComponent,
-            "PerceptionComponent": PerceptionComponent,
-        }
-
-        if class_name in component_map:
-            if class_name == "QLearningComponent":
-                return QLearningComponent(
-                    state_feature_dim=9,
-                    internal_state_dim=1,
-                    action_feature_dim=4,
-                    q_learning_alpha=0.1,
-                    device=torch.device("cpu"),
-                )
-            return component_map[class_name](**data)
+    _CONSTRUCTORS: Dict[Type[Component], Callable[[Dict[str, Any]], Component]] = {
+        PositionComponent: lambda data: PositionComponent(**data),
+        HealthComponent: lambda data: HealthComponent(**data),
+        BerryComponent: lambda data: BerryComponent(**data),
+        WaterComponent: lambda data: WaterComponent(**data),
+        RockComponent: lambda data: RockComponent(**data),
+        TimeBudgetComponent: lambda data: TimeBudgetComponent(**data),
+        QLearningComponent: lambda data: QLearningComponent(
+            state_feature_dim=9,
+            internal_state_dim=1,
+            action_feature_dim=4,
+            q_learning_alpha=0.1,
+            device=torch.device("cpu"),
+        ),
+        PerceptionComponent: lambda data: PerceptionComponent(**data),
+    }
+    # Built once for the class, keyed by the interned bare class name.
+    _COMPONENT_MAP: Dict[str, Callable[[Dict[str, Any]], Component]] = {
+        sys.intern(component_class.__name__): constructor
+        for component_class, constructor in _CONSTRUCTORS.items()
+    }
+
+    def __init__(self) -> None:
+        # Snapshots name components by their full path; each distinct path is
+        # split once and then resolved with a single dict hit.
+        self._name_cache: Dict[str, Callable[[Dict[str, Any]], Component]] = dict(
+            self._COMPONENT_MAP
+        )
 
-        raise TypeError(f"Unknown component type for factory: {component_type}")
+    def create_component(self, component_type: str, data: Dict[str, Any]) -> Component:
+        constructor = self._name_cache.get(component_type)
+        if constructor is None:
+            constructor = self._COMPONENT_MAP.get(component_type.split(".")[-1])
+            if constructor is None:
+                raise TypeError(f"Unknown component type for factory: {component_type}")
+            self._name_cache[sys.intern(component_type)] = constructor
+        return constructor(data)
@@ -2,8 +2,10 @@
 
 import numpy as np
 import imageio
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Deque, Dict, Iterable, Tuple
 
 from .components import (
     PositionComponent,
@@ -11,17 +13,31 @@ from .components import (
     WaterComponent,
     RockComponent,
 )
+from .environment import BerryWorldEnvironment
 
 
 class BerryRenderer:
     """Renders the state of the Berry Toxicity simulation grid to an image."""
 
-    def __init__(self, width: int, height: int, output_dir: str, pixel_scale: int = 1):
+    # PNG encoding runs on background threads; at most this many frames may
+    # be waiting to be written before render_frame blocks on the oldest, or
+    # drops the new frame when drop_late_frames is set.
+    MAX_PENDING_WRITES = 4
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        output_dir: str,
+        pixel_scale: int = 1,
+        drop_late_frames: bool = False,
+    ):
         self.width = width
         self.height = height
         self.output_path = Path(output_dir)
         self.output_path.mkdir(parents=True, exist_ok=True)
         self.pixel_scale = pixel_scale
+        self.drop_late_frames = drop_late_frames
 
         # Define a color map for all entities
         self.colors = {
@@ -34,73 +50,175 @@ class BerryRenderer:
             "water": [41, 128, 185],  # Darker blue for water
             "rock": [127, 140, 141],  # Gray for rocks
         }
+        # Palette row of each berry type seen so far, and the palette itself
+        self._berry_color_index: Dict[str, int] = {}
+        self._berry_palette: np.ndarray = np.empty((0, 3), dtype=np.uint8)
+
+        # Frame buffers reused across ticks: one pixel per cell, plus the
+        # scaled-up image when pixel_scale > 1
+        self._cells: np.ndarray = np.empty((height, width, 3), dtype=np.uint8)
+        self._frame = (
+            np.empty((height * pixel_scale, width * pixel_scale, 3), dtype=np.uint8)
+            if pixel_scale > 1
+            else self._cells
+        )
 
-    def render_frame(self, simulation_state: Any, tick: int) -> None:
-        """Creates and saves a single frame of the simulation."""
-        scaled_height = self.height * self.pixel_scale
-        scaled_width = self.width * self.pixel_scale
-        grid = np.full(
-            (scaled_height, scaled_width, 3), self.colors["empty"], dtype=np.uint8
+        # zlib releases the GIL, so encoding overlaps with the next ticks
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="berry-render"
         )
+        self._pending: Deque[Future] = deque()
+
+    def render_frame(self, simulation_state: Any, tick: int) -> bool:
+        """
+        Creates and saves a single frame of the simulation. Returns False if
+        the frame was dropped because the writers are still behind.
+        """
+        pending = self._pending
+        while pending and pending[0].done():
+            pending.popleft().result()
+        if self.drop_late_frames and len(pending) >= self.MAX_PENDING_WRITES:
+            return False
+
+        # The frame buffer is reused, so the writer gets its own copy
+        grid = self.draw_frame(simulation_state).copy()
+        frame_path = self.output_path / f"frame_{tick:04d}.png"
+        while len(pending) >= self.MAX_PENDING_WRITES:
+            pending.popleft().result()
+        pending.append(self._io_pool.submit(imageio.imwrite, frame_path, grid))
+        return True
+
+    def flush(self) -> None:
+        """Blocks until every submitted frame has been written to disk."""
+        while self._pending:
+            self._pending.popleft().result()
+
+    def close(self) -> None:
+        """
+        Writes out the remaining frames, re-raising any write error, and stops
+        the writer threads. The renderer cannot be used afterwards.
+        """
+        try:
+            self.flush()
+        finally:
+            self._io_pool.shutdown(wait=True)
+
+    def draw_frame(self, simulation_state: Any) -> np.ndarray:
+        """
+        Draws the current state as an RGB image.
+
+        Every layer is painted at one pixel per cell with a single
+        fancy-indexed write, and the finished grid is then scaled up by
+        pixel_scale in one pass. The returned array is a buffer that the
+        next call overwrites, so copy it to keep a frame around.
+        """
+        cells = self._cells
+        cells[...] = self.colors["empty"]
 
         # Draw terrain first (water and rocks)
-        self._draw_terrain(grid, simulation_state, WaterComponent, "water")
-        self._draw_terrain(grid, simulation_state, RockComponent, "rock")
+        self._draw_terrain(cells, simulation_state, WaterComponent, "water")
+        self._draw_terrain(cells, simulation_state, RockComponent, "rock")
 
         # Draw berries
-        self._draw_berries(grid, simulation_state)
+        self._draw_berries(cells, simulation_state)
 
         # Draw agents on top
-        self._draw_agents(grid, simulation_state)
-
-        frame_path = self.output_path / f"frame_{tick:04d}.png"
-        imageio.imwrite(frame_path, grid)
-
-    def _draw_pixel_block(self, grid, x, y, color):
-        """Draws a scaled block of pixels on the grid."""
-        y_start = y * self.pixel_scale
-        y_end = y_start + self.pixel_scale
-        x_start = x * self.pixel_scale
-        x_end = x_start + self.pixel_scale
-        grid[y_start:y_end, x_start:x_end] = color
-
-    def _draw_terrain(self, grid, sim_state, component_type, color_key):
+        self._draw_agents(cells, simulation_state)
+
+        if self.pixel_scale > 1:
+            # View the frame as (row, dy, col, dx) blocks and broadcast each
+            # cell's color across its block
+            scale = self.pixel_scale
+            blocks = self._frame.reshape(self.height, scale, self.width, scale, 3)
+            blocks[...] = cells[:, None, :, None, :]
+        return self._frame
+
+    def _paint_cells(
+        self, cells: np.ndarray, positions: Iterable[Tuple[int, int]], color: Any
+    ) -> None:
+        """
+        Paints the given (x, y) cells. color is a single RGB triple, or one
+        triple per position. Positions outside the grid are skipped.
+        """
+        if not isinstance(positions, np.ndarray):
+            positions = list(positions)
+        coords = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        if not coords.size:
+            return
+        xs, ys = coords[:, 0], coords[:, 1]
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        colors = np.asarray(color, dtype=np.uint8)
+        if colors.ndim == 2:
+            colors = colors[inside]
+        cells[ys[inside], xs[inside]] = colors
+
+    def _draw_terrain(self, cells, sim_state, component_type, color_key):
         """Helper to draw static terrain elements like water or rocks."""
         # This assumes terrain entities have a PositionComponent, which they don't.
         # A better way is to get the positions from the environment.
         env = sim_state.environment
-        locations = set()
-        if color_key == "water" and hasattr(env, "water_locations"):
-            locations = env.water_locations
-        elif color_key == "rock" and hasattr(env, "rock_locations"):
-            locations = env.rock_locations
-
-        for pos in locations:
-            self._draw_pixel_block(grid, pos[0], pos[1], self.colors[color_key])
+        if not isinstance(env, BerryWorldEnvironment):
+            return
+        locations = env.water_locations if color_key == "water" else env.rock_locations
+        self._paint_cells(cells, locations, self.colors[color_key])
 
-    def _draw_berries(self, grid, sim_state):
-        """Helper to draw berries from the environment."""
+    def _draw_berries(self, cells: np.ndarray, sim_state: Any) -> None:
+        """Helper to draw berries from the environment's cached columns."""
         env = sim_state.environment
-        if hasattr(env, "berry_locations"):
-            for pos, berry_type in env.berry_locations.items():
-                color = self.colors.get(f"{berry_type}_berry", self.colors["empty"])
-                self._draw_pixel_block(grid, pos[0], pos[1], color)
+        if not isinstance(env, BerryWorldEnvironment):
+            return
+        xs, ys, types = env.berry_columns()
+        if not types:
+            return
+        color_index = self._berry_color_index
+        new_types = set(types) - color_index.keys()
+        if new_types:
+            for berry_type in sorted(new_types):
+                color_index[berry_type] = len(color_index)
+            self._berry_palette = np.array(
+                [
+                    self.colors.get(f"{berry_type}_berry", self.colors["empty"])
+                    for berry_type in color_index
+                ],
+                dtype=np.uint8,
+            )
+        # Look each berry's color up as a palette row rather than building
+        # a nested list of RGB triples
+        rows = np.fromiter(
+            map(color_index.__getitem__, types), dtype=np.intp, count=len(types)
+        )
+        self._paint_cells(cells, np.stack((xs, ys), axis=1), self._berry_palette[rows])
 
-    def _draw_agents(self, grid, sim_state):
+    def _draw_agents(self, cells, sim_state):
         """Helper to draw agents, coloring them by health."""
-        entities = sim_state.get_entities_with_components(
-            [PositionComponent, HealthComponent]
+        # Join the position and health tables, then gather coordinates and
+        # health into columns instead of walking per-agent component dicts.
+        health_table = sim_state.get_component_table(HealthComponent)
+        agents = [
+            (pos_comp, health_table[entity_id])
+            for entity_id, pos_comp in sim_state.get_component_table(
+                PositionComponent
+            ).items()
+            if entity_id in health_table
+        ]
+        count = len(agents)
+        coords = np.fromiter(
+            (coord for pos_comp, _ in agents for coord in (pos_comp.x, pos_comp.y)),
+            dtype=np.int64,
+            count=2 * count,
+        ).reshape(count, 2)
+        current = np.fromiter(
+            (health_comp.current_health for _, health_comp in agents),
+            dtype=np.float64,
+            count=count,
         )
-        for _, components in entities.items():
-            pos_comp = components.get(PositionComponent)
-            health_comp = components.get(HealthComponent)
-
-            if pos_comp and health_comp:
-                health_ratio = health_comp.current_health / health_comp.initial_health
-                # Agents turn red if their health is below 30%
-                color = (
-                    self.colors["agent"]
-                    if health_ratio > 0.3
-                    else self.colors["low_health"]
-                )
-                self._draw_pixel_block(grid, pos_comp.x, pos_comp.y, color)
+        initial = np.fromiter(
+            (health_comp.initial_health for _, health_comp in agents),
+            dtype=np.float64,
+            count=count,
+        )
+
+        # Agents turn red if their health is below 30%
+        healthy = (current / initial > 0.3)[:, None]
+        colors = np.where(healthy, self.colors["agent"], self.colors["low_health"])
+        self._paint_cells(cells, coords, colors)
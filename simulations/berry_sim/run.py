@@ -1,6 +1,7 @@
 # FILE: simulations/berry_sim/run.py
 
 import asyncio
+import functools
 import importlib
 import uuid
 from typing import Any, Dict, Type
@@ -34,6 +35,7 @@ from .providers import (
 from .systems import CausalMetricTrackerSystem, RenderingSystem
 
 
+@functools.lru_cache(maxsize=None)
 def import_class(class_path: str) -> Type:
     module_path, class_name = class_path.rsplit(".", 1)
     module = importlib.import_module(module_path)
@@ -2,8 +2,9 @@
 
 import os
 import random
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, List, Optional, Type, cast
 
+import numpy as np
 from agent_core.agents.actions.base_action import ActionOutcome
 from agent_core.core.ecs.component import Component, TimeBudgetComponent
 from agent_engine.simulation.system import System
@@ -17,6 +18,20 @@ from .renderer import BerryRenderer
 class BerrySpawningSystem(System):
     """Handles the spawning of berries according to the experimental protocol."""
 
+    # Offsets tried around a rock when placing a yellow berry
+    YELLOW_ATTEMPTS = 10
+
+    def __init__(self, simulation_state: Any, config: Any, cognitive_scaffold: Any):
+        super().__init__(simulation_state, config, cognitive_scaffold)
+        self._rng: Optional[np.random.Generator] = None
+
+    def _generator(self) -> np.random.Generator:
+        # Seeded lazily from the random module, so seeding random at startup
+        # still makes the spawns reproducible
+        if self._rng is None:
+            self._rng = np.random.default_rng(random.getrandbits(64))
+        return self._rng
+
     async def update(self, current_tick: int) -> None:
         env = self.simulation_state.environment
         if not isinstance(env, BerryWorldEnvironment):
@@ -35,32 +50,38 @@ class BerrySpawningSystem(System):
             self._spawn_berries(env, spawn_config, "phase3")
 
     def _spawn_berries(self, env: BerryWorldEnvironment, config: Any, phase: str):
+        rng = self._generator()
+        red_roll, blue_roll, yellow_roll = rng.random(3).tolist()
+
         # Red Berries
-        if random.random() < config.red_rate:
+        if red_roll < config.red_rate:
             pos = env.get_random_empty_cell()
             if pos:
                 env.berry_locations[pos] = "red"
 
         # Blue Berries
-        if random.random() < config.blue_rate:
+        if blue_roll < config.blue_rate:
             if phase in ["phase1", "phase3"]:  # Spawn AWAY from water
+                # Look the cached cell set up once; each attempt is then a
+                # single membership test
+                near_water = env.cells_near(env.water_locations, 3)
                 for _ in range(100):
                     pos = env.get_random_empty_cell()
-                    if pos and not env.is_near_feature(pos, env.water_locations, 3):
+                    if pos and pos not in near_water:
                         env.berry_locations[pos] = "blue"
                         break
             else:  # Phase 2: Spawn NEAR water
-                for _ in range(100):
-                    pos = env.get_random_empty_cell()
-                    if pos and env.is_near_feature(pos, env.water_locations, 2):
-                        env.berry_locations[pos] = "blue"
-                        break
+                pos = env.get_random_empty_cell_near(env.water_locations, 2)
+                if pos:
+                    env.berry_locations[pos] = "blue"
 
         # Yellow Berries
-        if random.random() < config.yellow_rate and env.rock_locations:
-            rock_pos = random.choice(list(env.rock_locations))
-            for _ in range(10):  # Try to find a spot near the rock
-                dx, dy = random.randint(-2, 2), random.randint(-2, 2)
+        if yellow_roll < config.yellow_rate and env.rock_locations:
+            rocks = env.feature_cells(env.rock_locations)
+            rock_pos = rocks[int(rng.integers(len(rocks)))]
+            # Try to find a spot near the rock
+            offsets = rng.integers(-2, 3, size=(self.YELLOW_ATTEMPTS, 2)).tolist()
+            for dx, dy in offsets:
                 pos = (rock_pos[0] + dx, rock_pos[1] + dy)
                 if env.is_valid_position(pos) and not env.is_occupied(pos):
                     env.berry_locations[pos] = "yellow"
@@ -84,7 +105,11 @@ class ConsumptionSystem(System):
         pos_comp = self.simulation_state.get_component(entity_id, PositionComponent)
         env = self.simulation_state.environment
 
-        if not all([health_comp, pos_comp, isinstance(env, BerryWorldEnvironment)]):
+        if (
+            not health_comp
+            or not pos_comp
+            or not isinstance(env, BerryWorldEnvironment)
+        ):
             self._publish_outcome(
                 event_data, success=False, reward=-1.0, message="Missing components."
             )
@@ -104,6 +129,11 @@ class ConsumptionSystem(System):
         health_comp.current_health = min(
             health_comp.current_health, health_comp.initial_health
         )
+        if self.event_bus:
+            self.event_bus.publish(
+                "health_changed",
+                {"entity_id": entity_id, "current_tick": current_tick},
+            )
 
         self._publish_outcome(
             event_data,
@@ -140,7 +170,7 @@ class MovementSystem(System):
         pos_comp = self.simulation_state.get_component(entity_id, PositionComponent)
         env = self.simulation_state.environment
 
-        if not all([pos_comp, isinstance(env, BerryWorldEnvironment)]):
+        if not pos_comp or not isinstance(env, BerryWorldEnvironment):
             self._publish_outcome(
                 event_data, success=False, reward=-1.0, message="Missing components."
             )
@@ -157,7 +187,7 @@ class MovementSystem(System):
             return
 
         old_pos = pos_comp.position
-        pos_comp.x, pos_comp.y = target_pos
+        pos_comp.position = tuple(target_pos)
         env.update_entity_position(entity_id, old_pos, target_pos)
         self._publish_outcome(
             event_data, success=True, reward=0.0, message="Move successful."
@@ -182,24 +212,60 @@ class VitalsSystem(System):
 
     REQUIRED_COMPONENTS: List[Type[Component]] = [HealthComponent, TimeBudgetComponent]
 
-    async def update(self, current_tick: int) -> None:
-        agents = self.simulation_state.get_entities_with_components(
-            self.REQUIRED_COMPONENTS
-        )
-        env = self.simulation_state.environment
+    # Health can also be written directly (by tools, tests or future systems)
+    # without a health_changed report, so the whole health column is still
+    # scanned on every tick that is a multiple of this
+    FULL_SCAN_INTERVAL = 20
 
-        for agent_id, components in agents.items():
-            health_comp = components.get(HealthComponent)
-            time_comp = components.get(TimeBudgetComponent)
+    def __init__(self, simulation_state: Any, config: Any, cognitive_scaffold: Any):
+        super().__init__(simulation_state, config, cognitive_scaffold)
+        # Agents whose health changed since the last update, in the order
+        # reported so deaths are handled deterministically. None until the
+        # first update has scanned everyone, which catches health set at load
+        # or restore time; without an event bus every update scans.
+        self._changed: Optional[Dict[str, None]] = None
+        if self.event_bus:
+            self.event_bus.subscribe("health_changed", self.on_health_changed)
 
-            if not time_comp or not health_comp or not time_comp.is_active:
-                continue
+    def on_health_changed(self, event_data: Dict[str, Any]) -> None:
+        if self._changed is not None:
+            self._changed[event_data["entity_id"]] = None
+
+    async def update(self, current_tick: int) -> None:
+        health_table = cast(
+            Dict[str, HealthComponent],
+            self.simulation_state.get_component_table(HealthComponent),
+        )
+        changed = self._changed
+        if changed is None or current_tick % self.FULL_SCAN_INTERVAL == 0:
+            dead_ids = self._scan_for_dead(health_table)
+        else:
+            # Only agents whose health moved since the last update can have
+            # run out of it
+            dead_ids = [
+                agent_id
+                for agent_id in changed
+                if agent_id in health_table
+                and health_table[agent_id].current_health <= 0
+            ]
+        if self.event_bus:
+            self._changed = {}
+        if not dead_ids:
+            return
 
-            if health_comp.current_health <= 0:
+        time_table = cast(
+            Dict[str, TimeBudgetComponent],
+            self.simulation_state.get_component_table(TimeBudgetComponent),
+        )
+        env = self.simulation_state.environment
+        berry_env = env if isinstance(env, BerryWorldEnvironment) else None
+        for agent_id in dead_ids:
+            time_comp = time_table.get(agent_id)
+            if time_comp and time_comp.is_active:
                 time_comp.is_active = False
 
-                if isinstance(env, BerryWorldEnvironment):
-                    env.remove_entity(agent_id)
+                if berry_env is not None:
+                    berry_env.remove_entity(agent_id)
 
                 if self.event_bus:
                     self.event_bus.publish(
@@ -207,6 +273,20 @@ class VitalsSystem(System):
                         {"entity_id": agent_id, "current_tick": current_tick},
                     )
 
+    @staticmethod
+    def _scan_for_dead(health_table: Dict[str, HealthComponent]) -> List[str]:
+        """
+        Scans every agent's health as one column straight from the component
+        table and returns the agents that are out of it.
+        """
+        agent_ids = list(health_table)
+        healths = np.fromiter(
+            (health_comp.current_health for health_comp in health_table.values()),
+            dtype=np.float64,
+            count=len(agent_ids),
+        )
+        return [agent_ids[index] for index in np.flatnonzero(healths <= 0).tolist()]
+
 
 class CausalMetricTrackerSystem(System):
     """Listens to events to update the state of the causal metrics calculator."""
@@ -253,18 +333,28 @@ class RenderingSystem(System):
             "output_directory", "data/renders/default_berry"
         )
         pixel_scale = render_config.get("pixel_scale", 1)
+        # Only every render_every-th tick is drawn and encoded
+        self.render_every = max(1, int(render_config.get("render_every", 1)))
+        # Skip frames instead of stalling the tick when encoding falls behind
+        drop_late_frames = bool(render_config.get("drop_late_frames", False))
 
         # Create a unique subdirectory for this specific simulation run
         run_id = self.simulation_state.simulation_id
         self.unique_output_dir = os.path.join(base_output_dir, run_id)
 
         self.renderer = BerryRenderer(
-            width, height, self.unique_output_dir, pixel_scale
+            width, height, self.unique_output_dir, pixel_scale, drop_late_frames
         )
         print(
             f"🎨 RenderingSystem initialized. Frames will be saved to '{self.unique_output_dir}'."
         )
 
     async def update(self, current_tick: int) -> None:
-        """On each tick, render a new frame."""
+        """Renders a new frame on every render_every-th tick."""
+        if current_tick % self.render_every:
+            return
         self.renderer.render_frame(self.simulation_state, current_tick)
+
+    def close(self) -> None:
+        """Waits for the frames still being encoded and stops the writers."""
+        self.renderer.close()
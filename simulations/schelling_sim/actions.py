@@ -1,6 +1,5 @@
 # simulations/schelling_sim/actions.py
 
-import random
 from typing import Any, Dict, List
 
 from agent_core.agents.actions.action_interface import ActionInterface
@@ -19,6 +18,9 @@ class MoveToEmptyCellAction(ActionInterface):
     An action that allows an unsatisfied agent to move to a random empty cell.
     """
 
+    # Shared by every call, so callers must treat it as read-only
+    FEATURES: List[float] = [1.0]
+
     @property
     def action_id(self) -> str:
         """A unique string identifier for the action."""
@@ -53,12 +55,10 @@ class MoveToEmptyCellAction(ActionInterface):
         if not isinstance(env, SchellingGridEnvironment):
             return []
 
-        empty_cells = env.get_empty_cells()
-        if not empty_cells:
-            return []
-
         # The agent will move to a random empty cell.
-        target_cell = random.choice(empty_cells)
+        target_cell = env.get_random_empty_cell()
+        if target_cell is None:
+            return []
         return [{"target_x": target_cell[0], "target_y": target_cell[1]}]
 
     def execute(
@@ -91,4 +91,4 @@ class MoveToEmptyCellAction(ActionInterface):
         self, entity_id: str, simulation_state: SimulationState, params: Dict[str, Any]
     ) -> List[float]:
         """Generates a feature vector for this action (not used in this model)."""
-        return [1.0]
+        return self.FEATURES
@@ -1,5 +1,6 @@
 # simulations/schelling_sim/environment.py
 
+import random
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 from agent_core.environment.interface import EnvironmentInterface
@@ -24,6 +25,9 @@ class SchellingGridEnvironment(EnvironmentInterface):
         neighbors = env.get_neighbors((5, 5))
     """
 
+    # Uniform draws tried by get_random_empty_cell before listing the grid
+    EMPTY_CELL_ATTEMPTS = 32
+
     def __init__(self, width: int, height: int) -> None:
         self.width = width
         self.height = height
@@ -87,6 +91,23 @@ class SchellingGridEnvironment(EnvironmentInterface):
         occupied_cells = set(self.grid.keys())
         return list(all_cells - occupied_cells)
 
+    def get_random_empty_cell(self) -> Optional[Tuple[int, int]]:
+        """
+        Returns a uniformly random unoccupied cell, or None if the grid is full.
+
+        A few uniform draws are tried first, which almost always succeeds
+        without listing the grid; only a nearly full grid falls back to
+        choosing from get_empty_cells.
+        """
+        grid = self.grid
+        if len(grid) < self.width * self.height:
+            for _ in range(self.EMPTY_CELL_ATTEMPTS):
+                pos = (random.randrange(self.width), random.randrange(self.height))
+                if pos not in grid:
+                    return pos
+        empty_cells = self.get_empty_cells()
+        return random.choice(empty_cells) if empty_cells else None
+
     def distance(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> float:
         """Calculates the toroidal distance between two points."""
         dx = abs(pos1[0] - pos2[0])
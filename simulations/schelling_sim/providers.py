@@ -1,5 +1,6 @@
 # simulations/schelling_sim/providers.py
 
+import sys
 from typing import Any, Dict, List, Optional, Tuple, Type
 
 from agent_core.agents.action_generator_interface import ActionGeneratorInterface
@@ -15,8 +16,12 @@ from .components import GroupComponent, PositionComponent, SatisfactionComponent
 class SchellingActionGenerator(ActionGeneratorInterface):
     """Generates possible moves for unsatisfied agents."""
 
+    def __init__(self) -> None:
+        # The action is stateless, so one instance serves every agent
+        self.move_action = MoveToEmptyCellAction()
+
     def generate(self, sim_state, entity_id, tick) -> List[ActionPlanComponent]:
-        move_action = MoveToEmptyCellAction()
+        move_action = self.move_action
         params_list = move_action.generate_possible_params(entity_id, sim_state, tick)
         return [
             ActionPlanComponent(action_type=move_action, params=p) for p in params_list
@@ -33,17 +38,28 @@ class SchellingDecisionSelector(DecisionSelectorInterface):
 class SchellingComponentFactory(ComponentFactoryInterface):
     """Creates component instances from saved data."""
 
+    _COMPONENT_CLASSES: Tuple[Type[Component], ...] = (
+        PositionComponent,
+        GroupComponent,
+        SatisfactionComponent,
+    )
+    _COMPONENT_MAP: Dict[str, Type[Component]] = {
+        sys.intern(component_class.__name__): component_class
+        for component_class in _COMPONENT_CLASSES
+    }
+
+    def __init__(self) -> None:
+        # Full class paths are split once, then resolved from this cache
+        self._name_cache: Dict[str, Type[Component]] = dict(self._COMPONENT_MAP)
+
     def create_component(self, component_type: str, data: Dict[str, Any]) -> Component:
-        # Assumes the full class path is provided in a real restore scenario
-        class_name = component_type.split(".")[-1]
-
-        if class_name == "PositionComponent":
-            return PositionComponent(**data)
-        if class_name == "GroupComponent":
-            return GroupComponent(**data)
-        if class_name == "SatisfactionComponent":
-            return SatisfactionComponent(**data)
-        raise TypeError(f"Unknown component type: {component_type}")
+        component_class = self._name_cache.get(component_type)
+        if component_class is None:
+            component_class = self._COMPONENT_MAP.get(component_type.split(".")[-1])
+            if component_class is None:
+                raise TypeError(f"Unknown component type: {component_type}")
+            self._name_cache[sys.intern(component_type)] = component_class
+        return component_class(**data)
 
 
 class SchellingRewardCalculator(RewardCalculatorInterface):
@@ -23,31 +23,48 @@ class SchellingRenderer:
             1: [52, 152, 219],
             2: [231, 76, 60],
         }
+        # Row i of the palette is the color of agent_type i
+        self._palette = np.array(
+            [self.colors[i] for i in range(len(self.colors))], dtype=np.uint8
+        )
 
     def render_frame(self, simulation_state: Any, tick: int) -> None:
         """Creates and saves a single frame of the simulation."""
-        # Create a larger grid based on the scale
-        scaled_height = self.height * self.pixel_scale
-        scaled_width = self.width * self.pixel_scale
-        grid = np.full((scaled_height, scaled_width, 3), self.colors[0], dtype=np.uint8)
-
-        entities = simulation_state.get_entities_with_components(
-            [PositionComponent, GroupComponent]
-        )
+        frame_path = self.output_path / f"frame_{tick:04d}.png"
+        imageio.imwrite(frame_path, self.draw_frame(simulation_state))
 
-        for _, components in entities.items():
-            pos_comp = components.get(PositionComponent)
-            group_comp = components.get(GroupComponent)
+    def draw_frame(self, simulation_state: Any) -> np.ndarray:
+        """
+        Draws the current grid as an RGB image.
 
-            if pos_comp and group_comp:
-                # Color a block of pixels instead of a single one
-                y_start = pos_comp.y * self.pixel_scale
-                y_end = y_start + self.pixel_scale
-                x_start = pos_comp.x * self.pixel_scale
-                x_end = x_start + self.pixel_scale
+        Agents are gathered into coordinate and type columns and painted
+        with one fancy-indexed write at one pixel per cell; the grid is
+        then scaled up by pixel_scale in a single broadcast.
+        """
+        group_table = simulation_state.get_component_table(GroupComponent)
+        agents = [
+            (pos_comp, group_table[entity_id])
+            for entity_id, pos_comp in simulation_state.get_component_table(
+                PositionComponent
+            ).items()
+            if entity_id in group_table
+        ]
+        count = len(agents)
+        xs = np.fromiter((pos.x for pos, _ in agents), dtype=np.int64, count=count)
+        ys = np.fromiter((pos.y for pos, _ in agents), dtype=np.int64, count=count)
+        types = np.fromiter(
+            (group.agent_type for _, group in agents), dtype=np.intp, count=count
+        )
 
-                # Use array slicing to set the color for the entire block
-                grid[y_start:y_end, x_start:x_end] = self.colors[group_comp.agent_type]
+        cells = np.zeros((self.height, self.width), dtype=np.intp)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        cells[ys[inside], xs[inside]] = types[inside]
+        grid = self._palette[cells]
 
-        frame_path = self.output_path / f"frame_{tick:04d}.png"
-        imageio.imwrite(frame_path, grid)
+        scale = self.pixel_scale
+        if scale > 1:
+            # Repeat each cell's color across a scale x scale block
+            grid = np.broadcast_to(
+                grid[:, None, :, None, :], (self.height, scale, self.width, scale, 3)
+            ).reshape(self.height * scale, self.width * scale, 3)
+        return grid
@@ -1,6 +1,7 @@
 # simulations/schelling_sim/run.py
 
 import asyncio
+import functools
 import importlib
 import os
 import uuid
@@ -31,6 +32,7 @@ from .providers import (
 )
 
 
+@functools.lru_cache(maxsize=None)
 def import_class(class_path: str) -> Type:
     """Dynamically imports a class from its string path."""
     try:
@@ -36,13 +36,20 @@ class SatisfactionSystem(System):
         all_agents = self.simulation_state.get_entities_with_components(
             self.REQUIRED_COMPONENTS
         )
+        # Group of every agent, gathered once so that each neighbor costs a
+        # single dict lookup instead of a component lookup per visit
+        agent_types: Dict[str, Any] = {}
+        for entity_id, components in all_agents.items():
+            group = components.get(GroupComponent)
+            if group:
+                agent_types[entity_id] = group.agent_type
 
         for _, components in all_agents.items():
             pos_comp = components.get(PositionComponent)
             group_comp = components.get(GroupComponent)
             satisfaction_comp = components.get(SatisfactionComponent)
 
-            if not all([pos_comp, group_comp, satisfaction_comp]):
+            if not pos_comp or not group_comp or not satisfaction_comp:
                 continue
 
             neighbors = env.get_neighbors_of_position(pos_comp.position)
@@ -56,13 +63,15 @@ class SatisfactionSystem(System):
             # Count neighbors of the same group type.
             same_type_neighbors = 0
             for neighbor_id in neighbors.values():
-                neighbor_group_comp = self.simulation_state.get_component(
-                    neighbor_id, GroupComponent
-                )
-                if (
-                    neighbor_group_comp
-                    and neighbor_group_comp.agent_type == group_comp.agent_type
-                ):
+                if neighbor_id not in agent_types:
+                    neighbor_group_comp = self.simulation_state.get_component(
+                        neighbor_id, GroupComponent
+                    )
+                    agent_types[neighbor_id] = (
+                        neighbor_group_comp.agent_type if neighbor_group_comp else None
+                    )
+                neighbor_type = agent_types[neighbor_id]
+                if neighbor_type is not None and neighbor_type == group_comp.agent_type:
                     same_type_neighbors += 1
 
             # The agent is satisfied if the ratio of same-type neighbors
@@ -103,7 +112,7 @@ class MovementSystem(System):
 
         outcome: ActionOutcome
 
-        if not all([pos_comp, isinstance(env, SchellingGridEnvironment)]):
+        if not pos_comp or not isinstance(env, SchellingGridEnvironment):
             outcome = ActionOutcome(
                 success=False,
                 message="Missing component or wrong env.",
@@ -218,3 +218,46 @@ def test_global_singleton_instance():
     assert "global_test" in action_registry.action_ids
     retrieved_action = action_registry.get_action("global_test")
     assert retrieved_action == GlobalTestAction
+
+
+def test_one_hot_follows_sorted_action_ids(fresh_registry: ActionRegistry):
+    """
+    Tests that one-hot encodings index into action_ids, are shared between
+    calls, and are rebuilt when a new action is registered.
+    """
+    # Arrange
+    fresh_registry.register(MockAction)
+    first = fresh_registry.one_hot("mock_action")
+
+    # Act
+    fresh_registry.register(AnotherMockAction)
+
+    # Assert
+    assert first == (1.0,)
+    assert fresh_registry.one_hot("mock_action") == (0.0, 1.0)
+    assert fresh_registry.one_hot("mock_action") is fresh_registry.one_hot(
+        "mock_action"
+    )
+    assert fresh_registry.one_hot("unknown") == (0.0, 0.0)
+    assert fresh_registry.one_hot(None) == (0.0, 0.0)
+    assert fresh_registry.action_index("another_action") == 0
+    assert fresh_registry.action_index("unknown") is None
+
+
+def test_index_rebuilt_after_registry_reset(fresh_registry: ActionRegistry):
+    """
+    Tests that registering into a replaced action dict of the same size
+    does not serve the index built for the old one.
+    """
+    # Arrange
+    fresh_registry.register(MockAction)
+    assert fresh_registry.action_ids == ["mock_action"]
+
+    # Act
+    fresh_registry._actions = {}
+    fresh_registry.register(AnotherMockAction)
+
+    # Assert
+    assert fresh_registry.action_ids == ["another_action"]
+    assert fresh_registry.action_index("mock_action") is None
+    assert fresh_registry.one_hot("another_action") == (1.0,)
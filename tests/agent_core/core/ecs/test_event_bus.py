@@ -1,4 +1,5 @@
 # src/agent_core/tests/core/ecs/test_event_bus.py
+import asyncio
 from unittest.mock import MagicMock
 
 import pytest
@@ -142,3 +143,48 @@ def test_debug_logging_output(debug_event_bus: EventBus, capsys):
     # Assert
     captured = capsys.readouterr()
     assert "DEBUG: Publishing event 'debug_event'" in captured.out
+
+
+def test_handler_kind_is_resolved_once_at_subscribe(event_bus: EventBus):
+    """
+    Tests that handlers are classified as sync or async when subscribed.
+    """
+
+    # Arrange
+    def sync_handler(data):
+        pass
+
+    async def async_handler(data):
+        pass
+
+    # Act
+    event_bus.subscribe("hot_event", sync_handler)
+    event_bus.subscribe("hot_event", async_handler)
+
+    # Assert
+    assert event_bus._subscribers["hot_event"] == [
+        (sync_handler, False),
+        (async_handler, True),
+    ]
+
+
+def test_async_handler_is_scheduled_as_task(event_bus: EventBus):
+    """
+    Tests that coroutine handlers run as background tasks awaited by flush.
+    """
+    received = []
+
+    async def async_handler(data):
+        received.append(data)
+
+    event_bus.subscribe("async_event", async_handler)
+
+    async def run():
+        event_bus.publish("async_event", {"n": 1})
+        assert len(event_bus._pending_tasks) == 1
+        await event_bus.flush()
+
+    asyncio.run(run())
+
+    assert received == [{"n": 1}]
+    assert not event_bus._pending_tasks
@@ -151,6 +151,57 @@ class TestSimulationState(unittest.TestCase):
         self.assertIn(entity_3, entities_with_another)
         self.assertEqual(len(entities_with_another), 2)
 
+    def test_removed_entity_is_dropped_from_queries(self):
+        """Verify that removing an entity also removes it from component queries."""
+        self.simulation_state.add_entity("agent_1")
+        self.simulation_state.add_component("agent_1", MockComponent())
+        self.simulation_state.add_entity("agent_2")
+        self.simulation_state.add_component("agent_2", MockComponent())
+
+        self.simulation_state.remove_entity("agent_1")
+
+        matching = self.simulation_state.get_entities_with_components([MockComponent])
+        self.assertEqual(list(matching), ["agent_2"])
+        self.assertNotIn(
+            "agent_1", self.simulation_state.get_component_table(MockComponent)
+        )
+
+    def test_query_with_unregistered_component_type(self):
+        """A component type no entity has ever owned matches nothing."""
+
+        class UnusedComponent(Component):
+            def to_dict(self):
+                return {}
+
+            def validate(self, entity_id: str):
+                return True, []
+
+        self.simulation_state.add_entity("agent_1")
+        self.simulation_state.add_component("agent_1", MockComponent())
+
+        matching = self.simulation_state.get_entities_with_components(
+            [MockComponent, UnusedComponent]
+        )
+        self.assertEqual(matching, {})
+
+    def test_add_entities_bulk(self):
+        """Verify bulk-added entities are stored and queryable like single adds."""
+        component = MockComponent()
+        self.simulation_state.add_entities_bulk(
+            [("agent_1", [component]), ("agent_2", [])]
+        )
+
+        self.assertIs(
+            self.simulation_state.get_component("agent_1", MockComponent), component
+        )
+        self.assertEqual(self.simulation_state.entities["agent_2"], {})
+        self.assertEqual(
+            list(self.simulation_state.get_entities_with_components([MockComponent])),
+            ["agent_1"],
+        )
+        with self.assertRaises(ValueError):
+            self.simulation_state.add_entities_bulk([("agent_1", [])])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -186,6 +186,34 @@ async def test_full_lifecycle_and_correct_call_order(
     manager.mock_file_store.save.assert_called_once_with(
         manager.mock_sim_state.to_snapshot.return_value
     )
+    manager.system_manager.close_all.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_decision_selector_prepared_before_turns(
+    sim_manager_with_mocks, mock_dependencies
+):
+    """
+    Tests that the decision selector is given the tick's turn order once,
+    after systems update and before any entity acts.
+    """
+    manager = sim_manager_with_mocks
+    selector = mock_dependencies["decision_selector"]
+    calls = []
+    manager.system_manager.update_all.side_effect = lambda current_tick: calls.append(
+        "update_all"
+    )
+    selector.prepare_turns.side_effect = lambda state, ids, tick: calls.append(
+        ("prepare", list(ids), tick)
+    )
+    manager._process_entity_turn = MagicMock(
+        side_effect=lambda entity_id, current_tick: calls.append("turn")
+    )
+    manager._get_active_entities = MagicMock(return_value=["agent_01"])
+
+    await manager._execute_simulation_step(0)
+
+    assert calls == ["update_all", ("prepare", ["agent_01"], 0), "turn"]
 
 
 @pytest.mark.asyncio
@@ -212,6 +240,19 @@ async def test_run_loop_stops_when_no_active_entities(
     manager.mock_file_store.save.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_run_closes_systems_when_a_step_fails(sim_manager_with_mocks):
+    """Tests that systems are closed even if the loop raises."""
+    manager = sim_manager_with_mocks
+    manager._get_active_entities = MagicMock(return_value=["agent_01"])
+    manager.system_manager.update_all.side_effect = RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await manager.run()
+
+    manager.system_manager.close_all.assert_called_once_with()
+
+
 def test_load_state_replaces_simulation_state(sim_manager_with_mocks):
     """
     Tests that loading from a checkpoint correctly replaces the existing
@@ -49,6 +49,20 @@ class TestSystemManager(unittest.TestCase):
         self.assertIn(mock_system_instance, self.system_manager._systems)
         self.assertEqual(len(self.system_manager._systems), 1)
 
+    def test_close_all_closes_every_system(self):
+        """Verify close_all calls close on each system in registration order."""
+        calls = []
+        for name in ("first", "second"):
+            system = MockSystem(
+                self.simulation_state, self.config, self.cognitive_scaffold
+            )
+            system.close = MagicMock(side_effect=lambda name=name: calls.append(name))
+            self.system_manager.register_system(lambda *args, s=system, **kw: s)
+
+        self.system_manager.close_all()
+
+        self.assertEqual(calls, ["first", "second"])
+
     async def test_update_all_executes_systems_concurrently(self):
         """
         Verify that the update_all method calls the update method on all
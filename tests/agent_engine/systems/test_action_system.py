@@ -173,6 +173,34 @@ class TestActionSystem:
         assert final_event_data["entity_id"] == "agent1"
         assert final_event_data["action_outcome"].reward == 15.0
 
+    @pytest.mark.parametrize("debug_logging", [False, True])
+    def test_on_action_outcome_ready_only_logs_when_debugging(
+        self, action_system, mock_event_bus, capsys, debug_logging
+    ):
+        """
+        Tests that the per-action summary is printed only when the event bus
+        has debug logging enabled.
+        """
+        # Arrange
+        mock_event_bus.debug_logging = debug_logging
+        mock_action_type = MagicMock(spec=ActionInterface)
+        mock_action_type.name = "Test Action"
+        mock_action_type.action_id = "test_action_id"
+        mock_action_type.get_base_cost.return_value = 1.0
+        event_data = {
+            "entity_id": "agent1",
+            "action_outcome": ActionOutcome(True, "", 10.0, {}),
+            "original_action_plan": ActionPlanComponent(action_type=mock_action_type),
+            "current_tick": 50,
+        }
+
+        # Act
+        action_system.on_action_outcome_ready(event_data)
+
+        # Assert
+        mock_event_bus.publish.assert_called_once()
+        assert ("executed Test Action" in capsys.readouterr().out) is debug_logging
+
     @pytest.mark.asyncio
     async def test_update_method_is_empty(self, action_system):
         """
@@ -7,6 +7,7 @@ from unittest.mock import MagicMock, create_autospec, patch
 
 import numpy as np
 import pytest
+import torch
 from agent_core.agents.actions.action_interface import ActionInterface
 from agent_core.agents.actions.base_action import ActionOutcome
 from agent_core.core.ecs.component import TimeBudgetComponent
@@ -123,3 +124,147 @@ async def test_update_skips_inactive_agents(system_setup):
     await system.update(current_tick=1)
 
     mock_encoder.encode_state.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_encodes_active_agents_in_one_batch(system_setup):
+    """
+    Tests that the update method encodes all active agents with a single
+    batched call and caches one row per agent.
+    """
+    system, mock_state, _, mock_encoder, _, _ = system_setup
+
+    mock_state.get_entities_with_components.return_value = {
+        "agent_a": {TimeBudgetComponent: TimeBudgetComponent(100, 0)},
+        "agent_b": {TimeBudgetComponent: TimeBudgetComponent(100, 0)},
+    }
+    mock_encoder.encode_states.return_value = np.array([[1.0, 2.0], [3.0, 4.0]])
+
+    await system.update(current_tick=1)
+
+    mock_encoder.encode_states.assert_called_once_with(
+        mock_state, ["agent_a", "agent_b"], system.config
+    )
+    np.testing.assert_array_equal(system.previous_states["agent_a"], [1.0, 2.0])
+    np.testing.assert_array_equal(system.previous_states["agent_b"], [3.0, 4.0])
+
+
+def test_learning_step_shares_float32_state_memory(system_setup):
+    """
+    Tests that float32 state rows reach the network without being copied and
+    that the step still updates the weights and publishes the loss.
+    """
+    system, mock_state, mock_bus, _, _, agent_id = system_setup
+    mock_state.device = "cpu"
+    system.config.learning.q_learning.gamma = 0.9
+    system.bf16_autocast = False
+    q_comp = QLearningComponent(16, 1, 13, 0.001, "cpu")
+    old_state = np.ones((2, 16), dtype=np.float32)[1]
+    weights_before = [p.detach().clone() for p in q_comp.utility_network.parameters()]
+    seen_states = []
+    forward = q_comp.utility_network.forward
+
+    def spy_forward(state, internal, action):
+        seen_states.append(state)
+        return forward(state, internal, action)
+
+    with patch.object(q_comp.utility_network, "forward", side_effect=spy_forward):
+        system._perform_learning_step(
+            agent_id,
+            q_comp,
+            old_state,
+            np.zeros(16, dtype=np.float32),
+            [0.0] * 13,
+            np.ones(1, dtype=np.float32),
+            1.0,
+            [],
+            5,
+        )
+
+    assert seen_states[0].data_ptr() == old_state.ctypes.data
+    assert any(
+        not torch.equal(before, after)
+        for before, after in zip(weights_before, q_comp.utility_network.parameters())
+    )
+    event_name, payload = mock_bus.publish.call_args.args
+    assert event_name == "q_learning_update"
+    assert payload["current_tick"] == 5
+
+
+def test_learning_step_runs_forward_passes_under_bf16_autocast(system_setup):
+    """
+    Tests that enabling bf16 autocast computes the Q-values in bfloat16 while
+    the network weights stay in float32.
+    """
+    system, mock_state, _, _, _, agent_id = system_setup
+    mock_state.device = "cpu"
+    system.config.learning.q_learning.gamma = 0.9
+    system.bf16_autocast = True
+    q_comp = QLearningComponent(16, 1, 13, 0.001, "cpu")
+    outputs = []
+    forward = q_comp.utility_network.forward
+
+    def spy_forward(state, internal, action):
+        outputs.append(forward(state, internal, action))
+        return outputs[-1]
+
+    next_plan = MagicMock()
+    next_plan.action_type = create_autospec(ActionInterface, instance=True)
+    next_plan.action_type.get_feature_vector.return_value = [0.0] * 13
+    with patch.object(q_comp.utility_network, "forward", side_effect=spy_forward):
+        system._perform_learning_step(
+            agent_id,
+            q_comp,
+            np.ones(16, dtype=np.float32),
+            np.zeros(16, dtype=np.float32),
+            [0.0] * 13,
+            np.ones(1, dtype=np.float32),
+            1.0,
+            [next_plan],
+            5,
+        )
+
+    assert [out.dtype for out in outputs] == [torch.bfloat16, torch.bfloat16]
+    assert all(p.dtype == torch.float32 for p in q_comp.utility_network.parameters())
+
+
+def test_learning_step_scores_next_actions_as_one_float32_batch(system_setup):
+    """
+    Tests that the next-action feature vectors are stacked into a single
+    float32 batch for the bootstrap forward pass.
+    """
+    system, mock_state, _, _, _, agent_id = system_setup
+    mock_state.device = "cpu"
+    system.config.learning.q_learning.gamma = 0.9
+    system.bf16_autocast = False
+    q_comp = QLearningComponent(16, 1, 13, 0.001, "cpu")
+    seen_actions = []
+    forward = q_comp.utility_network.forward
+
+    def spy_forward(state, internal, action):
+        seen_actions.append(action)
+        return forward(state, internal, action)
+
+    next_plans = []
+    for index in range(3):
+        plan = MagicMock()
+        plan.action_type = create_autospec(ActionInterface, instance=True)
+        plan.action_type.get_feature_vector.return_value = [float(index)] * 13
+        next_plans.append(plan)
+    with patch.object(q_comp.utility_network, "forward", side_effect=spy_forward):
+        system._perform_learning_step(
+            agent_id,
+            q_comp,
+            np.ones(16, dtype=np.float32),
+            np.zeros(16, dtype=np.float32),
+            [0.0] * 13,
+            np.ones(1, dtype=np.float32),
+            1.0,
+            next_plans,
+            5,
+        )
+
+    next_actions = seen_actions[1]
+    assert next_actions.dtype == torch.float32
+    assert next_actions.shape == (3, 13)
+    assert next_actions[:, 0].tolist() == [0.0, 1.0, 2.0]
@@ -0,0 +1,34 @@
+# tests/utils/test_class_importer.py
+
+import importlib
+from unittest.mock import patch
+
+import pytest
+from agent_core.core.ecs.component import TimeBudgetComponent
+from agent_engine.utils.class_importer import import_class
+
+
+def test_import_class_caches_resolved_paths():
+    """Verify a path is imported once and then served from the cache."""
+    import_class.cache_clear()
+    path = "agent_core.core.ecs.component.TimeBudgetComponent"
+
+    with patch(
+        "agent_engine.utils.class_importer.importlib.import_module",
+        wraps=importlib.import_module,
+    ) as import_module:
+        first = import_class(path)
+        second = import_class(path)
+
+    assert first is second is TimeBudgetComponent
+    import_module.assert_called_once()
+
+
+def test_import_class_does_not_cache_failures():
+    """Verify a failed lookup raises every time instead of being memoized."""
+    import_class.cache_clear()
+
+    for _ in range(2):
+        with pytest.raises(AttributeError):
+            import_class("agent_core.core.ecs.component.MissingComponent")
+    assert import_class.cache_info().currsize == 0
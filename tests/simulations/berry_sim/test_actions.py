@@ -56,6 +56,23 @@ class TestMoveAction:
         assert {"target_pos": (0, 1), "direction": "N"} in params
         assert {"target_pos": (1, 0), "direction": "E"} in params
 
+    def test_generate_possible_params_skips_blocked_cells(self, mock_sim_state_actions):
+        """Verify occupied targets are dropped but berry cells stay open."""
+        env = mock_sim_state_actions.environment
+        env.add_entity("agent_2", (5, 6))
+        env.water_locations.add((5, 4))
+        env.berry_locations[(6, 5)] = "red"
+        mock_sim_state_actions.get_component.return_value = PositionComponent(5, 5)
+
+        params = MoveAction().generate_possible_params(
+            "agent_1", mock_sim_state_actions, tick=1
+        )
+
+        assert params == [
+            {"target_pos": (6, 5), "direction": "E"},
+            {"target_pos": (4, 5), "direction": "W"},
+        ]
+
     def test_get_feature_vector(self):
         """Test that the feature vector has the correct format and size."""
         action = MoveAction()
@@ -112,3 +129,9 @@ class TestEatBerryAction:
             "agent_1", MagicMock(), {"berry_type": "yellow"}
         )
         assert vector_yellow == [0.0, 0.0, 0.0, 1.0]
+
+        assert action.get_feature_vector("agent_1", MagicMock(), {}) == [0.0] * 4
+        assert (
+            action.get_feature_vector("agent_2", MagicMock(), {"berry_type": "red"})
+            is vector_red
+        )
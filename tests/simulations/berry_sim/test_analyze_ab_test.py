@@ -0,0 +1,99 @@
+# FILE: tests/simulations/berry_sim/test_analyze_ab_test.py
+"""
+Unit tests for the statistics helpers of the berry_sim A/B test analysis.
+
+None of these need a database: the summaries are checked against SciPy and
+NumPy computed from the raw samples.
+"""
+
+from functools import reduce
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import ttest_ind
+from simulations.berry_sim.analysis.analyze_ab_test import (
+    _merge_moments,
+    stream_group_statistics,
+    welch_t_test,
+)
+
+
+@pytest.fixture
+def samples():
+    """Provides two groups of uneven size and spread."""
+    rng = np.random.default_rng(7)
+    return {
+        "Causal Agent": rng.normal(62.0, 9.0, size=23),
+        "Baseline Agent": rng.normal(55.0, 4.0, size=41),
+    }
+
+
+def summarize(values):
+    """Returns the (count, mean, sample variance) of a sample."""
+    return len(values), float(np.mean(values)), float(np.var(values, ddof=1))
+
+
+class TestStatistics:
+    """Tests for the moment merging and Welch's t-test helpers."""
+
+    def test_welch_t_test_matches_scipy(self, samples):
+        """Verify the test from summaries agrees with ttest_ind on raw samples."""
+        causal, baseline = samples["Causal Agent"], samples["Baseline Agent"]
+
+        means, t_stat, p_value = welch_t_test(
+            {group: summarize(values) for group, values in samples.items()}
+        )
+
+        expected = ttest_ind(causal, baseline, equal_var=False)
+        assert means == pytest.approx(
+            {"Causal Agent": causal.mean(), "Baseline Agent": baseline.mean()}
+        )
+        assert t_stat == pytest.approx(expected.statistic)
+        assert p_value == pytest.approx(expected.pvalue)
+
+    def test_welch_t_test_requires_two_groups(self, samples):
+        """Verify a missing half of the experiment is reported."""
+        with pytest.raises(ValueError, match="Expected 2 groups"):
+            welch_t_test({"Causal Agent": summarize(samples["Causal Agent"])})
+
+    def test_merge_moments_over_uneven_chunks(self, samples):
+        """Verify folding chunk moments reproduces the whole-sample variance."""
+        values = samples["Baseline Agent"]
+        chunks = np.split(values, [1, 8, 9, 30])
+        moments = [
+            (len(chunk), float(chunk.mean()), float(np.var(chunk) * len(chunk)))
+            for chunk in chunks
+        ]
+
+        n, mean, m2 = reduce(_merge_moments, moments)
+
+        assert n == len(values)
+        assert mean == pytest.approx(values.mean())
+        assert m2 / (n - 1) == pytest.approx(np.var(values, ddof=1))
+
+    def test_stream_group_statistics_folds_chunks(self, samples):
+        """Verify streamed chunks give each group's count, mean and variance."""
+        frame = pd.DataFrame(
+            [
+                {"agent_type": group, "final_avg_health": value}
+                for group, values in samples.items()
+                for value in values
+            ]
+        ).sample(frac=1.0, random_state=3)
+        frame.iloc[5, 1] = np.nan
+        chunks = [frame.iloc[i : i + 10] for i in range(0, len(frame), 10)]
+        dropped = frame.iloc[5, 0]
+
+        with patch(
+            "simulations.berry_sim.analysis.analyze_ab_test.pd.read_sql",
+            return_value=iter(chunks),
+        ):
+            stats = stream_group_statistics(MagicMock(), "exp", chunksize=10)
+
+        assert list(stats) == ["Causal Agent", "Baseline Agent"]
+        for group in samples:
+            kept = frame.loc[frame["agent_type"] == group, "final_avg_health"]
+            assert stats[group] == pytest.approx(summarize(kept.dropna().to_numpy()))
+        assert stats[dropped][0] == len(samples[dropped]) - 1
@@ -0,0 +1,103 @@
+# FILE: tests/simulations/berry_sim/test_causal_metrics_calculator.py
+"""
+Unit tests for the CausalMetricsCalculator of the berry_sim simulation.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from agent_core.agents.actions.base_action import ActionOutcome
+from agent_core.core.ecs.component import ActionPlanComponent, TimeBudgetComponent
+from agent_engine.simulation.simulation_state import SimulationState
+from simulations.berry_sim.actions import EatBerryAction
+from simulations.berry_sim.components import HealthComponent, PositionComponent
+from simulations.berry_sim.environment import BerryWorldEnvironment
+from simulations.berry_sim.metrics.causal_metrics_calculator import (
+    CausalMetricsCalculator,
+)
+
+
+@pytest.fixture
+def sim_state():
+    """Provides a SimulationState with a few agents of varying health."""
+    state = SimulationState(MagicMock(), "cpu")
+    inactive_time = TimeBudgetComponent(initial_time_budget=2000)
+    inactive_time.is_active = False
+    state.add_entities_bulk(
+        [
+            ("agent_0", [HealthComponent(80.0, 100.0), TimeBudgetComponent(2000)]),
+            ("agent_1", [HealthComponent(40.0, 100.0), TimeBudgetComponent(2000)]),
+            ("agent_2", [HealthComponent(10.0, 100.0), inactive_time]),
+            ("agent_3", [HealthComponent(99.0, 100.0)]),
+        ]
+    )
+    return state
+
+
+def eat_event(berry_type, reward, tick, entity_id="agent_0"):
+    """Builds an action_executed event for a successful berry meal."""
+    return {
+        "entity_id": entity_id,
+        "current_tick": tick,
+        "action_plan": ActionPlanComponent(
+            action_type=EatBerryAction(), params={"berry_type": berry_type}
+        ),
+        "action_outcome": ActionOutcome(True, "ate", reward, {}),
+    }
+
+
+class TestCausalMetricsCalculator:
+    """Tests for the CausalMetricsCalculator."""
+
+    def test_health_metrics_only_count_active_agents(self, sim_state):
+        """Verify inactive agents and agents without a time budget are excluded."""
+        metrics = CausalMetricsCalculator().calculate_metrics(sim_state)
+
+        assert metrics["active_agents"] == 2
+        assert metrics["average_agent_health"] == pytest.approx(60.0)
+
+    def test_health_metrics_with_no_agents(self):
+        """Verify an empty world reports zero health and no active agents."""
+        state = SimulationState(MagicMock(), "cpu")
+
+        metrics = CausalMetricsCalculator().calculate_metrics(state)
+
+        assert metrics["active_agents"] == 0
+        assert metrics["average_agent_health"] == 0
+
+    def test_scores_from_running_counts(self, sim_state):
+        """Verify CUS and CCI are computed from the counts across all agents."""
+        sim_state.environment = BerryWorldEnvironment(width=20, height=20)
+        sim_state.environment.water_locations.add((0, 0))
+        sim_state.add_component("agent_0", PositionComponent(x=10, y=10))
+        sim_state.add_component("agent_1", PositionComponent(x=1, y=0))
+        calculator = CausalMetricsCalculator()
+
+        calculator.update_with_event(eat_event("blue", 10.0, 1050), sim_state)
+        calculator.update_with_event(
+            eat_event("blue", -20.0, 1060, "agent_1"), sim_state
+        )
+        calculator.update_with_event(eat_event("blue", 10.0, 500), sim_state)
+        for i in range(12):
+            reward = 10.0 if i < 9 else -20.0
+            calculator.update_with_event(eat_event("yellow", reward, i), sim_state)
+
+        metrics = calculator.calculate_metrics(sim_state)
+
+        assert (calculator.novel_correct, calculator.novel_total) == (1, 2)
+        assert (calculator.yellow_correct, calculator.yellow_total) == (9, 12)
+        assert metrics["causal_understanding_score"] == pytest.approx(0.5)
+        assert metrics["correlation_confusion_index"] == pytest.approx(0.5)
+
+    def test_events_outside_cus_window_skip_component_lookups(self):
+        """Verify yellow meals and out-of-window blue meals never touch the state."""
+        sim_state = MagicMock()
+        calculator = CausalMetricsCalculator()
+
+        calculator.update_with_event(eat_event("yellow", 10.0, 1050), sim_state)
+        calculator.update_with_event(eat_event("blue", 10.0, 10), sim_state)
+        calculator.update_with_event(eat_event("red", 10.0, 1050), sim_state)
+
+        sim_state.get_component.assert_not_called()
+        assert calculator.yellow_total == 1
+        assert calculator.novel_total == 0
@@ -26,6 +26,17 @@ class TestPositionComponent:
         pos_comp_custom = PositionComponent(x=10, y=20)
         assert pos_comp_custom.position == (10, 20)
 
+    def test_coordinate_setters_update_position(self):
+        """Writing x or y keeps the cached position tuple in sync."""
+        pos_comp = PositionComponent(x=1, y=2)
+        pos_comp.x = 7
+        assert pos_comp.position == (7, 2)
+        pos_comp.y = 9
+        assert pos_comp.position == (7, 9)
+
+        pos_comp.position = (3, 4)
+        assert (pos_comp.x, pos_comp.y) == (3, 4)
+
     def test_to_dict_serialization(self):
         """Check if the component serializes to a dictionary correctly."""
         pos_comp = PositionComponent(x=5, y=15)
@@ -108,3 +119,15 @@ class TestStaticComponents:
         is_valid, errors = rock_comp.validate("rock_1")
         assert is_valid is True
         assert not errors
+
+    def test_marker_components_are_shared(self):
+        """Water and rock markers are stateless, so every tile shares one instance."""
+        assert WaterComponent() is WaterComponent()
+        assert RockComponent() is RockComponent()
+        assert WaterComponent() is not RockComponent()
+
+    def test_components_use_slots(self):
+        """Data components carry no per-instance __dict__."""
+        assert not hasattr(PositionComponent(x=1, y=2), "__dict__")
+        assert not hasattr(HealthComponent(50.0, 100.0), "__dict__")
+        assert not hasattr(BerryComponent("red"), "__dict__")
@@ -6,8 +6,11 @@ Ensures that the environment correctly manages its grid, agent positions,
 and the specific rules for berry toxicity and spawning contexts.
 """
 
+import random
+from unittest.mock import patch
+
 import pytest
-from simulations.berry_sim.environment import BerryWorldEnvironment
+from simulations.berry_sim.environment import BerryWorldEnvironment, VersionedSet
 
 
 @pytest.fixture
@@ -58,6 +61,288 @@ class TestBerryWorldEnvironment:
                 env.rock_locations.add((x, y))
         assert env.get_random_empty_cell() is None
 
+    def test_get_neighbors(self, env):
+        """Verify 8-neighbourhoods are clipped at the grid edges."""
+        assert len(env.get_neighbors((5, 5))) == 8
+        assert sorted(env.get_neighbors((0, 0))) == [(0, 1), (1, 0), (1, 1)]
+        assert len(env.get_neighbors((19, 10))) == 5
+
+        env.restore_from_dict(
+            {"width": 3, "height": 3, "water_locations": [], "rock_locations": []}
+        )
+        assert sorted(env.get_neighbors((2, 2))) == [(1, 1), (1, 2), (2, 1)]
+
+    def test_restore_keeps_terrain_versioned(self, env):
+        """Verify restored terrain still tracks changes for the cell caches."""
+        env.restore_from_dict(
+            {
+                "width": 6,
+                "height": 6,
+                "water_locations": [[0, 0]],
+                "rock_locations": [[5, 5]],
+            }
+        )
+        assert isinstance(env.water_locations, VersionedSet)
+        assert isinstance(env.rock_locations, VersionedSet)
+        assert env.water_locations == {(0, 0)}
+        assert (0, 2) not in env.cells_near(env.water_locations, 1)
+
+        env.water_locations.add((0, 3))
+
+        assert (0, 2) in env.cells_near(env.water_locations, 1)
+
+    def test_move_targets_are_clipped_at_the_grid_edges(self, env):
+        """Verify cached move targets follow MOVE_DIRECTIONS within bounds."""
+        assert env.move_targets((5, 5)) == (
+            ((5, 6), "N"),
+            ((5, 4), "S"),
+            ((6, 5), "E"),
+            ((4, 5), "W"),
+        )
+        assert env.move_targets((0, 19)) == (((0, 18), "S"), ((1, 19), "E"))
+        assert env.move_targets((-1, 0)) == (((0, 0), "E"),)
+
+        env.restore_from_dict(
+            {"width": 3, "height": 3, "water_locations": [], "rock_locations": []}
+        )
+        assert env.move_targets((2, 2)) == (((2, 1), "S"), ((1, 2), "W"))
+
+    def test_is_near_feature_tracks_feature_changes(self, env):
+        """The cached distance field must follow in-place edits of the feature set."""
+        assert not env.is_near_feature((3, 3), env.water_locations, 2)
+
+        env.water_locations.add((3, 5))
+        assert env.is_near_feature((3, 3), env.water_locations, 2)
+        assert not env.is_near_feature((3, 3), env.water_locations, 1)
+
+        env.water_locations.discard((3, 5))
+        env.water_locations.add((10, 10))
+        assert not env.is_near_feature((3, 3), env.water_locations, 2)
+        assert env.is_near_feature((11, 11), env.water_locations, 2)
+
+    def test_near_water_cells(self, env):
+        """The precomputed neighbourhood follows edits and reassignment of the set."""
+        env.water_locations.add((0, 0))
+        assert env.near_water_cells == {(0, 0), (1, 0), (2, 0), (0, 1), (1, 1), (0, 2)}
+
+        env.water_locations = {(10, 10)}
+        assert (0, 0) not in env.near_water_cells
+        assert (12, 10) in env.near_water_cells
+
+        env.rock_locations.update([(5, 5)])
+        assert (5, 7) in env.near_rock_cells
+
+    def test_get_random_empty_cell_tracks_occupancy(self, env):
+        """Only the single remaining free cell can be returned, and agents free theirs."""
+        for x in range(env.width):
+            for y in range(env.height):
+                if (x, y) not in ((0, 0), (1, 0)):
+                    env.rock_locations.add((x, y))
+        env.berry_locations[(1, 0)] = "red"
+
+        assert env.get_random_empty_cell() == (0, 0)
+
+        env.add_entity("agent_1", (0, 0))
+        assert env.get_random_empty_cell() is None
+
+        env.remove_entity("agent_1")
+        assert env.get_random_empty_cell() == (0, 0)
+
+    def test_get_random_empty_cell_near(self, env):
+        """Only free cells within the distance of a feature are drawn."""
+        env.water_locations.add((0, 0))
+        env.rock_locations.add((1, 0))
+        env.add_entity("agent_1", (0, 1))
+        env.berry_locations[(2, 0)] = "red"
+
+        drawn = {
+            env.get_random_empty_cell_near(env.water_locations, 2) for _ in range(50)
+        }
+
+        assert drawn == {(1, 1), (0, 2)}
+        assert env.get_random_empty_cell_near(env.rock_locations, 0) is None
+        assert env.get_random_empty_cell_near(set(), 2) is None
+
+    def test_feature_cells_follow_set_changes(self, env):
+        """The cached tuple is reused until the feature set is edited or replaced."""
+        env.rock_locations.update([(1, 1), (2, 2)])
+        cells = env.feature_cells(env.rock_locations)
+
+        assert cells == tuple(env.rock_locations)
+        assert env.feature_cells(env.rock_locations) is cells
+
+        env.rock_locations.add((3, 3))
+        assert sorted(env.feature_cells(env.rock_locations)) == [(1, 1), (2, 2), (3, 3)]
+
+        env.rock_locations = {(4, 4)}
+        assert env.feature_cells(env.rock_locations) == ((4, 4),)
+
+    def test_get_entities_in_radius_matches_brute_force(self, env):
+        """Both the diamond probe and the agent scan find exactly the agents in range."""
+        rng = random.Random(5)
+        cells = rng.sample(env.get_valid_positions(), 40)
+        for i, pos in enumerate(cells):
+            env.add_entity(f"agent_{i}", pos)
+
+        for center in [(0, 0), (10, 10), (19, 3), (25, 25)]:
+            for radius in [0, 1, 2, 6, 40]:
+                expected = {
+                    (entity_id, pos)
+                    for entity_id, pos in env.agent_positions.items()
+                    if env.distance(center, pos) <= radius
+                }
+                found = env.get_entities_in_radius(center, radius)
+                assert len(found) == len(expected)
+                assert set(found) == expected
+
+    def test_occupancy_grid_flags(self, env):
+        """Each kind of object sets its own bit in the packed occupancy grid."""
+        env.add_entity("agent_1", (1, 1))
+        env.water_locations.add((2, 2))
+        env.rock_locations.add((3, 3))
+        env.berry_locations[(1, 1)] = "red"
+
+        grid = env.occupancy_grid()
+
+        assert grid.shape == (env.width, env.height)
+        assert grid[1, 1] == env.AGENT_FLAG | env.BERRY_FLAG
+        assert grid[2, 2] == env.WATER_FLAG
+        assert grid[3, 3] == env.ROCK_FLAG
+        assert grid.sum() == 1 + 8 + 2 + 4
+
+    def test_berries_in_range(self, env):
+        """Test the berry range query against berry changes and reassignment."""
+        env.berry_locations[(3, 3)] = "red"
+        env.berry_locations[(9, 3)] = "blue"
+        env.berry_locations[(30, 30)] = "yellow"
+
+        found = {
+            pos: (kind, dist) for pos, kind, dist in env.berries_in_range((5, 3), 4)
+        }
+        assert found == {(3, 3): ("red", 2.0), (9, 3): ("blue", 4.0)}
+
+        env.berry_locations.pop((3, 3))
+        env.berry_locations[(6, 4)] = "yellow"
+        found = {pos for pos, _, _ in env.berries_in_range((5, 3), 4)}
+        assert found == {(6, 4), (9, 3)}
+
+        env.berry_locations = {(29, 31): "red"}
+        assert env.berries_in_range((30, 30), 2) == [((29, 31), "red", 2.0)]
+
+    def test_berry_columns_sorted_by_x(self, env):
+        """Test that the berry columns stay aligned and sorted by x."""
+        env.berry_locations = {(7, 1): "red", (2, 5): "blue", (4, 0): "yellow"}
+
+        xs, ys, types = env.berry_columns()
+        assert xs.tolist() == [2, 4, 7]
+        assert ys.tolist() == [5, 0, 1]
+        assert types == ["blue", "yellow", "red"]
+
+    def test_berry_columns_patched_incrementally(self, env):
+        """Test that eats and spawns patch the columns to match a full rebuild."""
+        rng = random.Random(3)
+        env.berry_locations = {(4, 4): "red"}
+        env.berry_columns()
+
+        with patch.object(
+            env, "_rebuild_berry_columns", wraps=env._rebuild_berry_columns
+        ) as rebuild:
+            for _ in range(200):
+                pos = (rng.randrange(20), rng.randrange(20))
+                if pos in env.berry_locations and rng.random() < 0.6:
+                    env.berry_locations.pop(pos)
+                else:
+                    env.berry_locations[pos] = rng.choice(["red", "blue", "yellow"])
+                xs, ys, types = env.berry_columns()
+
+                fresh = BerryWorldEnvironment(width=20, height=20)
+                fresh.berry_locations = dict(env.berry_locations)
+                expected_xs, expected_ys, expected_types = fresh.berry_columns()
+                assert xs.tolist() == expected_xs.tolist()
+                assert ys.tolist() == expected_ys.tolist()
+                assert types == expected_types
+
+        rebuild.assert_not_called()
+
+    def test_berry_columns_returned_earlier_are_not_modified(self, env):
+        """Test that patching replaces the columns instead of editing them."""
+        env.berry_locations = {(1, 1): "red", (2, 2): "blue"}
+        xs, ys, types = env.berry_columns()
+
+        del env.berry_locations[(1, 1)]
+        env.berry_locations[(3, 3)] = "yellow"
+        env.berry_columns()
+
+        assert xs.tolist() == [1, 2] and types == ["red", "blue"]
+        assert env.berry_columns()[2] == ["blue", "yellow"]
+
+    def test_nearest_berry(self, env):
+        """Test that the closest berry within the radius is returned."""
+        assert env.nearest_berry((5, 5), 7) is None
+
+        env.berry_locations = {(1, 1): "red", (6, 7): "blue", (20, 5): "red"}
+        assert env.nearest_berry((5, 5), 7) == (6, 7)
+        assert env.nearest_berry((5, 5), 2) is None
+        assert env.nearest_berry((18, 5), 7) == (20, 5)
+
+    def test_berry_id_is_interned_per_cell(self, env):
+        """Verify berry IDs keep their format and are built once per cell."""
+        first = env.berry_id((3, 7))
+
+        assert first == "berry_3_7"
+        assert env.berry_id((3, 7)) is first
+        assert env.berry_id((-1, 4)) == "berry_-1_4"
+
+    def test_berry_id_after_restore_with_new_size(self):
+        """Verify interned berry IDs follow the grid size after a restore."""
+        env = BerryWorldEnvironment(width=10, height=10)
+        env.berry_id((3, 1))
+
+        env.restore_from_dict(
+            {"width": 20, "height": 20, "water_locations": [], "rock_locations": []}
+        )
+
+        assert env.berry_id((13, 0)) == "berry_13_0"
+        assert env.berry_id((19, 19)) == "berry_19_19"
+
+    def test_nearest_berry_batch_matches_single_queries(self, env):
+        """Test the batched lookup agrees with nearest_berry, across chunks."""
+        rng = random.Random(5)
+        env.berry_locations = {
+            (rng.randrange(20), rng.randrange(20)): "red" for _ in range(30)
+        }
+        positions = [(x, y) for x in range(0, 20, 3) for y in range(0, 20, 2)]
+        env.BATCH_CELLS = 64
+
+        batch = env.nearest_berry_batch(positions, 3)
+
+        assert batch == [env.nearest_berry(pos, 3) for pos in positions]
+        assert any(hit is None for hit in batch)
+        assert env.nearest_berry_batch([], 3) == []
+        env.berry_locations = {}
+        assert env.nearest_berry_batch([(1, 1)], 3) == [None]
+
+    def test_berry_stamp_detects_additions(self, env):
+        """Test only_removed_since is True only when berries were just taken."""
+        env.berry_locations = {(1, 1): "red", (2, 2): "blue"}
+        stamp = env.berry_locations.stamp()
+
+        del env.berry_locations[(1, 1)]
+        assert env.berry_locations.only_removed_since(stamp)
+
+        env.berry_locations[(3, 3)] = "red"
+        assert not env.berry_locations.only_removed_since(stamp)
+
+    def test_berry_stamp_detects_additions_after_bulk_changes(self, env):
+        """Test a clear followed by an insert is not mistaken for removals."""
+        env.berry_locations = {(1, 1): "red", (2, 2): "blue", (3, 3): "red"}
+        stamp = env.berry_locations.stamp()
+
+        env.berry_locations.clear()
+        env.berry_locations[(4, 4)] = "blue"
+
+        assert not env.berry_locations.only_removed_since(stamp)
+
     def test_berry_toxicity_rules(self, env):
         """Verify the toxicity logic for all berry types and contexts."""
         water_pos = (10, 10)
@@ -0,0 +1,64 @@
+# FILE: tests/simulations/berry_sim/test_loader.py
+"""
+Unit tests for the scenario loader in the berry_sim simulation.
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from agent_engine.simulation.simulation_state import SimulationState
+from simulations.berry_sim.components import PositionComponent
+from simulations.berry_sim.environment import BerryWorldEnvironment
+from simulations.berry_sim.loader import BerryScenarioLoader
+
+
+@pytest.fixture
+def sim_state():
+    """Provides a SimulationState with a small, empty berry world."""
+    config = MagicMock()
+    config.agent.vitals.initial_health = 100.0
+    config.agent.get.return_value = 7
+    state = SimulationState(config, "cpu")
+    state.environment = BerryWorldEnvironment(width=6, height=5)
+    return state
+
+
+def write_scenario(tmp_path, **counts):
+    path = tmp_path / "scenario.json"
+    path.write_text(json.dumps(counts))
+    return str(path)
+
+
+class TestBerryScenarioLoader:
+    """Tests for the BerryScenarioLoader."""
+
+    def test_load_places_everything_on_distinct_cells(self, sim_state, tmp_path):
+        """Verify water, rocks and agents never share a cell."""
+        path = write_scenario(
+            tmp_path, num_water_sources=8, num_rock_formations=10, num_agents=12
+        )
+
+        BerryScenarioLoader(sim_state, path).load()
+
+        env = sim_state.environment
+        agent_cells = set(env.agent_positions.values())
+        assert len(env.water_locations) == 8
+        assert len(env.rock_locations) == 10
+        assert len(agent_cells) == 12
+        assert not env.water_locations & env.rock_locations
+        assert not (env.water_locations | env.rock_locations) & agent_cells
+        for agent_id, pos in env.agent_positions.items():
+            pos_comp = sim_state.get_component(agent_id, PositionComponent)
+            assert pos_comp.position == pos
+
+    def test_load_skips_agents_that_do_not_fit(self, sim_state, tmp_path):
+        """Verify agents beyond the grid capacity are created without a position."""
+        path = write_scenario(
+            tmp_path, num_water_sources=10, num_rock_formations=10, num_agents=15
+        )
+
+        BerryScenarioLoader(sim_state, path).load()
+
+        assert len(sim_state.environment.agent_positions) == 10
+        assert sim_state.entities["agent_14"] == {}
@@ -3,15 +3,33 @@
 Unit tests for the provider implementations in the berry_sim simulation.
 """
 
+import random
+import sys
+
 import pytest
 import numpy as np
-from unittest.mock import MagicMock
+import torch
+from unittest.mock import MagicMock, create_autospec, patch
 
-from agent_core.core.ecs.component import PerceptionComponent
+from agent_core.agents.actions.action_interface import ActionInterface
+from agent_core.core.ecs.component import (
+    ActionPlanComponent,
+    PerceptionComponent,
+    TimeBudgetComponent,
+)
+from agent_engine.simulation.simulation_state import SimulationState
+from agent_engine.systems.components import QLearningComponent
 from simulations.berry_sim.providers import (
+    ActionBundle,
+    BerryActionGenerator,
+    BerryComponentFactory,
+    BerryDecisionSelector,
     BerryPerceptionProvider,
     BerryStateEncoder,
+    BerryStateNodeEncoder,
+    QLearningDecisionSelector,
 )
+from simulations.berry_sim.actions import EatBerryAction, MoveAction
 from simulations.berry_sim.components import PositionComponent, HealthComponent
 from simulations.berry_sim.environment import BerryWorldEnvironment
 
@@ -50,6 +68,99 @@ class TestBerryPerceptionProvider:
         assert "berry_11_11" in perc_comp.visible_entities
         assert perc_comp.visible_entities["berry_11_11"]["berry_type"] == "red"
 
+    def test_update_perception_refreshes_entries_in_place(
+        self, mock_sim_state_providers
+    ):
+        """Verify berries still in view keep their entry and leaving ones are dropped."""
+        provider = BerryPerceptionProvider()
+        pos_comp = PositionComponent(x=10, y=10)
+        perc_comp = PerceptionComponent(vision_range=5)
+        components = {PositionComponent: pos_comp, PerceptionComponent: perc_comp}
+        env = mock_sim_state_providers.environment
+        env.berry_locations = {(11, 11): "red", (5, 10): "blue"}
+
+        provider.update_perception("agent_1", components, mock_sim_state_providers, 1)
+        red_entry = perc_comp.visible_entities["berry_11_11"]
+
+        pos_comp.x = 11
+        provider.update_perception("agent_1", components, mock_sim_state_providers, 2)
+
+        assert set(perc_comp.visible_entities) == {"berry_11_11"}
+        assert perc_comp.visible_entities["berry_11_11"] is red_entry
+        assert red_entry["distance"] == 1.0
+
+    @pytest.mark.parametrize("batch_cells", [None, 4])
+    def test_update_perception_batch_matches_per_agent_update(
+        self, mock_sim_state_providers, batch_cells
+    ):
+        """Verify the batched pass produces the same views as per-agent updates."""
+        provider = BerryPerceptionProvider()
+        env = mock_sim_state_providers.environment
+        if batch_cells is not None:
+            # One agent row per chunk, so the chunk boundaries are exercised
+            env.BATCH_CELLS = batch_cells
+        env.berry_locations = {
+            (11, 11): "red",
+            (5, 10): "blue",
+            (30, 30): "yellow",
+            (0, 0): "red",
+        }
+        batch, single = {}, {}
+        for i, (x, y, vision) in enumerate([(10, 10, 5), (28, 29, 3), (49, 49, 2)]):
+            for entities in (batch, single):
+                entities[f"agent_{i}"] = {
+                    PositionComponent: PositionComponent(x=x, y=y),
+                    PerceptionComponent: PerceptionComponent(vision_range=vision),
+                }
+
+        provider.update_perception_batch(batch, mock_sim_state_providers, 1)
+        for entity_id, components in single.items():
+            provider.update_perception(
+                entity_id, components, mock_sim_state_providers, 1
+            )
+
+        for entity_id in batch:
+            assert (
+                batch[entity_id][PerceptionComponent].visible_entities
+                == single[entity_id][PerceptionComponent].visible_entities
+            )
+        assert set(batch["agent_0"][PerceptionComponent].visible_entities) == {
+            "berry_11_11",
+            "berry_5_10",
+        }
+        assert batch["agent_2"][PerceptionComponent].visible_entities == {}
+
+
+class TestBerryStateNodeEncoder:
+    """Tests for the BerryStateNodeEncoder."""
+
+    def test_nodes_follow_context_and_are_reused(self, mock_sim_state_providers):
+        """Verify nodes reflect health and terrain, and equal nodes are shared."""
+        encoder = BerryStateNodeEncoder(mock_sim_state_providers)
+        env = mock_sim_state_providers.environment
+        env.water_locations.add((10, 12))
+        components = {
+            PositionComponent: PositionComponent(x=10, y=10),
+            HealthComponent: HealthComponent(current_health=50, initial_health=100),
+        }
+
+        node = encoder.encode_state_for_causal_graph("agent_1", components, 1, None)
+        again = encoder.encode_state_for_causal_graph("agent_2", components, 1, None)
+
+        assert node == ("STATE", "health_hurt", "near_water_True", "near_rocks_False")
+        assert again is node
+        assert node[1] is sys.intern("health_hurt")
+
+        env.water_locations.clear()
+        env.rock_locations.add((9, 9))
+        node = encoder.encode_state_for_causal_graph("agent_1", components, 2, None)
+        assert node == ("STATE", "health_hurt", "near_water_False", "near_rocks_True")
+        assert encoder.encode_state_for_causal_graph("agent_1", {}, 2, None) == (
+            "STATE",
+            "unknown",
+            "unknown",
+        )
+
 
 class TestBerryStateEncoder:
     """Tests for the BerryStateEncoder."""
@@ -100,3 +211,390 @@ class TestBerryStateEncoder:
         assert np.isclose(vector[2], 0.8)  # Health
         # Check perception values for red berry
         assert np.isclose(vector[3], 0.4)  # Red berry distance
+
+    def test_encode_states_matches_encode_state(self, mock_sim_state_providers):
+        """Verify batched and component-dict encodings equal the single-agent one."""
+        encoder = BerryStateEncoder(mock_sim_state_providers)
+        seeing = PerceptionComponent(vision_range=10)
+        seeing.visible_entities["berry_27_12"] = {
+            "type": "berry",
+            "berry_type": "red",
+            "position": (27, 12),
+            "distance": 4,
+        }
+        seeing.visible_entities["berry_20_10"] = {
+            "type": "berry",
+            "berry_type": "yellow",
+            "position": (20, 10),
+            "distance": 5,
+        }
+        components = {
+            "agent_1": {
+                PositionComponent: PositionComponent(x=25, y=10),
+                HealthComponent: HealthComponent(current_health=80, initial_health=100),
+                PerceptionComponent: seeing,
+            },
+            "agent_2": {
+                PositionComponent: PositionComponent(x=3, y=40),
+                PerceptionComponent: PerceptionComponent(vision_range=5),
+            },
+            "agent_3": {},
+            "agent_4": {PositionComponent: PositionComponent(x=49, y=0)},
+        }
+
+        def get_component_side_effect(eid, comp_type):
+            return components[eid].get(comp_type)
+
+        mock_sim_state_providers.get_component = get_component_side_effect
+        mock_sim_state_providers.config.environment.get.return_value = {
+            "width": 50,
+            "height": 50,
+        }
+        config = mock_sim_state_providers.config
+        agent_ids = ["agent_1", "agent_2", "agent_3", "agent_4"]
+
+        batch = encoder.encode_states(mock_sim_state_providers, agent_ids, config)
+
+        assert batch.shape == (4, 9)
+        assert batch.dtype == np.float32
+        for row, agent_id in enumerate(agent_ids):
+            expected = encoder.encode_state(mock_sim_state_providers, agent_id, config)
+            np.testing.assert_allclose(batch[row], expected, rtol=1e-6)
+            np.testing.assert_array_equal(
+                encoder.encode_components(components[agent_id], config), expected
+            )
+
+    def test_grid_size_is_resolved_once_per_config(self, mock_sim_state_providers):
+        """Verify the grid size is read from a config only on first use."""
+        encoder = BerryStateEncoder(mock_sim_state_providers)
+        components = {PositionComponent: PositionComponent(x=10, y=5)}
+        config = MagicMock()
+        config.environment.get.return_value = {"width": 20, "height": 10}
+
+        first = encoder.encode_components(components, config)
+        second = encoder.encode_components(components, config)
+
+        config.environment.get.assert_called_once()
+        np.testing.assert_array_equal(first, second)
+        assert np.isclose(first[0], 0.5) and np.isclose(first[1], 0.5)
+
+        other = MagicMock()
+        other.environment.get.return_value = {"width": 40, "height": 40}
+        assert np.isclose(encoder.encode_components(components, other)[0], 0.25)
+
+
+class TestBerryActionGenerator:
+    """Tests for the BerryActionGenerator."""
+
+    def test_generate_recycles_all_but_the_chosen_plan(self):
+        """Verify unchosen plans are reused next turn and the stored one never is."""
+        sim_state = SimulationState(MagicMock(), "cpu")
+        sim_state.environment = BerryWorldEnvironment(width=10, height=10)
+        sim_state.add_entity("agent_1")
+        sim_state.add_component("agent_1", PositionComponent(x=5, y=5))
+        generator = BerryActionGenerator()
+
+        first = generator.generate(sim_state, "agent_1", 1)
+        chosen = first.move[0]
+        chosen_params = chosen.params
+        sim_state.add_component("agent_1", chosen)
+        second = generator.generate(sim_state, "agent_1", 2)
+
+        assert len(second.move) == 4
+        assert chosen not in second
+        assert set(map(id, second)) & set(map(id, first)) == set(map(id, first[1:]))
+        assert chosen.params is chosen_params
+        assert all(plan.action_type is generator.move_action for plan in second)
+
+    def test_generate_drops_bundles_of_inactive_agents(self):
+        """Verify bundles of agents that stopped taking turns are released."""
+        sim_state = SimulationState(MagicMock(), "cpu")
+        sim_state.environment = BerryWorldEnvironment(width=10, height=10)
+        for entity_id, x in (("agent_1", 2), ("agent_2", 7)):
+            sim_state.add_entity(entity_id)
+            sim_state.add_component(entity_id, PositionComponent(x=x, y=5))
+            sim_state.add_component(entity_id, TimeBudgetComponent(100))
+        generator = BerryActionGenerator()
+        generator.generate(sim_state, "agent_1", 1)
+        dead_bundle = generator.generate(sim_state, "agent_2", 1)
+        chosen = dead_bundle.move[0]
+        sim_state.add_component("agent_2", chosen)
+        sim_state.get_component("agent_2", TimeBudgetComponent).is_active = False
+
+        bundle = generator.generate(sim_state, "agent_1", 2)
+
+        recycled = set(map(id, generator._pool)) | set(map(id, bundle))
+        assert list(generator._issued) == ["agent_1"]
+        assert id(chosen) not in recycled
+        assert {id(plan) for plan in dead_bundle[1:]} <= recycled
+
+    def test_generate_looks_the_position_up_once(self):
+        """Verify move and eat params are built from a single position lookup."""
+        sim_state = SimulationState(MagicMock(), "cpu")
+        sim_state.environment = BerryWorldEnvironment(width=10, height=10)
+        sim_state.environment.berry_locations = {(0, 0): "red"}
+        sim_state.add_entity("agent_1")
+        sim_state.add_component("agent_1", PositionComponent(x=0, y=0))
+
+        with patch.object(
+            sim_state, "get_component", wraps=sim_state.get_component
+        ) as get_component:
+            bundle = BerryActionGenerator().generate(sim_state, "agent_1", 1)
+
+        get_component.assert_called_once_with("agent_1", PositionComponent)
+        assert {plan.params["target_pos"] for plan in bundle.move} == {(1, 0), (0, 1)}
+        assert [plan.params for plan in bundle.eat] == [{"berry_type": "red"}]
+
+    def test_generate_without_position_offers_nothing(self):
+        """Verify an agent off the grid gets an empty bundle."""
+        sim_state = SimulationState(MagicMock(), "cpu")
+        sim_state.environment = BerryWorldEnvironment(width=10, height=10)
+        sim_state.add_entity("agent_1")
+
+        bundle = BerryActionGenerator().generate(sim_state, "agent_1", 1)
+
+        assert list(bundle) == [] and bundle.move == [] and bundle.eat == []
+
+
+class TestBerryDecisionSelector:
+    """Tests for the BerryDecisionSelector."""
+
+    def test_select_reads_partitioned_bundle(self):
+        """Verify the selector takes eat plans straight from an ActionBundle."""
+        move = ActionPlanComponent(action_type=MagicMock(), params={})
+        eat = ActionPlanComponent(action_type=MagicMock(), params={})
+        bundle = ActionBundle(move=[move], eat=[eat])
+
+        assert list(bundle) == [move, eat]
+
+        selector = BerryDecisionSelector(MagicMock(), MagicMock())
+        with patch.object(selector, "_uniform", return_value=0.0):
+            assert selector.select(MagicMock(), "agent_1", bundle) is eat
+
+    def test_select_partitions_flat_action_list(self):
+        """Verify a plain list yields its eat plan first and its moves only after."""
+        move = ActionPlanComponent(action_type=MoveAction(), params={})
+        other = ActionPlanComponent(action_type=MagicMock(), params={})
+        eat = ActionPlanComponent(action_type=EatBerryAction(), params={})
+        sim_state = MagicMock()
+        sim_state.get_component.return_value = None
+
+        selector = BerryDecisionSelector(MagicMock(), MagicMock())
+        with patch.object(selector, "_uniform", return_value=0.0):
+            assert selector.select(sim_state, "agent_1", [move, other, eat]) is eat
+        sim_state.get_component.assert_not_called()
+        with patch.object(selector, "_uniform", return_value=0.99):
+            assert selector.select(sim_state, "agent_1", [move, other, eat]) is move
+            assert selector.select(sim_state, "agent_1", [other, move]) is move
+
+    def test_draws_are_pooled_and_reproducible(self):
+        """Verify draws come from a per-tick pool seeded from the random module."""
+        plans = [
+            ActionPlanComponent(action_type=MoveAction(), params={}) for _ in range(4)
+        ]
+        picks = []
+        for _ in range(2):
+            random.seed(11)
+            selector = BerryDecisionSelector(MagicMock(), MagicMock())
+            selector.prepare_turns(MagicMock(), ["agent_1", "agent_2"], 1)
+            assert len(selector._draws) == 4
+            picks.append(
+                [
+                    plans.index(selector.select(MagicMock(), "a", plans))
+                    for _ in range(6)
+                ]
+            )
+
+        assert picks[0] == picks[1]
+        assert len(set(picks[0])) > 1
+
+    def test_select_moves_towards_nearest_berry(self):
+        """Verify the chosen move is the one that closes in on the nearest berry."""
+        sim_state = SimulationState(MagicMock(), "cpu")
+        sim_state.environment = BerryWorldEnvironment(width=20, height=20)
+        sim_state.environment.berry_locations = {(8, 3): "red", (1, 15): "blue"}
+        sim_state.add_entity("agent_1")
+        sim_state.add_component("agent_1", PositionComponent(x=5, y=5))
+        bundle = BerryActionGenerator().generate(sim_state, "agent_1", 1)
+
+        selector = BerryDecisionSelector(sim_state, MagicMock())
+        chosen = selector.select(sim_state, "agent_1", bundle)
+
+        assert chosen.params["target_pos"] in {(6, 5), (5, 4)}
+
+    def test_prepared_targets_are_reused_until_invalidated(self):
+        """Verify turn-start targets are used unless a berry appears or is eaten."""
+        sim_state = SimulationState(MagicMock(), "cpu")
+        env = BerryWorldEnvironment(width=20, height=20)
+        env.berry_locations = {(8, 5): "red", (1, 15): "blue"}
+        sim_state.environment = env
+        for entity_id, (x, y) in {"agent_1": (5, 5), "agent_2": (2, 14)}.items():
+            sim_state.add_entity(entity_id)
+            sim_state.add_component(entity_id, PositionComponent(x=x, y=y))
+        generator = BerryActionGenerator()
+        selector = BerryDecisionSelector(sim_state, MagicMock())
+
+        selector.prepare_turns(sim_state, ["agent_1", "agent_2"], 1)
+        del env.berry_locations[(1, 15)]
+        with patch.object(env, "nearest_berry", wraps=env.nearest_berry) as lookup:
+            bundle = generator.generate(sim_state, "agent_1", 1)
+            chosen = selector.select(sim_state, "agent_1", bundle)
+            assert chosen.params["target_pos"] == (6, 5)
+            lookup.assert_not_called()
+
+            bundle = generator.generate(sim_state, "agent_2", 1)
+            selector.select(sim_state, "agent_2", bundle)
+            lookup.assert_called_once_with((2, 14), 7)
+
+        selector.prepare_turns(sim_state, ["agent_1"], 2)
+        env.berry_locations[(5, 6)] = "red"
+        with patch.object(env, "nearest_berry", wraps=env.nearest_berry) as lookup:
+            bundle = generator.generate(sim_state, "agent_1", 2)
+            chosen = selector.select(sim_state, "agent_1", bundle)
+            assert chosen.params["target_pos"] == (5, 6)
+            lookup.assert_called_once()
+
+
+class TestQLearningDecisionSelector:
+    """Tests for the QLearningDecisionSelector."""
+
+    def test_select_scores_all_actions_in_one_pass(self):
+        """Verify the highest-valued action is chosen with a single network call."""
+        config = MagicMock()
+        config.learning.q_learning.get.return_value = 0.0  # Never explore
+        selector = QLearningDecisionSelector(MagicMock(), config)
+        selector.state_encoder = MagicMock()
+        selector.state_encoder.encode_components.return_value = np.zeros(9)
+        selector.state_encoder.encode_internal_state.return_value = np.zeros(1)
+
+        q_comp = MagicMock()
+        q_comp.utility_network.side_effect = lambda state, internal, action: (
+            action.sum(dim=-1, keepdim=True)
+        )
+        sim_state = MagicMock()
+        sim_state.entities.get.return_value = {QLearningComponent: q_comp}
+
+        plans = []
+        for value in (0.2, 0.9, 0.5):
+            action_type = create_autospec(ActionInterface, instance=True)
+            action_type.get_feature_vector.return_value = [value, 0.0, 0.0, 0.0]
+            plans.append(ActionPlanComponent(action_type=action_type, params={}))
+
+        chosen = selector.select(sim_state, "agent_1", plans)
+
+        assert chosen is plans[1]
+        q_comp.utility_network.assert_called_once()
+        state_arg, internal_arg, action_arg = q_comp.utility_network.call_args[0]
+        assert state_arg.shape == (3, 9)
+        assert internal_arg.shape == (3, 1)
+        assert action_arg.shape == (3, 4)
+
+    def test_select_reuses_input_buffers_across_calls(self):
+        """Verify later turns write into the same tensor storage as earlier ones."""
+        config = MagicMock()
+        config.learning.q_learning.get.return_value = 0.0  # Never explore
+        selector = QLearningDecisionSelector(MagicMock(), config)
+        selector.state_encoder = MagicMock()
+        selector.state_encoder.encode_internal_state.return_value = np.zeros(1)
+
+        seen = []
+        q_comp = MagicMock()
+
+        def network(state, internal, action):
+            seen.append((state.data_ptr(), action.data_ptr(), state[0].tolist()))
+            return action.sum(dim=-1, keepdim=True)
+
+        q_comp.utility_network.side_effect = network
+        sim_state = MagicMock()
+        sim_state.entities.get.return_value = {QLearningComponent: q_comp}
+
+        def make_plans(values):
+            plans = []
+            for value in values:
+                action_type = create_autospec(ActionInterface, instance=True)
+                action_type.get_feature_vector.return_value = [value, 0.0]
+                plans.append(ActionPlanComponent(action_type=action_type, params={}))
+            return plans
+
+        selector.state_encoder.encode_components.return_value = np.full(3, 1.0)
+        first = make_plans((0.1, 0.7, 0.3))
+        assert selector.select(sim_state, "agent_1", first) is first[1]
+        selector.state_encoder.encode_components.return_value = np.full(3, 2.0)
+        second = make_plans((0.8, 0.2))
+        assert selector.select(sim_state, "agent_1", second) is second[0]
+
+        assert seen[0][:2] == seen[1][:2]
+        assert seen[1][2] == [2.0, 2.0, 2.0]
+
+    def test_quantized_inference_keeps_action_ranking(self):
+        """Verify the int8 snapshot picks a near-best action and is refreshed."""
+        torch.manual_seed(0)
+        rng = np.random.default_rng(0)
+        config = MagicMock()
+        config.learning.q_learning = {
+            "initial_epsilon": 0.0,
+            "quantize_inference": True,
+            "quantized_refresh_ticks": 10,
+        }
+        selector = QLearningDecisionSelector(MagicMock(), config)
+        selector.state_encoder = MagicMock()
+        q_comp = QLearningComponent(9, 1, 4, 0.1, torch.device("cpu"))
+        sim_state = MagicMock()
+        sim_state.entities.get.return_value = {QLearningComponent: q_comp}
+
+        for tick in range(5):
+            sim_state.current_tick = tick
+            state = rng.random(9, dtype=np.float32)
+            internal = rng.random(1, dtype=np.float32)
+            features = rng.random((6, 4), dtype=np.float32)
+            selector.state_encoder.encode_components.return_value = state
+            selector.state_encoder.encode_internal_state.return_value = internal
+            plans = []
+            for row in features:
+                action_type = create_autospec(ActionInterface, instance=True)
+                action_type.get_feature_vector.return_value = row.tolist()
+                plans.append(ActionPlanComponent(action_type=action_type, params={}))
+
+            chosen = selector.select(sim_state, "agent_1", plans)
+
+            with torch.no_grad():
+                fp32_q = q_comp.utility_network(
+                    torch.from_numpy(np.tile(state, (6, 1))),
+                    torch.from_numpy(np.tile(internal, (6, 1))),
+                    torch.from_numpy(features),
+                ).view(-1)
+            assert fp32_q[plans.index(chosen)] >= fp32_q.max() - 0.01
+
+        snapshot_tick, snapshot = selector._quantized[q_comp.utility_network]
+        assert snapshot_tick == 0
+        assert snapshot is not q_comp.utility_network
+
+        sim_state.current_tick = 10
+        selector.select(sim_state, "agent_1", plans)
+        assert selector._quantized[q_comp.utility_network][0] == 10
+
+
+class TestBerryComponentFactory:
+    """Tests for the BerryComponentFactory."""
+
+    def test_create_component_by_full_and_short_name(self):
+        """Verify components resolve from snapshot paths and bare class names."""
+        factory = BerryComponentFactory()
+
+        full = factory.create_component(
+            "simulations.berry_sim.components.PositionComponent", {"x": 3, "y": 4}
+        )
+        short = factory.create_component(
+            "HealthComponent", {"current_health": 40.0, "initial_health": 50.0}
+        )
+        moved = factory.create_component(
+            "legacy.module.PositionComponent", {"x": 1, "y": 2}
+        )
+
+        assert isinstance(full, PositionComponent) and full.position == (3, 4)
+        assert isinstance(short, HealthComponent)
+        assert isinstance(moved, PositionComponent) and moved.position == (1, 2)
+        assert "legacy.module.PositionComponent" in factory._name_cache
+        with pytest.raises(TypeError):
+            factory.create_component("UnknownComponent", {})
+        assert "UnknownComponent" not in factory._name_cache
@@ -0,0 +1,180 @@
+# FILE: tests/simulations/berry_sim/test_renderer.py
+"""
+Unit tests for the BerryRenderer of the berry_sim simulation.
+"""
+
+import threading
+
+import imageio
+import numpy as np
+import pytest
+from agent_engine.simulation.simulation_state import SimulationState
+from unittest.mock import MagicMock, patch
+from simulations.berry_sim.components import HealthComponent, PositionComponent
+from simulations.berry_sim.environment import BerryWorldEnvironment
+from simulations.berry_sim.renderer import BerryRenderer
+
+
+@pytest.fixture
+def sim_state():
+    """Provides a small world with terrain, berries and two agents."""
+    state = SimulationState(MagicMock(), "cpu")
+    env = BerryWorldEnvironment(width=6, height=4)
+    env.water_locations = {(0, 0), (1, 0)}
+    env.rock_locations = {(5, 3)}
+    env.berry_locations = {(2, 1): "red", (3, 1): "blue", (4, 2): "purple"}
+    state.environment = env
+    state.add_entities_bulk(
+        [
+            ("agent_1", [PositionComponent(x=1, y=0), HealthComponent(90.0, 100.0)]),
+            ("agent_2", [PositionComponent(x=3, y=3), HealthComponent(10.0, 100.0)]),
+            ("agent_3", [PositionComponent(x=9, y=9), HealthComponent(90.0, 100.0)]),
+        ]
+    )
+    return state
+
+
+class TestBerryRenderer:
+    """Tests for the BerryRenderer."""
+
+    def test_draw_frame_paints_every_layer(self, sim_state, tmp_path):
+        """Verify layer colors, their stacking order and off-grid positions."""
+        renderer = BerryRenderer(6, 4, str(tmp_path))
+        colors = renderer.colors
+
+        frame = renderer.draw_frame(sim_state)
+
+        assert frame.shape == (4, 6, 3)
+        assert frame.dtype == np.uint8
+        assert frame[0, 0].tolist() == colors["water"]
+        assert frame[0, 1].tolist() == colors["agent"]  # Agent drawn over water
+        assert frame[3, 5].tolist() == colors["rock"]
+        assert frame[1, 2].tolist() == colors["red_berry"]
+        assert frame[1, 3].tolist() == colors["blue_berry"]
+        assert frame[2, 4].tolist() == colors["empty"]  # Unknown berry type
+        assert frame[3, 3].tolist() == colors["low_health"]
+        assert frame[2, 0].tolist() == colors["empty"]
+
+    def test_draw_frame_skips_agents_without_health(self, sim_state, tmp_path):
+        """Verify only entities with both a position and health are drawn."""
+        sim_state.add_entity("marker")
+        sim_state.add_component("marker", PositionComponent(x=0, y=2))
+
+        renderer = BerryRenderer(6, 4, str(tmp_path))
+
+        frame = renderer.draw_frame(sim_state)
+
+        assert frame[2, 0].tolist() == renderer.colors["empty"]
+
+    def test_draw_frame_colors_berry_types_first_seen_later(self, sim_state, tmp_path):
+        """Verify the berry palette grows when a new berry type appears."""
+        renderer = BerryRenderer(6, 4, str(tmp_path))
+        renderer.draw_frame(sim_state)
+        sim_state.environment.berry_locations[(0, 3)] = "yellow"
+
+        frame = renderer.draw_frame(sim_state)
+
+        assert frame[3, 0].tolist() == renderer.colors["yellow_berry"]
+        assert frame[1, 2].tolist() == renderer.colors["red_berry"]
+        assert frame[1, 3].tolist() == renderer.colors["blue_berry"]
+
+    def test_draw_frame_scales_cells_to_blocks(self, sim_state, tmp_path):
+        """Verify each cell becomes a pixel_scale x pixel_scale block."""
+        small = BerryRenderer(6, 4, str(tmp_path)).draw_frame(sim_state).copy()
+
+        frame = BerryRenderer(6, 4, str(tmp_path), pixel_scale=3).draw_frame(sim_state)
+
+        assert frame.shape == (12, 18, 3)
+        np.testing.assert_array_equal(frame[::3, ::3], small)
+        np.testing.assert_array_equal(
+            frame[3:6, 6:9], np.broadcast_to(small[1, 2], (3, 3, 3))
+        )
+
+    def test_draw_frame_reuses_its_buffer(self, sim_state, tmp_path):
+        """Verify frames are redrawn into the same buffer without leftovers."""
+        renderer = BerryRenderer(6, 4, str(tmp_path), pixel_scale=2)
+        first = renderer.draw_frame(sim_state)
+        sim_state.environment.berry_locations.pop((2, 1))
+
+        second = renderer.draw_frame(sim_state)
+
+        assert second is first
+        assert second[2:4, 4:6].tolist() == [[renderer.colors["empty"]] * 2] * 2
+
+    def test_render_frame_writes_png(self, sim_state, tmp_path):
+        """Verify a frame file is written for the tick."""
+        renderer = BerryRenderer(6, 4, str(tmp_path))
+        renderer.render_frame(sim_state, tick=7)
+        renderer.flush()
+
+        assert (tmp_path / "frame_0007.png").exists()
+
+    def test_render_frame_writes_in_background_with_backpressure(
+        self, sim_state, tmp_path
+    ):
+        """Verify frames are encoded off-thread and the queue stays bounded."""
+        renderer = BerryRenderer(6, 4, str(tmp_path))
+        expected = renderer.draw_frame(sim_state).copy()
+
+        for tick in range(10):
+            renderer.render_frame(sim_state, tick)
+            assert len(renderer._pending) <= renderer.MAX_PENDING_WRITES
+        renderer.draw_frame(MagicMock())  # Overwrites the shared buffer
+        renderer.flush()
+
+        assert not renderer._pending
+        for tick in range(10):
+            written = imageio.imread(tmp_path / f"frame_{tick:04d}.png")
+            np.testing.assert_array_equal(written, expected)
+
+    def test_render_frame_drops_frames_while_writers_are_behind(
+        self, sim_state, tmp_path
+    ):
+        """Verify late frames are skipped instead of blocking the tick."""
+        renderer = BerryRenderer(6, 4, str(tmp_path), drop_late_frames=True)
+        release = threading.Event()
+        write = imageio.imwrite
+
+        def stalled_write(path, grid):
+            release.wait()
+            write(path, grid)
+
+        with patch("simulations.berry_sim.renderer.imageio.imwrite", stalled_write):
+            queued = [renderer.render_frame(sim_state, tick) for tick in range(6)]
+            release.set()
+            renderer.flush()
+            assert renderer.render_frame(sim_state, tick=6)
+            renderer.flush()
+
+        max_pending = renderer.MAX_PENDING_WRITES
+        assert queued == [True] * max_pending + [False] * (6 - max_pending)
+        assert not (tmp_path / f"frame_{max_pending:04d}.png").exists()
+        assert (tmp_path / "frame_0006.png").exists()
+
+    def test_close_writes_pending_frames_and_stops_writers(self, sim_state, tmp_path):
+        """Verify close drains the queue and shuts the writer pool down."""
+        renderer = BerryRenderer(6, 4, str(tmp_path))
+        for tick in range(3):
+            renderer.render_frame(sim_state, tick)
+
+        renderer.close()
+
+        assert not renderer._pending
+        assert len(list(tmp_path.glob("frame_*.png"))) == 3
+        with pytest.raises(RuntimeError):
+            renderer._io_pool.submit(print)
+
+    def test_close_reraises_failed_writes(self, sim_state, tmp_path):
+        """Verify a write error from the last frames is not lost on close."""
+        renderer = BerryRenderer(6, 4, str(tmp_path))
+
+        with patch(
+            "simulations.berry_sim.renderer.imageio.imwrite",
+            side_effect=OSError("disk full"),
+        ):
+            renderer.render_frame(sim_state, tick=0)
+            with pytest.raises(OSError, match="disk full"):
+                renderer.close()
+
+        with pytest.raises(RuntimeError):
+            renderer._io_pool.submit(print)
@@ -3,12 +3,18 @@
 Unit tests for the systems in the berry_sim simulation.
 """
 
+import random
+
+import numpy as np
 import pytest
 from unittest.mock import MagicMock, patch
 from agent_core.core.ecs.component import TimeBudgetComponent
+from agent_core.core.ecs.event_bus import EventBus
+from omegaconf import OmegaConf
 from simulations.berry_sim.systems import (
     BerrySpawningSystem,
     ConsumptionSystem,
+    RenderingSystem,
     VitalsSystem,
 )
 from simulations.berry_sim.components import HealthComponent, PositionComponent
@@ -29,18 +35,24 @@ def mock_sim_state_systems():
     return state
 
 
+def spawn_rng(rolls):
+    """A generator whose spawn rolls are fixed and whose offsets are seeded."""
+    rng = MagicMock(wraps=np.random.default_rng(0))
+    rng.random.return_value = np.array(rolls)
+    return rng
+
+
 class TestBerrySpawningSystem:
     """Tests for the BerrySpawningSystem."""
 
     @pytest.mark.asyncio
-    @patch("random.random")
-    async def test_update_spawns_berries(self, mock_random, mock_sim_state_systems):
+    async def test_update_spawns_berries(self, mock_sim_state_systems):
         """Verify berries are spawned when the random check passes."""
         system = BerrySpawningSystem(
             mock_sim_state_systems, mock_sim_state_systems.config, MagicMock()
         )
 
-        mock_random.return_value = 0.01  # This will pass the < 0.1 check
+        system._rng = spawn_rng([0.01, 0.01, 0.01])  # All pass the < 0.1 check
         mock_sim_state_systems.environment.rock_locations.add((5, 5))
 
         await system.update(current_tick=500)
@@ -50,6 +62,62 @@ class TestBerrySpawningSystem:
         assert "blue" in berry_types
         assert "yellow" in berry_types
 
+    @pytest.mark.asyncio
+    async def test_spawns_are_reproducible_from_the_random_seed(
+        self, mock_sim_state_systems
+    ):
+        """Verify seeding the random module fixes the spawn generator's draws."""
+        runs = []
+        for _ in range(2):
+            random.seed(3)
+            env = BerryWorldEnvironment(width=10, height=10)
+            env.rock_locations.update([(2, 2), (7, 7)])
+            mock_sim_state_systems.environment = env
+            system = BerrySpawningSystem(
+                mock_sim_state_systems, mock_sim_state_systems.config, MagicMock()
+            )
+            for tick in range(30):
+                await system.update(current_tick=tick)
+            runs.append(dict(env.berry_locations))
+
+        assert runs[0] == runs[1]
+        assert runs[0]
+
+    @pytest.mark.asyncio
+    async def test_phase1_spawns_blue_berries_away_from_water(
+        self, mock_sim_state_systems
+    ):
+        """Verify learning-phase blue berries land more than three cells from water."""
+        system = BerrySpawningSystem(
+            mock_sim_state_systems, mock_sim_state_systems.config, MagicMock()
+        )
+        env = mock_sim_state_systems.environment
+        env.water_locations.add((2, 2))
+        system._rng = spawn_rng([0.5, 0.01, 0.5])  # Only blue passes
+
+        for tick in range(20):
+            await system.update(current_tick=tick)
+
+        assert set(env.berry_locations.values()) == {"blue"}
+        for pos in env.berry_locations:
+            assert not env.is_near_feature(pos, env.water_locations, 3)
+
+    @pytest.mark.asyncio
+    async def test_phase2_spawns_blue_berries_near_water(self, mock_sim_state_systems):
+        """Verify novel-context blue berries land within two cells of water."""
+        system = BerrySpawningSystem(
+            mock_sim_state_systems, mock_sim_state_systems.config, MagicMock()
+        )
+        env = mock_sim_state_systems.environment
+        env.water_locations.add((9, 9))
+        system._rng = spawn_rng([0.5, 0.01, 0.5])  # Only blue passes
+
+        await system.update(current_tick=1050)
+
+        [(pos, berry_type)] = env.berry_locations.items()
+        assert berry_type == "blue"
+        assert env.is_near_feature(pos, env.water_locations, 2)
+
 
 class TestConsumptionSystem:
     """Tests for the ConsumptionSystem."""
@@ -79,10 +147,15 @@ class TestConsumptionSystem:
         assert health_comp.current_health == 60
         assert berry_pos not in mock_sim_state_systems.environment.berry_locations
 
-        mock_sim_state_systems.event_bus.publish.assert_called_once()
-        call_args = mock_sim_state_systems.event_bus.publish.call_args[0]
-        assert call_args[0] == "action_outcome_ready"
-        assert call_args[1]["action_outcome"].success is True
+        health_call, outcome_call = (
+            call.args for call in mock_sim_state_systems.event_bus.publish.mock_calls
+        )
+        assert health_call == (
+            "health_changed",
+            {"entity_id": agent_id, "current_tick": 10},
+        )
+        assert outcome_call[0] == "action_outcome_ready"
+        assert outcome_call[1]["action_outcome"].success is True
 
 
 class TestVitalsSystem:
@@ -99,10 +172,11 @@ class TestVitalsSystem:
         health_comp = HealthComponent(current_health=0, initial_health=100)
         time_comp = TimeBudgetComponent(initial_time_budget=100)
         time_comp.is_active = True
-        components = {HealthComponent: health_comp, TimeBudgetComponent: time_comp}
-        mock_sim_state_systems.get_entities_with_components.return_value = {
-            agent_id: components
+        tables = {
+            HealthComponent: {agent_id: health_comp},
+            TimeBudgetComponent: {agent_id: time_comp},
         }
+        mock_sim_state_systems.get_component_table.side_effect = tables.get
 
         await system.update(current_tick=100)
 
@@ -111,3 +185,102 @@ class TestVitalsSystem:
         mock_sim_state_systems.event_bus.publish.assert_called_with(
             "agent_deactivated", {"entity_id": agent_id, "current_tick": 100}
         )
+
+    @pytest.mark.asyncio
+    async def test_update_only_deactivates_active_agents_out_of_health(
+        self, mock_sim_state_systems
+    ):
+        """Verify healthy and already inactive agents are left alone."""
+        system = VitalsSystem(mock_sim_state_systems, MagicMock(), MagicMock())
+        healths = {"alive": 30.0, "dying": -5.0, "dead": 0.0, "untimed": 0.0}
+        time_comps = {
+            agent_id: TimeBudgetComponent(initial_time_budget=100)
+            for agent_id in ("alive", "dying", "dead")
+        }
+        time_comps["dead"].is_active = False
+        tables = {
+            HealthComponent: {
+                agent_id: HealthComponent(health, 100.0)
+                for agent_id, health in healths.items()
+            },
+            TimeBudgetComponent: time_comps,
+        }
+        mock_sim_state_systems.get_component_table.side_effect = tables.get
+        mock_sim_state_systems.environment.add_entity("dying", (1, 1))
+
+        await system.update(current_tick=7)
+
+        assert [tc.is_active for tc in time_comps.values()] == [True, False, False]
+        assert "dying" not in mock_sim_state_systems.environment.agent_positions
+        mock_sim_state_systems.event_bus.publish.assert_called_once_with(
+            "agent_deactivated", {"entity_id": "dying", "current_tick": 7}
+        )
+
+    @pytest.mark.asyncio
+    async def test_update_checks_reported_agents_and_rescans_periodically(self):
+        """
+        Verify updates between full scans only look at reported agents, and
+        the periodic full scan catches health written without a report.
+        """
+        sim_state = MagicMock()
+        sim_state.environment = BerryWorldEnvironment(width=10, height=10)
+        sim_state.event_bus = EventBus(config={})
+        deactivated = []
+        sim_state.event_bus.subscribe("agent_deactivated", deactivated.append)
+        health_comps = {
+            agent_id: HealthComponent(50.0, 100.0) for agent_id in ("a", "b", "c")
+        }
+        tables = {
+            HealthComponent: health_comps,
+            TimeBudgetComponent: {
+                agent_id: TimeBudgetComponent(initial_time_budget=100)
+                for agent_id in health_comps
+            },
+        }
+        sim_state.get_component_table.side_effect = tables.get
+        system = VitalsSystem(sim_state, MagicMock(), MagicMock())
+
+        await system.update(current_tick=1)
+        health_comps["a"].current_health = 0.0  # Changed without a report
+        health_comps["b"].current_health = -5.0
+        sim_state.event_bus.publish(
+            "health_changed", {"entity_id": "b", "current_tick": 2}
+        )
+        await system.update(current_tick=2)
+
+        assert deactivated == [{"entity_id": "b", "current_tick": 2}]
+        assert system._changed == {}
+
+        full_scan_tick = VitalsSystem.FULL_SCAN_INTERVAL
+        await system.update(current_tick=full_scan_tick - 1)
+        assert len(deactivated) == 1
+        await system.update(current_tick=full_scan_tick)
+
+        assert deactivated[1:] == [{"entity_id": "a", "current_tick": full_scan_tick}]
+        assert [tc.is_active for tc in tables[TimeBudgetComponent].values()] == [
+            False,
+            False,
+            True,
+        ]
+
+
+class TestRenderingSystem:
+    """Tests for the berry_sim RenderingSystem."""
+
+    @pytest.mark.asyncio
+    async def test_update_renders_every_nth_tick(self, mock_sim_state_systems):
+        """Verify frames are only rendered on ticks divisible by render_every."""
+        mock_sim_state_systems.simulation_id = "run"
+        config = OmegaConf.create(
+            {
+                "environment": {"params": {"width": 4, "height": 4}},
+                "rendering": {"render_every": 5},
+            }
+        )
+        with patch("simulations.berry_sim.systems.BerryRenderer") as renderer_cls:
+            system = RenderingSystem(mock_sim_state_systems, config, MagicMock())
+            for tick in range(12):
+                await system.update(current_tick=tick)
+
+        render_frame = renderer_cls.return_value.render_frame
+        assert [call.args[1] for call in render_frame.call_args_list] == [0, 5, 10]
@@ -37,16 +37,14 @@ def test_generate_possible_params_when_unsatisfied(move_action):
     mock_satisfaction_comp.is_satisfied = False
 
     mock_env = Mock(spec=SchellingGridEnvironment)
-    mock_env.get_empty_cells.return_value = [(10, 10), (12, 15)]
+    mock_env.get_random_empty_cell.return_value = (12, 15)
     mock_sim_state.environment = mock_env
     mock_sim_state.get_component.return_value = mock_satisfaction_comp
 
     params = move_action.generate_possible_params("agent1", mock_sim_state, 1)
 
-    assert len(params) == 1
-    assert "target_x" in params[0]
-    assert "target_y" in params[0]
-    assert (params[0]["target_x"], params[0]["target_y"]) in [(10, 10), (12, 15)]
+    assert params == [{"target_x": 12, "target_y": 15}]
+    mock_env.get_empty_cells.assert_not_called()
 
 
 def test_generate_possible_params_when_satisfied(move_action):
@@ -68,7 +66,7 @@ def test_generate_possible_params_no_empty_cells(move_action):
     mock_satisfaction_comp.is_satisfied = False
 
     mock_env = Mock(spec=SchellingGridEnvironment)
-    mock_env.get_empty_cells.return_value = []
+    mock_env.get_random_empty_cell.return_value = None
     mock_sim_state.environment = mock_env
     mock_sim_state.get_component.return_value = mock_satisfaction_comp
 
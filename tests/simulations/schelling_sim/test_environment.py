@@ -72,6 +72,20 @@ def test_get_empty_cells(env):
     assert (5, 5) in empty_cells
 
 
+def test_get_random_empty_cell(env):
+    for i in range(99):
+        env.add_entity(f"agent_{i}", (i % 10, i // 10))
+    assert env.get_random_empty_cell() == (9, 9)
+
+    env.add_entity("agent_99", (9, 9))
+    assert env.get_random_empty_cell() is None
+
+    env.remove_entity("agent_0")
+    env.remove_entity("agent_55")
+    draws = {env.get_random_empty_cell() for _ in range(50)}
+    assert draws == {(0, 0), (5, 5)}
+
+
 def test_move_agent_success(env):
     env.add_entity("agent_A", (1, 1))
     success = env.move_entity("agent_A", from_pos=(1, 1), to_pos=(2, 2))
@@ -0,0 +1,66 @@
+# FILE: tests/simulations/schelling_sim/test_renderer.py
+"""
+Unit tests for the SchellingRenderer of the schelling_sim simulation.
+"""
+
+from unittest.mock import MagicMock
+
+import imageio
+import numpy as np
+import pytest
+from agent_engine.simulation.simulation_state import SimulationState
+from simulations.schelling_sim.components import GroupComponent, PositionComponent
+from simulations.schelling_sim.renderer import SchellingRenderer
+
+
+@pytest.fixture
+def sim_state():
+    """Provides a state with agents of both groups and a stray marker."""
+    state = SimulationState(MagicMock(), "cpu")
+    state.add_entities_bulk(
+        [
+            ("agent_1", [PositionComponent(x=0, y=0), GroupComponent(1)]),
+            ("agent_2", [PositionComponent(x=3, y=1), GroupComponent(2)]),
+            ("agent_3", [PositionComponent(x=7, y=7), GroupComponent(1)]),
+            ("marker", [PositionComponent(x=1, y=2)]),
+        ]
+    )
+    return state
+
+
+class TestSchellingRenderer:
+    """Tests for the SchellingRenderer."""
+
+    def test_draw_frame_colors_agents_by_group(self, sim_state, tmp_path):
+        """Verify group colors, empty cells and skipped entities."""
+        renderer = SchellingRenderer(4, 3, str(tmp_path))
+
+        frame = renderer.draw_frame(sim_state)
+
+        assert frame.shape == (3, 4, 3)
+        assert frame.dtype == np.uint8
+        assert frame[0, 0].tolist() == renderer.colors[1]
+        assert frame[1, 3].tolist() == renderer.colors[2]
+        assert frame[2, 1].tolist() == renderer.colors[0]  # No group component
+        assert (frame == renderer.colors[0]).all(axis=2).sum() == 10
+
+    def test_draw_frame_scales_cells_to_blocks(self, sim_state, tmp_path):
+        """Verify each cell becomes a pixel_scale x pixel_scale block."""
+        small = SchellingRenderer(4, 3, str(tmp_path)).draw_frame(sim_state)
+
+        frame = SchellingRenderer(4, 3, str(tmp_path), 3).draw_frame(sim_state)
+
+        assert frame.shape == (9, 12, 3)
+        np.testing.assert_array_equal(frame[::3, ::3], small)
+        np.testing.assert_array_equal(
+            frame[3:6, 9:12], np.broadcast_to(small[1, 3], (3, 3, 3))
+        )
+
+    def test_render_frame_writes_png(self, sim_state, tmp_path):
+        """Verify the drawn frame is written for the tick."""
+        renderer = SchellingRenderer(4, 3, str(tmp_path), pixel_scale=2)
+
+        renderer.render_frame(sim_state, tick=5)
+
+        written = imageio.imread(tmp_path / "frame_0005.png")
+        np.testing.assert_array_equal(written, renderer.draw_frame(sim_state))
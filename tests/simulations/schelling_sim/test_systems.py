@@ -186,3 +186,35 @@ def test_update_agent_with_high_threshold_becomes_unsatisfied(
 
     # Assert (2 out of 3 neighbors are same type = 66.7% < 70% threshold)
     assert satisfaction_comp.is_satisfied is False
+
+
+def test_update_reads_neighbor_groups_from_the_agent_query(
+    satisfaction_system, mock_simulation_state
+):
+    """Tests that neighboring agents' groups come from the query, not lookups."""
+    agents = {
+        agent_id: {
+            PositionComponent: PositionComponent(x=x, y=0),
+            GroupComponent: GroupComponent(agent_type=agent_type),
+            SatisfactionComponent: SatisfactionComponent(satisfaction_threshold=0.5),
+        }
+        for agent_id, x, agent_type in (("a", 0, 1), ("b", 1, 1), ("c", 2, 2))
+    }
+    mock_simulation_state.get_entities_with_components.return_value = agents
+    neighbors_by_position = {
+        (0, 0): {(1, 0): "b"},
+        (1, 0): {(0, 0): "a", (2, 0): "c"},
+        (2, 0): {(1, 0): "b"},
+    }
+    mock_simulation_state.environment.get_neighbors_of_position.side_effect = (
+        neighbors_by_position.get
+    )
+
+    asyncio.run(satisfaction_system.update(current_tick=1))
+
+    mock_simulation_state.get_component.assert_not_called()
+    satisfied = {
+        agent_id: comps[SatisfactionComponent].is_satisfied
+        for agent_id, comps in agents.items()
+    }
+    assert satisfied == {"a": True, "b": True, "c": False}